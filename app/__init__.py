@@ -1,22 +1,60 @@
+import click
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
 from config import config
 from flask_cors import CORS
+from app.replicas import RoutingSession
 
-db = SQLAlchemy()
-migrate = Migrate()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 def create_app(config_name='default'):
     app = Flask(__name__)
     app.config.from_object(config[config_name])
     CORS(app)
+
+    from app.db_pool import build_engine_options
+    from app.replicas import configure_replica_binds, init_replicas
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = build_engine_options(app.config)
+    configure_replica_binds(app, lambda url: build_engine_options({**app.config, 'SQLALCHEMY_DATABASE_URI': url}))
     db.init_app(app)
-    migrate.init_app(app, db)
+    if click.get_current_context(silent=True) is not None:
+        # Flask-Migrate тягне alembic (~0.1 с імпорту) і потрібен лише командам `flask db`,
+        # тому веб-воркери (gunicorn, uvicorn) його не завантажують
+        from flask_migrate import Migrate
+        Migrate(app, db)
 
-    from app.api import api_bp
+    from app.api import api_bp, api
     app.register_blueprint(api_bp, url_prefix='/api')
 
-    from app import routes
+    from app.representations import init_representations
+    init_representations(app, api)
+
+    from app.instrumentation import init_instrumentation
+    init_instrumentation(app, api)
+
+    from app.slow_queries import init_slow_query_log
+    init_slow_query_log(app)
+
+    from app.profiling import init_profiling
+    init_profiling(api)
+
+    from app.db_pool import init_db_pool
+    init_db_pool(app, api)
+
+    from app.instrumentation import metrics
+    init_replicas(app, db, metrics)
+
+    from app.seeding import seed_command
+    app.cli.add_command(seed_command)
+
+    from app.guests import link_guests_command, merge_guests_command
+    app.cli.add_command(merge_guests_command)
+    app.cli.add_command(link_guests_command)
+
+    from app.images import process_images_command
+    app.cli.add_command(process_images_command)
+
+    from app.routes import register_routes
+    register_routes(app)
 
     return app
\ No newline at end of file
@@ -0,0 +1,143 @@
+import time
+from collections import OrderedDict
+from datetime import date as py_date, datetime, time as py_time, timedelta
+from threading import Lock
+from flask import current_app
+from app import db
+from app.models import Reservation, Table
+
+CONFIRMED_STATUS = 'Підтверджено'
+WEEKDAY_NAMES = ['Понеділок', 'Вівторок', 'Середа', 'Четвер', "П'ятниця", 'Субота', 'Неділя']
+
+# Кеш завантаженості по закритих (минулих) днях: {(дата, слоти): (час закінчення, [[місця, столики], ...])}
+# Минулі дні змінюються рідко (правка бронювання заднім числом), тому їх рахуємо один раз на OCCUPANCY_CACHE_TTL_SECONDS.
+# invalidate_occupancy_day скидає день лише в поточному процесі, інші воркери побачать зміну після TTL.
+# Порядок - від найдавніше використаного, понад OCCUPANCY_CACHE_MAX_DAYS записів найстаріші витісняються (LRU)
+_closed_days_cache = OrderedDict()
+_cache_lock = Lock()
+
+
+def build_slots(opening_hour, closing_hour, slot_duration_hours):
+    """Список слотів (початок, кінець) так само, як їх будує AvailableSlots."""
+    slots = []
+    current_hour = opening_hour
+    while current_hour < closing_hour:
+        end_hour = min(current_hour + slot_duration_hours, closing_hour)
+        if end_hour > current_hour:
+            slots.append((py_time(current_hour, 0), py_time(end_hour, 0)))
+        current_hour += slot_duration_hours
+    return tuple(slots)
+
+
+def _sweep(date_from, date_to, slots, days_needed):
+    """Один прохід по бронюванням діапазону. Повертає {дата: [[місця, столики], ...]} для days_needed."""
+    result = {day: [[0, 0] for _ in slots] for day in days_needed}
+    range_start = datetime.combine(date_from, py_time.min)
+    range_end = datetime.combine(date_to + timedelta(days=1), py_time.min)
+
+    rows = db.session.query(
+        Reservation.guest_count,
+        Reservation.reservation_start_time,
+        Reservation.reservation_end_time
+    ).filter(
+        Reservation.status == CONFIRMED_STATUS,
+        Reservation.reservation_start_time >= range_start,
+        Reservation.reservation_start_time < range_end
+    ).order_by(Reservation.reservation_start_time).all()
+
+    for guest_count, start_dt, end_dt in rows:
+        day = start_dt.date()
+        day_slots = result.get(day)
+        if day_slots is None:
+            continue
+        for index, (slot_start, slot_end) in enumerate(slots):
+            slot_start_dt = datetime.combine(day, slot_start)
+            slot_end_dt = datetime.combine(day, slot_end)
+            if start_dt < slot_end_dt and end_dt > slot_start_dt:
+                day_slots[index][0] += guest_count or 0
+                day_slots[index][1] += 1
+    return result
+
+
+def compute_occupancy(date_from, date_to, opening_hour, closing_hour, slot_duration_hours, today=None):
+    """Завантаженість по днях тижня та слотах за діапазон дат [date_from, date_to]."""
+    today = today or py_date.today()
+    slots = build_slots(opening_hour, closing_hour, slot_duration_hours)
+
+    all_days = [date_from + timedelta(days=i) for i in range((date_to - date_from).days + 1)]
+    per_day = {}
+    missing_days = []
+    now = time.monotonic()
+    with _cache_lock:
+        for day in all_days:
+            cached = _closed_days_cache.get((day, slots))
+            if cached is not None and cached[0] > now:
+                _closed_days_cache.move_to_end((day, slots))
+                per_day[day] = cached[1]
+            else:
+                missing_days.append(day)
+
+    if missing_days:
+        computed = _sweep(missing_days[0], missing_days[-1], slots, missing_days)
+        expires_at = now + current_app.config.get('OCCUPANCY_CACHE_TTL_SECONDS', 300)
+        max_days = current_app.config.get('OCCUPANCY_CACHE_MAX_DAYS', 2000)
+        with _cache_lock:
+            for day, day_slots in computed.items():
+                if day < today:
+                    _closed_days_cache[(day, slots)] = (expires_at, day_slots)
+                    _closed_days_cache.move_to_end((day, slots))
+            while len(_closed_days_cache) > max_days:
+                _closed_days_cache.popitem(last=False)
+        per_day.update(computed)
+
+    tables = db.session.query(Table.capacity).filter(Table.is_available == True).all()
+    seat_capacity = sum(capacity for (capacity,) in tables)
+    table_count = len(tables)
+
+    weekdays = []
+    for weekday in range(7):
+        days = [day for day in all_days if day.weekday() == weekday]
+        if not days:
+            continue
+        slot_stats = []
+        for index, (slot_start, slot_end) in enumerate(slots):
+            booked_seats = sum(per_day[day][index][0] for day in days)
+            booked_tables = sum(per_day[day][index][1] for day in days)
+            slot_stats.append({
+                'slot_start': slot_start.strftime('%H:%M'),
+                'slot_end': slot_end.strftime('%H:%M'),
+                'avg_booked_seats': round(booked_seats / len(days), 2),
+                'avg_booked_tables': round(booked_tables / len(days), 2),
+                'seat_utilization': round(booked_seats / (seat_capacity * len(days)), 4) if seat_capacity else 0.0,
+                'table_utilization': round(booked_tables / (table_count * len(days)), 4) if table_count else 0.0,
+            })
+        weekdays.append({
+            'weekday': weekday,
+            'weekday_name': WEEKDAY_NAMES[weekday],
+            'days_count': len(days),
+            'slots': slot_stats
+        })
+
+    total_seats = sum(seats for day in all_days for seats, _ in per_day[day])
+    total_slot_capacity = seat_capacity * len(all_days) * len(slots)
+
+    return {
+        'date_from': date_from.strftime('%Y-%m-%d'),
+        'date_to': date_to.strftime('%Y-%m-%d'),
+        'days_count': len(all_days),
+        'seat_capacity': seat_capacity,
+        'table_count': table_count,
+        'seat_utilization': round(total_seats / total_slot_capacity, 4) if total_slot_capacity else 0.0,
+        'weekdays': weekdays
+    }
+
+
+def invalidate_occupancy_day(day):
+    with _cache_lock:
+        for key in [key for key in _closed_days_cache if key[0] == day]:
+            del _closed_days_cache[key]
+
+
+def clear_occupancy_cache():
+    with _cache_lock:
+        _closed_days_cache.clear()
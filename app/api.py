@@ -1,5 +1,5 @@
 from flask import Blueprint
-from flask_restx import Api, Resource, fields
+from flask_restx import Api, Namespace, Resource, fields
 
 
 api_bp = Blueprint('api', __name__)
@@ -9,6 +9,24 @@ api = Api(api_bp,
           description='API для ресторанної системи',
           doc='/docs')
 
+
+class ImageManifestField(fields.Nested):
+    """Маніфест завантаженого зображення (app/images.py). URL обчислюються під час відповіді, тож зміна
+    IMAGE_CDN_BASE_URL діє одразу без міграції даних."""
+
+    def output(self, key, obj, ordered=False, **kwargs):
+        image = fields.get_value(key if self.attribute is None else self.attribute, obj)
+        if image is None:
+            return None
+        from app.images import image_manifest # app.images тягне моделі, а api.py імпортується раніше за них
+        return image_manifest(image)
+
+
+class NullableDateTime(fields.DateTime):
+    """DateTime, який приймає null у запиті: nullable у flask-restx працює лише для Nested."""
+    __schema_type__ = ['string', 'null']
+
+
 #Моделі для Swagger
 user_model = api.model('User', {
     'id': fields.Integer(readonly=True, description='ID користувача'),
@@ -87,6 +105,24 @@ modifier_group_model = api.model('ModifierGroup', {
 })
 
 
+image_variant_model = api.model('ImageVariant', {
+    'width': fields.Integer(description='Ширина, px'),
+    'height': fields.Integer(description='Висота, px'),
+    'format': fields.String(description='Формат файлу: jpg, png або webp'),
+    'url': fields.String(description='URL копії (через CDN, якщо налаштовано)')
+})
+
+image_manifest_model = api.model('ImageManifest', {
+    'id': fields.Integer(readonly=True, description='ID зображення'),
+    'status': fields.String(description='pending - копії ще генеруються, ready - готово, failed - помилка обробки'),
+    'error': fields.String(description='Текст помилки обробки'),
+    'width': fields.Integer(description='Ширина оригіналу, px'),
+    'height': fields.Integer(description='Висота оригіналу, px'),
+    'original': fields.String(description='URL оригіналу'),
+    'variants': fields.List(fields.Nested(image_variant_model), description='Зменшені копії у форматі оригіналу та WebP'),
+    'srcset': fields.Raw(description='Готовий srcset для кожного формату, напр. {"webp": "... 320w, ... 640w"}')
+})
+
 dish_variant_model = api.model('DishVariant', {
     'id': fields.Integer(readonly=True, description='ID варіанту (опціонально, для внутрішньої логіки)'),
     'size_label': fields.String(required=True, description='Текстове позначення розміру/варіанту (напр., "L", "XL", "360г", "700г", "Чорний з лимоном")'),
@@ -103,6 +139,9 @@ dish_model = api.model('Dish', {
     'description': fields.String(description='Опис страви'),
     'detailed_description': fields.String(description = 'Детальний опис страви'),
     'image_url': fields.String(description='URL зображення'),
+    'image_id': fields.Integer(description='ID завантаженого зображення (POST /api/images/)'),
+    'image': ImageManifestField(image_manifest_model, readonly=True, allow_null=True,
+                                description='Маніфест зображення з URL під різну ширину екрана'),
     'category': fields.String(description='Категорія страви'),
     'is_available': fields.Boolean(description='Чи доступна страва'),
     'tags': fields.List(
@@ -121,12 +160,53 @@ dish_model = api.model('Dish', {
     )
 })
 
+facet_value_model = api.model('FacetValue', {
+    'value': fields.String(description='Значення фасету (категорія або тег)'),
+    'count': fields.Integer(description='Кількість страв')
+})
+
+dish_facets_model = api.model('DishFacets', {
+    'total': fields.Integer(description='Кількість страв, що відповідають фільтрам'),
+    'available': fields.Integer(description='З них доступних'),
+    'categories': fields.List(fields.Nested(facet_value_model), description='Кількість страв по категоріях'),
+    'tags': fields.List(fields.Nested(facet_value_model), description='Кількість страв по тегах')
+})
+
+dish_summary_model = api.model('DishSummary', {
+    'id': fields.Integer(readonly=True, description='ID страви'),
+    'name': fields.String(description='Назва страви'),
+    'image_url': fields.String(description='URL зображення'),
+    'category': fields.String(description='Категорія страви'),
+    'is_available': fields.Boolean(description='Чи доступна страва'),
+    'min_price': fields.Float(description='Мінімальна ціна серед варіантів ("від X грн")'),
+    'max_price': fields.Float(description='Максимальна ціна серед варіантів'),
+    'variant_count': fields.Integer(description='Кількість варіантів страви'),
+    'has_required_modifiers': fields.Boolean(description="Чи має страва обов'язкові групи модифікаторів")
+})
+
 news_model = api.model('News', {
     'id': fields.Integer(readonly=True, description='ID страви'),
     'name': fields.String(allow_null=True, description='Назва новини'),
     'description': fields.String(allow_null=True, description='Опис новини'),
     'image_url': fields.String(description='URL зображення'),
-    'is_actual': fields.Boolean(description='Чи актуальна новина')
+    'image_id': fields.Integer(description='ID завантаженого зображення (POST /api/images/)'),
+    'image': fields.Nested(image_manifest_model, readonly=True, allow_null=True,
+                           description='Маніфест зображення з URL під різну ширину екрана'),
+    'is_actual': fields.Boolean(description='Чи актуальна новина (ручний вимикач)'),
+    'publish_at': NullableDateTime(dt_format='iso8601',
+                                   description='Коли новина з\'явиться в ?active=1 (порожньо - одразу)'),
+    'expire_at': NullableDateTime(dt_format='iso8601',
+                                  description='Коли новина автоматично піде в архів (порожньо - ніколи)')
+})
+
+
+search_result_model = api.model('SearchResult', {
+    'type': fields.String(enum=['dish', 'news'], description='Тип знайденого обʼєкта'),
+    'id': fields.Integer(description='ID страви або новини'),
+    'name': fields.String(description='Назва'),
+    'description': fields.String(description='Опис'),
+    'image_url': fields.String(description='URL зображення'),
+    'score': fields.Float(description='Релевантність')
 })
 
 
@@ -177,6 +257,26 @@ order_model_output = api.model('OrderOutput', {
     'items': fields.List(fields.Nested(order_item_model_output)) 
 })
 
+order_quote_input_model = api.model('OrderQuoteInput', {
+    'items': fields.List(fields.Nested(order_item_model_input), required=True, min_items=1, description='Елементи кошика')
+})
+
+order_quote_line_model = api.model('OrderQuoteLine', {
+    'dish_id': fields.Integer(description='ID базової страви'),
+    'variant_id': fields.Integer(description='ID вибраного варіанту'),
+    'quantity': fields.Integer(description='Кількість'),
+    'modifier_option_ids': fields.List(fields.Integer, description='ID вибраних опцій модифікаторів'),
+    'unit_price': fields.Float(description='Ціна за одиницю (варіант + модифікатори)'),
+    'line_total': fields.Float(description='Ціна позиції з урахуванням кількості'),
+    'dish_name': fields.String(description='Назва страви'),
+    'variant_label': fields.String(description='Позначення варіанту')
+})
+
+order_quote_model = api.model('OrderQuote', {
+    'items': fields.List(fields.Nested(order_quote_line_model)),
+    'total_price': fields.Float(description='Загальна сума кошика')
+})
+
 table_model = api.model('Table', {
     'id': fields.Integer(readonly=True, description='ID столика'),
     'table_number': fields.Integer(required=True, description='Номер столика'),
@@ -232,12 +332,45 @@ table_slot_availability_model = api.model('TableSlotAvailability', {
     'reason_message': fields.String(allow_null=True)
 })
 
-users_ns = api.namespace('users', description='Операції з користувачами')
-guests_ns = api.namespace('guests', description='Операції з гостями')
-dishes_ns = api.namespace('dishes', description='Операції зі стравами')
-orders_ns = api.namespace('orders', description='Операції з замовленнями')
-tables_ns = api.namespace('tables', description='Операції зі столиками')
-modifier_groups_ns = api.namespace('modifier-groups', description='Операції з групами модифікаторів')
-reservations_ns = api.namespace('reservations', description='Операції з бронюваннями')
-news_ns = api.namespace('news', description='Операції з новинами')
+occupancy_slot_model = api.model('OccupancySlot', {
+    'slot_start': fields.String(description='Час початку слоту HH:MM'),
+    'slot_end': fields.String(description='Час кінця слоту HH:MM'),
+    'avg_booked_seats': fields.Float(description='Середня кількість заброньованих місць'),
+    'avg_booked_tables': fields.Float(description='Середня кількість заброньованих столиків'),
+    'seat_utilization': fields.Float(description='Частка заброньованих місць від місткості столиків (0..1)'),
+    'table_utilization': fields.Float(description='Частка заброньованих столиків (0..1)')
+})
+
+occupancy_weekday_model = api.model('OccupancyWeekday', {
+    'weekday': fields.Integer(description='День тижня (0 - понеділок)'),
+    'weekday_name': fields.String(description='Назва дня тижня'),
+    'days_count': fields.Integer(description='Кількість таких днів у діапазоні'),
+    'slots': fields.List(fields.Nested(occupancy_slot_model))
+})
+
+occupancy_response_model = api.model('OccupancyResponse', {
+    'date_from': fields.String(description='Початок діапазону YYYY-MM-DD'),
+    'date_to': fields.String(description='Кінець діапазону YYYY-MM-DD'),
+    'days_count': fields.Integer(description='Кількість днів у діапазоні'),
+    'seat_capacity': fields.Integer(description='Сумарна місткість доступних столиків'),
+    'table_count': fields.Integer(description='Кількість доступних столиків'),
+    'seat_utilization': fields.Float(description='Загальна завантаженість місць за діапазон (0..1)'),
+    'weekdays': fields.List(fields.Nested(occupancy_weekday_model))
+})
+
+# Простори імен додаються до api у app/routes.register_routes - лише ті, що вибрані в API_NAMESPACES
+users_ns = Namespace('users', description='Операції з користувачами')
+guests_ns = Namespace('guests', description='Операції з гостями')
+dishes_ns = Namespace('dishes', description='Операції зі стравами')
+orders_ns = Namespace('orders', description='Операції з замовленнями')
+tables_ns = Namespace('tables', description='Операції зі столиками')
+modifier_groups_ns = Namespace('modifier-groups', description='Операції з групами модифікаторів')
+reservations_ns = Namespace('reservations', description='Операції з бронюваннями')
+news_ns = Namespace('news', description='Операції з новинами')
+search_ns = Namespace('search', description='Пошук по стравах і новинах')
+analytics_ns = Namespace('analytics', description='Аналітика завантаженості ресторану')
+images_ns = Namespace('images', description='Завантаження зображень страв і новин')
+
+namespaces = {ns.name: ns for ns in (users_ns, guests_ns, dishes_ns, orders_ns, tables_ns, modifier_groups_ns,
+                                     reservations_ns, news_ns, search_ns, analytics_ns, images_ns)}
 
@@ -0,0 +1,304 @@
+"""ASGI-режим: читаючі ендпоінти (меню, доступність столиків, перегляд замовлень) працюють на асинхронному
+SQLAlchemy зі спільним пулом зʼєднань процесу, решта API - той самий Flask-застосунок через WSGI-міст (a2wsgi).
+
+Швидкий шлях обробляє лише звичайні запити. Якщо відповідь потребує логіки Flask (фільтри меню, ?fields=,
+помилки валідації, 404, профілювання), запит передається у Flask, тож відповіді в обох режимах однакові.
+Залежності - requirements-asgi.txt, точка входу - asgi.py."""
+import json
+import time
+from contextlib import asynccontextmanager
+from datetime import date as py_date, datetime, time as py_time, timedelta
+from a2wsgi import WSGIMiddleware
+from flask_restx import marshal
+from sqlalchemy import select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Mount, Route
+from app.api import api, dish_model
+from app.instrumentation import RequestStats, metrics
+from app.loading import dish_full_options, order_full_options
+from app.models import Dish, Guest, Order, Reservation, Table, User
+from app.phones import normalize_phone
+from app.profiling import PROFILE_HEADER, PROFILE_QUERY_ARG
+from app.routes import selected_namespaces
+from app.schemas import OrderSchema
+
+ASYNC_DRIVERS = {'postgresql': 'postgresql+asyncpg', 'sqlite': 'sqlite+aiosqlite'}
+CONFIRMED_STATUS = 'Підтверджено'
+
+
+def async_database_url(uri):
+    """URL для async-драйвера та connect_args. asyncpg не розуміє libpq-параметрів sslmode/channel_binding."""
+    url = make_url(uri)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise RuntimeError(f"ASGI-режим не підтримує базу {backend}")
+    connect_args = {}
+    if backend == 'postgresql':
+        query = dict(url.query)
+        sslmode = query.pop('sslmode', None)
+        query.pop('channel_binding', None)
+        if sslmode and sslmode != 'disable':
+            connect_args['ssl'] = sslmode
+        url = url.set(query=query)
+    return url.set(drivername=ASYNC_DRIVERS[backend]), connect_args
+
+
+def build_async_engine_options(config):
+    """Ті самі налаштування пулу, що й у build_engine_options (app/db_pool.py), у формі для async-драйверів."""
+    url, connect_args = async_database_url(config['SQLALCHEMY_DATABASE_URI'])
+    options = {}
+    if url.get_backend_name() == 'postgresql':
+        options.update({
+            'pool_pre_ping': config.get('DB_POOL_PRE_PING', True),
+            'pool_recycle': config.get('DB_POOL_RECYCLE_SECONDS', 240),
+            'pool_size': config.get('DB_POOL_SIZE', 5),
+            'max_overflow': config.get('DB_POOL_MAX_OVERFLOW', 10),
+            'pool_timeout': config.get('DB_POOL_TIMEOUT_SECONDS', 30),
+        })
+        statement_timeout = config.get('DB_STATEMENT_TIMEOUT_MS')
+        if statement_timeout:
+            connect_args['server_settings'] = {'statement_timeout': str(int(statement_timeout))}
+    if connect_args:
+        options['connect_args'] = connect_args
+    return url, options
+
+
+def reservation_slots(requested_date, opening_hour, closing_hour, slot_duration_hours):
+    """Слоти дня так само, як їх рахує AvailableSlots.get: (початок, кінець, початок_dt, кінець_dt)."""
+    slots = []
+    current_hour = opening_hour
+    while current_hour < closing_hour:
+        slot_start_time = py_time(current_hour, 0)
+        slot_end_time = py_time(min(current_hour + slot_duration_hours, closing_hour), 0)
+        if datetime.combine(py_date.min, slot_start_time) >= datetime.combine(py_date.min, slot_end_time) and slot_duration_hours > 0:
+            current_hour += slot_duration_hours
+            continue
+        slot_start_dt = datetime.combine(requested_date, slot_start_time)
+        slot_end_dt = datetime.combine(requested_date, slot_end_time)
+        if slot_end_time.hour < slot_start_time.hour and slot_end_time.hour < opening_hour:
+            slot_end_dt = datetime.combine(requested_date + timedelta(days=1), slot_end_time)
+        slots.append((slot_start_time, slot_end_time, slot_start_dt, slot_end_dt))
+        current_hour += slot_duration_hours
+    return slots
+
+
+def _overlaps(reservations, table_id, start_dt, end_dt):
+    return any(start < end_dt and end > start_dt for start, end in reservations.get(table_id, ()))
+
+
+async def _confirmed_reservations(session, start_dt, end_dt, table_ids=None):
+    """Підтверджені бронювання, що перетинають інтервал, одним запитом: table_id -> [(початок, кінець)]."""
+    statement = select(Reservation.table_id, Reservation.reservation_start_time, Reservation.reservation_end_time).where(
+        Reservation.status == CONFIRMED_STATUS,
+        Reservation.reservation_start_time < end_dt,
+        Reservation.reservation_end_time > start_dt)
+    if table_ids is not None:
+        statement = statement.where(Reservation.table_id.in_(table_ids))
+    reservations = {}
+    for table_id, start, end in (await session.execute(statement)).all():
+        reservations.setdefault(table_id, []).append((start, end))
+    return reservations
+
+
+class FastPath:
+    """ASGI-ендпоінт: handler(request) повертає відповідь або None - тоді запит обробляє Flask."""
+
+    def __init__(self, service, endpoint, handler):
+        self.service = service
+        self.endpoint = endpoint
+        self.handler = handler
+
+    async def __call__(self, scope, receive, send):
+        request = Request(scope, receive)
+        started = time.perf_counter()
+        response = None
+        if not self.service.needs_flask(request):
+            response = await self.handler(self.service, request)
+        if response is None:
+            await self.service.wsgi(scope, receive, send)
+            return
+        if 'origin' in request.headers:
+            # Як CORS(app) для Flask-маршрутів: дозволено будь-яке джерело, воно ж повертається у відповіді
+            response.headers['Access-Control-Allow-Origin'] = request.headers['origin']
+            response.headers['Vary'] = ', '.join(filter(None, (response.headers.get('Vary'), 'Origin')))
+        await response(scope, receive, send)
+        if self.service.instrumentation_enabled:
+            metrics.observe(self.endpoint, request.method, response.status_code, time.perf_counter() - started, RequestStats())
+
+
+class AsyncReadService:
+    """Спільний для процесу async-рушій та обробники швидкого шляху."""
+
+    def __init__(self, flask_app):
+        self.flask_app = flask_app
+        self.wsgi = WSGIMiddleware(flask_app)
+        self.config = flask_app.config
+        self.instrumentation_enabled = flask_app.config.get('INSTRUMENTATION_ENABLED', False)
+        # Відповідь серіалізується так само, як flask_restx.representations.output_json
+        self.json_settings = dict(flask_app.config.get('RESTX_JSON', {}))
+        if flask_app.debug:
+            self.json_settings.setdefault('indent', 4)
+        # Бінарні формати (app/representations.py) серіалізує Flask, швидкий шлях віддає лише JSON
+        self.binary_mediatypes = tuple(mediatype for mediatype in api.representations if mediatype != 'application/json')
+        with flask_app.app_context():
+            self.dish_options = dish_full_options()
+            self.order_options = order_full_options()
+        self.engine = None
+        self.sessionmaker = None
+
+    def start(self):
+        url, options = build_async_engine_options(self.config)
+        self.engine = create_async_engine(url, **options)
+        self.sessionmaker = async_sessionmaker(self.engine, expire_on_commit=False)
+
+    async def stop(self):
+        if self.engine is not None:
+            await self.engine.dispose()
+
+    def needs_flask(self, request):
+        if request.headers.get(PROFILE_HEADER) or request.query_params.get(PROFILE_QUERY_ARG):
+            return True
+        accept = request.headers.get('accept', '')
+        return any(mediatype in accept for mediatype in self.binary_mediatypes)
+
+    def json_response(self, data, status_code=200):
+        return Response(json.dumps(data, **self.json_settings) + '\n', status_code=status_code,
+                        media_type='application/json', headers={'Vary': 'Accept'} if self.binary_mediatypes else None)
+
+    async def dish_list(self, request):
+        if request.query_params:
+            return None # Фільтри та набори полів лишаються у DishList.get
+        async with self.sessionmaker() as session:
+            dishes = (await session.execute(select(Dish).options(*self.dish_options))).scalars().all()
+            with self.flask_app.app_context(): # URL у маніфесті зображення залежать від конфігурації сховища
+                return self.json_response(marshal(dishes, dish_model))
+
+    async def dish_detail(self, request):
+        if request.query_params:
+            return None
+        async with self.sessionmaker() as session:
+            dish = (await session.execute(select(Dish).options(*self.dish_options)
+                                          .where(Dish.id == request.path_params['dish_id']))).scalars().first()
+            if dish is None:
+                return None
+            with self.flask_app.app_context():
+                return self.json_response(marshal(dish, dish_model))
+
+    async def available_slots(self, request):
+        try:
+            requested_date = datetime.strptime(request.query_params['date'], '%Y-%m-%d').date()
+            guest_count = int(request.query_params['guest_count']) if request.query_params.get('guest_count') else None
+        except (KeyError, ValueError):
+            return None # Повідомлення про помилку формує reqparse у Flask
+
+        slots = reservation_slots(requested_date, self.config.get('RESTAURANT_OPENING_HOUR', 10),
+                                  self.config.get('RESTAURANT_CLOSING_HOUR', 23),
+                                  self.config.get('RESERVATION_SLOT_DURATION_HOURS', 1))
+        async with self.sessionmaker() as session:
+            tables = select(Table.id).where(Table.is_available == True)
+            if guest_count and guest_count > 0:
+                tables = tables.where(Table.capacity >= guest_count)
+            table_ids = (await session.execute(tables)).scalars().all()
+            reservations = {}
+            if table_ids and slots:
+                reservations = await _confirmed_reservations(session, min(slot[2] for slot in slots),
+                                                             max(slot[3] for slot in slots), table_ids)
+
+        available_time_slots = [{
+            'slot_start': slot_start_time.strftime('%H:%M'),
+            'slot_end': slot_end_time.strftime('%H:%M'),
+            'is_available_for_booking': any(not _overlaps(reservations, table_id, slot_start_dt, slot_end_dt)
+                                            for table_id in table_ids)
+        } for slot_start_time, slot_end_time, slot_start_dt, slot_end_dt in slots]
+        return self.json_response({'date': requested_date.strftime('%Y-%m-%d'), 'slots': available_time_slots})
+
+    async def available_tables(self, request):
+        try:
+            requested_date = datetime.strptime(request.query_params['date'], '%Y-%m-%d').date()
+            slot_start_time = datetime.strptime(request.query_params['slot_start'], '%H:%M').time()
+            guest_count = int(request.query_params['guest_count']) if request.query_params.get('guest_count') else None
+        except (KeyError, ValueError):
+            return None
+
+        requested_start_dt = datetime.combine(requested_date, slot_start_time)
+        requested_end_dt = requested_start_dt + timedelta(hours=self.config.get('RESERVATION_SLOT_DURATION_HOURS', 1))
+        async with self.sessionmaker() as session:
+            tables = (await session.execute(select(Table.id, Table.table_number, Table.capacity, Table.is_available))).all()
+            reservations = await _confirmed_reservations(session, requested_start_dt, requested_end_dt)
+
+        result = []
+        for table_id, table_number, capacity, is_available in tables:
+            reason_code, reason_message = None, None
+            if not is_available:
+                reason_code, reason_message = 'TABLE_UNAVAILABLE', 'Столик тимчасово недоступний'
+            elif guest_count and guest_count > 0 and capacity < guest_count:
+                reason_code, reason_message = 'NOT_ENOUGH_CAPACITY', 'Недостатньо місць'
+            elif _overlaps(reservations, table_id, requested_start_dt, requested_end_dt):
+                reason_code, reason_message = 'BOOKED_IN_SLOT', 'Заброньовано на цей час'
+            result.append({'table_id': table_id, 'table_number': table_number, 'capacity': capacity,
+                           'is_available': reason_code is None, 'reason_code': reason_code,
+                           'reason_message': reason_message})
+        return self.json_response(result)
+
+    async def order_detail(self, request):
+        async with self.sessionmaker() as session:
+            order = (await session.execute(select(Order).options(*self.order_options)
+                                           .where(Order.id == request.path_params['order_id']))).unique().scalars().first()
+            return self.json_response(OrderSchema().dump(order)) if order is not None else None
+
+    async def user_orders(self, request):
+        user_id = request.path_params['user_id']
+        async with self.sessionmaker() as session:
+            if await session.get(User, user_id) is None:
+                return None
+            orders = (await session.execute(select(Order).options(*self.order_options)
+                                            .where(Order.user_id == user_id))).unique().scalars().all()
+            return self.json_response(OrderSchema(many=True).dump(orders))
+
+    async def guest_orders(self, request):
+        async with self.sessionmaker() as session:
+            guest_id = (await session.execute(select(Guest.id).where(
+                Guest.phone_normalized == normalize_phone(request.path_params['phone_number']))
+                .order_by(Guest.id))).scalars().first()
+            if guest_id is None:
+                return None
+            orders = (await session.execute(select(Order).options(*self.order_options)
+                                            .where(Order.guest_id == guest_id))).unique().scalars().all()
+            return self.json_response(OrderSchema(many=True).dump(orders))
+
+
+# Шлях Starlette, правило Flask (мітка endpoint у /api/_metrics) та обробник
+FAST_ROUTES = [
+    ('/api/dishes/', '/api/dishes/', AsyncReadService.dish_list),
+    ('/api/dishes/{dish_id:int}', '/api/dishes/<int:dish_id>', AsyncReadService.dish_detail),
+    ('/api/reservations/available-slots', '/api/reservations/available-slots', AsyncReadService.available_slots),
+    ('/api/reservations/available-tables', '/api/reservations/available-tables', AsyncReadService.available_tables),
+    ('/api/orders/{order_id:int}', '/api/orders/<int:order_id>', AsyncReadService.order_detail),
+    ('/api/users/{user_id:int}/orders', '/api/users/<int:user_id>/orders', AsyncReadService.user_orders),
+    ('/api/guests/{phone_number}/orders', '/api/guests/<string:phone_number>/orders', AsyncReadService.guest_orders),
+]
+
+
+def create_asgi_app(flask_app):
+    """Starlette-застосунок: швидкий шлях для FAST_ROUTES (лише GET/HEAD), усе інше - у flask_app."""
+    service = AsyncReadService(flask_app)
+
+    @asynccontextmanager
+    async def lifespan(app):
+        # Рушій створюється у воркері після fork, один пул на процес
+        service.start()
+        yield
+        await service.stop()
+
+    # Інші методи на тих самих шляхах (POST /api/dishes/ тощо) проходять далі до Mount('/') і потрапляють у Flask
+    # Маршрути просторів імен, яких немає в API_NAMESPACES, не обслуговуються і тут
+    enabled = selected_namespaces(flask_app.config)
+    routes = [Route(path, FastPath(service, endpoint, handler), methods=['GET'])
+              for path, endpoint, handler in FAST_ROUTES if path.split('/')[2] in enabled]
+    asgi_app = Starlette(routes=routes + [Mount('/', app=service.wsgi)], lifespan=lifespan)
+    asgi_app.state.read_service = service
+    return asgi_app
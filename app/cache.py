@@ -0,0 +1,106 @@
+import time
+from datetime import datetime, timezone
+from itertools import chain
+from threading import Lock
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app import db
+from app.replicas import primary_reads
+
+# Версії таблиць у межах процесу. Збільшуються після коміту, який змінив таблицю
+_table_versions = {}
+_versions_lock = Lock()
+
+
+def tables_version(tables):
+    with _versions_lock:
+        return tuple(_table_versions.get(name, 0) for name in tables)
+
+
+def bump_tables(*tables):
+    with _versions_lock:
+        for name in tables:
+            _table_versions[name] = _table_versions.get(name, 0) + 1
+
+
+def _touched(session):
+    return session.info.setdefault('touched_tables', set())
+
+
+@event.listens_for(Session, 'after_flush')
+def _track_flushed_tables(session, flush_context):
+    touched = _touched(session)
+    for obj in chain(session.new, session.dirty, session.deleted):
+        table_name = getattr(obj, '__tablename__', None)
+        if table_name:
+            touched.add(table_name)
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _track_bulk_statements(orm_execute_state):
+    # Query.delete()/update() та insert() не проходять через flush, тому ловимо їх окремо
+    if orm_execute_state.is_select:
+        return
+    table = getattr(orm_execute_state.statement, 'table', None)
+    if table is not None and getattr(table, 'name', None):
+        _touched(orm_execute_state.session).add(table.name)
+
+
+@event.listens_for(Session, 'after_commit')
+def _bump_on_commit(session):
+    touched = session.info.pop('touched_tables', None)
+    if touched:
+        bump_tables(*touched)
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _bump_on_rollback(session, previous_transaction):
+    # Знімок міг бути побудований з даних, яких після відкату вже немає
+    touched = session.info.pop('touched_tables', None)
+    if touched:
+        bump_tables(*touched)
+
+
+class SnapshotCache:
+    """Знімок даних у пам'яті процесу, який перебудовується після зміни будь-якої з таблиць tables.
+    Зміни з інших процесів (воркерів gunicorn) підхоплюються не пізніше ніж через MENU_CACHE_TTL_SECONDS.
+    valid_until(знімок) -> datetime (UTC) або None: момент, коли знімок застаріває сам по собі, без змін у таблицях
+    (наприклад, закінчується показ новини)."""
+
+    def __init__(self, builder, tables, valid_until=None):
+        self.builder = builder
+        self.tables = tuple(tables)
+        self.valid_until = valid_until
+        self._lock = Lock()
+        self._key = None
+        self._built_at = 0.0
+        self._expires_at = None
+        self._data = None
+
+    def _current_key(self):
+        return (id(db.engine), tables_version(self.tables))
+
+    def _fresh(self, key, ttl):
+        if self._key != key or time.monotonic() - self._built_at >= ttl:
+            return False
+        return self._expires_at is None or datetime.now(timezone.utc) < self._expires_at
+
+    def get(self):
+        key = self._current_key()
+        ttl = current_app.config.get('MENU_CACHE_TTL_SECONDS', 30)
+        if self._fresh(key, ttl):
+            return self._data
+        with self._lock:
+            if not self._fresh(key, ttl):
+                with primary_reads(db.session):
+                    self._data = self.builder()
+                self._expires_at = self.valid_until(self._data) if self.valid_until else None
+                self._key = key
+                self._built_at = time.monotonic()
+            return self._data
+
+    def invalidate(self):
+        with self._lock:
+            self._key = None
+            self._data = None
@@ -0,0 +1,124 @@
+import time
+from functools import wraps
+from threading import Lock
+from flask import current_app, request
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DBAPIError
+from app import db
+from app.instrumentation import metrics
+
+IDEMPOTENT_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_pool_counters = {}
+_pool_counters_lock = Lock()
+_instrumented_engines = {}
+
+
+def build_engine_options(config):
+    """SQLALCHEMY_ENGINE_OPTIONS для пулу зʼєднань. Розмір пулу і statement_timeout мають сенс лише для Postgres,
+    SQLite у Flask-SQLAlchemy працює зі своїм пулом. Явно задані SQLALCHEMY_ENGINE_OPTIONS мають пріоритет."""
+    uri = config.get('SQLALCHEMY_DATABASE_URI')
+    if not uri:
+        return dict(config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    backend = make_url(uri).get_backend_name()
+    options = {}
+    if backend != 'sqlite':
+        options.update({
+            'pool_pre_ping': config.get('DB_POOL_PRE_PING', True),
+            'pool_recycle': config.get('DB_POOL_RECYCLE_SECONDS', 240),
+            'pool_size': config.get('DB_POOL_SIZE', 5),
+            'max_overflow': config.get('DB_POOL_MAX_OVERFLOW', 10),
+            'pool_timeout': config.get('DB_POOL_TIMEOUT_SECONDS', 30),
+        })
+    statement_timeout = config.get('DB_STATEMENT_TIMEOUT_MS')
+    if backend == 'postgresql' and statement_timeout:
+        options['connect_args'] = {'options': f'-c statement_timeout={int(statement_timeout)}'}
+    options.update(config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    return options
+
+
+def _count(engine_key, name, value=1):
+    with _pool_counters_lock:
+        counters = _pool_counters.setdefault(engine_key, {})
+        counters[name] = counters.get(name, 0) + value
+
+
+def _instrument_pool(engine_key, engine):
+    pool = engine.pool
+    event.listen(pool, 'connect', lambda dbapi_connection, record: _count(engine_key, 'connects'))
+    event.listen(pool, 'checkout', lambda dbapi_connection, record, proxy: _count(engine_key, 'checkouts'))
+    event.listen(pool, 'invalidate', lambda dbapi_connection, record, exception: _count(engine_key, 'invalidations'))
+    _instrumented_engines[engine_key] = engine
+
+
+def render_pool_metrics():
+    lines = [
+        '# HELP restaurant_db_pool_connections Стан пулу зʼєднань (size, checked_in, checked_out, overflow)',
+        '# TYPE restaurant_db_pool_connections gauge',
+    ]
+    counters = []
+    for engine_key, engine in sorted(_instrumented_engines.items()):
+        pool = engine.pool
+        for state in ('size', 'checkedin', 'checkedout', 'overflow'):
+            method = getattr(pool, state, None)
+            if method is not None:
+                lines.append(f'restaurant_db_pool_connections{{engine="{engine_key}",state="{state}"}} {method()}')
+        with _pool_counters_lock:
+            for name, value in sorted(_pool_counters.get(engine_key, {}).items()):
+                counters.append(f'restaurant_db_pool_events_total{{engine="{engine_key}",event="{name}"}} {value}')
+    lines += ['# HELP restaurant_db_pool_events_total Події пулу: нові зʼєднання, видачі, інвалідації, повтори читань',
+              '# TYPE restaurant_db_pool_events_total counter']
+    return lines + counters
+
+
+def warm_up_pool(app, connections=None):
+    """Відкриває кілька зʼєднань одразу при старті воркера, щоб перші запити не платили за холодне підключення."""
+    with app.app_context():
+        connections = connections if connections is not None else app.config.get('DB_POOL_WARMUP', 2)
+        opened = []
+        try:
+            for _ in range(connections):
+                connection = db.engine.connect()
+                connection.execute(text('SELECT 1'))
+                opened.append(connection)
+        except DBAPIError as e:
+            app.logger.warning(f"Не вдалося прогріти пул зʼєднань: {e}")
+        finally:
+            for connection in opened:
+                connection.close() # Повертається в пул і лишається відкритим
+        return len(opened)
+
+
+def retry_idempotent_reads(view):
+    """Декоратор для Api.decorators: повторює GET-запит, якщо зʼєднання з БД обірвалось (Neon закриває простої)."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if request.method not in IDEMPOTENT_METHODS:
+            return view(*args, **kwargs)
+        retries = current_app.config.get('DB_READ_RETRIES', 1)
+        attempt = 0
+        while True:
+            try:
+                return view(*args, **kwargs)
+            except DBAPIError as e:
+                if not e.connection_invalidated or attempt >= retries:
+                    raise
+                attempt += 1
+                _count('default', 'read_retries')
+                current_app.logger.warning(f"Обрив зʼєднання з БД у {request.method} {request.path}, повтор {attempt}: {e.orig}")
+                db.session.rollback()
+                time.sleep(current_app.config.get('DB_READ_RETRY_BACKOFF_SECONDS', 0.05) * attempt)
+    return wrapper
+
+
+def init_db_pool(app, api):
+    with app.app_context():
+        for key, engine in db.engines.items():
+            engine_key = key or 'default'
+            if _instrumented_engines.get(engine_key) is not engine:
+                _instrument_pool(engine_key, engine)
+    if render_pool_metrics not in metrics.collectors:
+        metrics.collectors.append(render_pool_metrics)
+    if retry_idempotent_reads not in api.decorators:
+        api.decorators.append(retry_idempotent_reads)
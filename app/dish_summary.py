@@ -0,0 +1,57 @@
+"""Денормалізовані підсумки страви в таблиці dishes: мінімальна/максимальна ціна варіантів, кількість варіантів
+і чи є серед груп модифікаторів обовʼязкові. Списки меню ("від X грн") читають лише dishes, без dish_variants.
+
+Записи через ORM (POST/PUT страви, імпорт меню) оновлюють підсумки з уже завантажених обʼєктів - update_dish_summary.
+Зміни в обхід обʼєктів страви (COPY у seed, зміна is_required групи модифікаторів) - одним UPDATE у refresh_dish_summaries."""
+from decimal import Decimal, InvalidOperation
+from sqlalchemy import func, select, update
+from app import db
+from app.models import Dish, DishVariant, ModifierGroup, dish_modifier_groups_table
+
+SUMMARY_COLUMNS = ('min_price', 'max_price', 'variant_count', 'has_required_modifiers')
+
+
+def update_dish_summary(dish):
+    """Перераховує підсумки з dish.variants та dish.modifier_groups. Викликати після зміни варіантів, до commit.
+    До flush ціни можуть бути рядками чи float з payload, тому порівнюються як Decimal. ValueError - невірна ціна."""
+    prices = [_as_price(variant.price) for variant in dish.variants if variant.price is not None]
+    dish.min_price = min(prices) if prices else None
+    dish.max_price = max(prices) if prices else None
+    dish.variant_count = len(dish.variants)
+    dish.has_required_modifiers = any(group.is_required for group in dish.modifier_groups)
+
+
+def _as_price(value):
+    try:
+        price = Decimal(str(value))
+    except InvalidOperation:
+        price = None
+    if price is None or not price.is_finite():
+        raise ValueError(f"Невірна ціна варіанту: '{value}'.")
+    return price
+
+
+def refresh_dish_summaries(dish_ids=None):
+    """Перераховує підсумки в БД корельованими підзапитами. dish_ids=None - для всіх страв."""
+    required_groups = (
+        select(dish_modifier_groups_table.c.dish_id)
+        .join(ModifierGroup, ModifierGroup.id == dish_modifier_groups_table.c.modifier_group_id)
+        .where(dish_modifier_groups_table.c.dish_id == Dish.id, ModifierGroup.is_required.is_(True))
+    )
+    statement = update(Dish).values(
+        min_price=select(func.min(DishVariant.price)).where(DishVariant.dish_id == Dish.id).scalar_subquery(),
+        max_price=select(func.max(DishVariant.price)).where(DishVariant.dish_id == Dish.id).scalar_subquery(),
+        variant_count=select(func.count(DishVariant.id)).where(DishVariant.dish_id == Dish.id).scalar_subquery(),
+        has_required_modifiers=required_groups.exists(),
+    )
+    if dish_ids is not None:
+        dish_ids = list(dish_ids)
+        if not dish_ids:
+            return
+        statement = statement.where(Dish.id.in_(dish_ids))
+    db.session.execute(statement.execution_options(synchronize_session=False))
+
+
+def dishes_with_group(group_id):
+    return [row.dish_id for row in db.session.execute(
+        select(dish_modifier_groups_table.c.dish_id).where(dish_modifier_groups_table.c.modifier_group_id == group_id))]
@@ -0,0 +1,73 @@
+from collections import namedtuple
+from flask_restx import fields
+from sqlalchemy.orm import load_only, noload, selectinload
+from app.api import dish_model
+from app.models import Dish, ModifierGroup
+
+DISH_COLUMNS = ('id', 'name', 'description', 'detailed_description', 'image_url', 'image_id', 'category', 'is_available')
+DISH_COMPUTED = ('min_price', 'max_price', 'variant_count', 'has_required_modifiers') # Підсумки з app/dish_summary.py
+DISH_EMBEDS = ('variants', 'tags', 'modifier_groups', 'image')
+
+COMPUTED_FIELDS = {
+    'min_price': fields.Float(description='Мінімальна ціна серед варіантів страви'),
+    'max_price': fields.Float(description='Максимальна ціна серед варіантів страви'),
+    'variant_count': fields.Integer(description='Кількість варіантів страви'),
+    'has_required_modifiers': fields.Boolean(description="Чи має страва обов'язкові групи модифікаторів")
+}
+
+DishFieldset = namedtuple('DishFieldset', 'columns computed embeds')
+
+
+class FieldsetError(ValueError):
+    pass
+
+
+def _split(value):
+    return [part.strip() for part in value.split(',') if part.strip()]
+
+
+def parse_dish_fieldset(fields_arg, embed_arg):
+    """?fields= та ?embed= -> DishFieldset. None, якщо обидва параметри не передані (повна модель Dish)."""
+    if fields_arg is None and embed_arg is None:
+        return None
+
+    requested = _split(fields_arg) if fields_arg is not None else list(DISH_COLUMNS)
+    unknown = [name for name in requested if name not in DISH_COLUMNS + DISH_COMPUTED + DISH_EMBEDS]
+    embeds = _split(embed_arg) if embed_arg is not None else []
+    unknown += [name for name in embeds if name not in DISH_EMBEDS]
+    if unknown:
+        raise FieldsetError(f"Невідомі поля: {', '.join(unknown)}. Доступні fields: {', '.join(DISH_COLUMNS + DISH_COMPUTED)}; "
+                            f"embed: {', '.join(DISH_EMBEDS)}")
+
+    # Звʼязки можна просити і через fields, і через embed
+    embeds = list(dict.fromkeys(embeds + [name for name in requested if name in DISH_EMBEDS]))
+    columns = [name for name in requested if name in DISH_COLUMNS]
+    if 'id' not in columns:
+        columns.insert(0, 'id')
+    computed = [name for name in requested if name in DISH_COMPUTED]
+    return DishFieldset(columns, computed, embeds)
+
+
+def dish_query_options(fieldset):
+    """Опції завантаження: лише потрібні колонки, selectinload для вкладених звʼязків, решта звʼязків не вантажиться."""
+    # Підсумки - звичайні колонки dishes, dish_variants для них не читається
+    columns = fieldset.columns + fieldset.computed
+    if 'image' in fieldset.embeds and 'image_id' not in columns:
+        columns = columns + ['image_id'] # selectinload звʼязку many-to-one бере ключ з уже завантаженого рядка
+    options = [load_only(*[getattr(Dish, name) for name in columns])]
+    for name in DISH_EMBEDS:
+        relationship = getattr(Dish, name)
+        if name not in fieldset.embeds:
+            options.append(noload(relationship))
+        elif name == 'modifier_groups':
+            options.append(selectinload(relationship).selectinload(ModifierGroup.options))
+        else:
+            options.append(selectinload(relationship))
+    return options
+
+
+def dish_output_fields(fieldset):
+    output = {name: dish_model[name] for name in fieldset.columns}
+    output.update({name: COMPUTED_FIELDS[name] for name in fieldset.computed})
+    output.update({name: dish_model[name] for name in fieldset.embeds})
+    return output
@@ -0,0 +1,218 @@
+"""Гості за нормалізованим номером телефону, злиття дублікатів і привʼязка гостей до зареєстрованих користувачів.
+
+До нормалізації один і той самий номер міг потрапити в guests кілька разів ("0501234567" і "+380501234567").
+flask merge-guests спершу заповнює phone_normalized у старих рядках, потім для кожного номера з кількома гостями
+залишає найстарішого, переносить на нього замовлення та бронювання дублікатів і видаляє дублікати.
+Усе робиться пачками по --chunk-size рядків з commit після кожної, тож таблиці не блокуються надовго,
+а перерваний запуск можна просто повторити.
+
+Гість, чий номер збігається з номером користувача, отримує Guest.user_id: при створенні (new_guest), при реєстрації
+(link_guests) або командою flask link-guests для вже існуючих записів. Історія користувача (user_orders_query) - це замовлення
+з його user_id та з guest_id привʼязаних гостей."""
+import time
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import func, or_, select, update
+from app import db
+from app.models import Guest, Order, Reservation, User
+from app.phones import normalize_phone
+
+# Таблиці з guest_id, які переносяться на гостя, що залишається
+GUEST_REFERENCES = (Order, Reservation)
+
+
+def _phone_condition(model, phone_number):
+    """Збіг за нормалізованим номером або точний збіг phone_number - для рядків, де phone_normalized ще не заповнено
+    (записані до міграції, поки не запущено flask merge-guests/link-guests). Обидві колонки з індексами, запит один."""
+    normalized = normalize_phone(phone_number)
+    if normalized is None:
+        # Номер без цифр не нормалізується, тож лише точний збіг (phone_number унікальний)
+        return model.phone_number == phone_number
+    return or_(model.phone_normalized == normalized, model.phone_number == phone_number)
+
+
+def find_guest(phone_number):
+    """Гість за номером у будь-якому записі. Якщо дублікати ще не злиті - найстаріший."""
+    if not phone_number:
+        return None
+    return Guest.query.filter(_phone_condition(Guest, phone_number)).order_by(Guest.id).first()
+
+
+def find_user(phone_number):
+    if not phone_number:
+        return None
+    return User.query.filter(_phone_condition(User, phone_number)).order_by(User.id).first()
+
+
+def new_guest(phone_number, name):
+    """Новий гість (ще не доданий у сесію). Якщо з цим номером вже є користувач, гість одразу привʼязаний до нього,
+    тож замовлення без входу в акаунт теж потрапляють в історію користувача."""
+    user = find_user(phone_number)
+    return Guest(phone_number=phone_number, name=name, user_id=user.id if user is not None else None)
+
+
+def link_guests(user):
+    """Привʼязує до user гостей з тим самим номером, ще не привʼязаних до когось. Commit робить викликач."""
+    if user.id is None or not user.phone_normalized:
+        return 0
+    return db.session.execute(
+        update(Guest).where(Guest.phone_normalized == user.phone_normalized, Guest.user_id.is_(None))
+        .values(user_id=user.id).execution_options(synchronize_session=False)
+    ).rowcount
+
+
+def link_guests_to_users(chunk_size):
+    """Привʼязує до користувачів гостей, записаних до реєстрації. Пачками по id гостя. Повертає кількість гостей."""
+    same_phone_user = select(User.id).where(User.phone_normalized == Guest.phone_normalized)
+    last_id, linked = 0, 0
+    while True:
+        ids = db.session.execute(
+            select(Guest.id).where(Guest.id > last_id, Guest.user_id.is_(None), Guest.phone_normalized.isnot(None))
+            .order_by(Guest.id).limit(chunk_size)
+        ).scalars().all()
+        if not ids:
+            return linked
+        linked += db.session.execute(
+            update(Guest).where(Guest.id.in_(ids), same_phone_user.exists())
+            .values(user_id=same_phone_user.order_by(User.id).limit(1).scalar_subquery())
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.session.commit()
+        last_id = ids[-1]
+
+
+def user_orders_condition(user_id):
+    """Замовлення користувача разом із замовленнями його гостьових записів. Обидві гілки OR йдуть по індексах
+    ix_orders_user_id та ix_orders_guest_id, тож це один запит без обходу всієї таблиці."""
+    linked_guests = select(Guest.id).where(Guest.user_id == user_id)
+    return or_(Order.user_id == user_id, Order.guest_id.in_(linked_guests))
+
+
+def backfill_phone_normalized(model, chunk_size):
+    """Заповнює phone_normalized у рядках, записаних до нормалізації або в обхід ORM. Повертає кількість рядків."""
+    last_id, total = 0, 0
+    while True:
+        rows = db.session.execute(
+            select(model.id, model.phone_number)
+            .where(model.phone_normalized.is_(None), model.id > last_id)
+            .order_by(model.id).limit(chunk_size)
+        ).all()
+        if not rows:
+            return total
+        db.session.execute(update(model), [{'id': row.id, 'phone_normalized': normalize_phone(row.phone_number)}
+                                           for row in rows])
+        db.session.commit()
+        last_id, total = rows[-1].id, total + len(rows)
+
+
+def duplicate_groups(after=None, limit=500):
+    """Наступні limit номерів з кількома гостями: (номер, [id гостей за зростанням]). after - курсор по номеру."""
+    statement = (select(Guest.phone_normalized).where(Guest.phone_normalized.isnot(None))
+                 .group_by(Guest.phone_normalized).having(func.count(Guest.id) > 1)
+                 .order_by(Guest.phone_normalized).limit(limit))
+    if after is not None:
+        statement = statement.where(Guest.phone_normalized > after)
+    numbers = db.session.execute(statement).scalars().all()
+    if not numbers:
+        return []
+    guest_ids = {}
+    for phone, guest_id in db.session.execute(select(Guest.phone_normalized, Guest.id)
+                                              .where(Guest.phone_normalized.in_(numbers)).order_by(Guest.id)):
+        guest_ids.setdefault(phone, []).append(guest_id)
+    return [(phone, guest_ids[phone]) for phone in numbers]
+
+
+def repoint_guest_rows(model, keep_id, duplicate_ids, chunk_size):
+    """Переносить рядки model з дублікатів на keep_id пачками. Кожна пачка - окрема коротка транзакція."""
+    moved = 0
+    while True:
+        ids = db.session.execute(select(model.id).where(model.guest_id.in_(duplicate_ids))
+                                 .order_by(model.id).limit(chunk_size)).scalars().all()
+        if not ids:
+            return moved
+        db.session.execute(update(model).where(model.id.in_(ids)).values(guest_id=keep_id)
+                           .execution_options(synchronize_session=False))
+        db.session.commit()
+        moved += len(ids)
+
+
+def merge_guest_group(guest_ids, chunk_size):
+    """Зливає гостей з одним номером у найстарішого. Повертає {таблиця: перенесено рядків}."""
+    keep_id, duplicate_ids = guest_ids[0], guest_ids[1:]
+    moved = {model.__tablename__: repoint_guest_rows(model, keep_id, duplicate_ids, chunk_size)
+             for model in GUEST_REFERENCES}
+    keep = db.session.get(Guest, keep_id)
+    if keep is not None and keep.user_id is None:
+        # Привʼязка до користувача не губиться, якщо вона була лише в дубліката
+        keep.user_id = db.session.execute(select(Guest.user_id).where(Guest.id.in_(duplicate_ids),
+                                                                      Guest.user_id.isnot(None))
+                                          .order_by(Guest.id)).scalars().first()
+    if keep is not None and not keep.name:
+        # Імʼя беремо з першого дубліката, де воно є
+        keep.name = db.session.execute(select(Guest.name).where(Guest.id.in_(duplicate_ids), Guest.name.isnot(None),
+                                                                Guest.name != '').order_by(Guest.id)).scalars().first()
+    db.session.execute(Guest.__table__.delete().where(Guest.id.in_(duplicate_ids)))
+    db.session.commit()
+    return moved
+
+
+def count_missing_normalized(model):
+    return db.session.execute(select(func.count(model.id)).where(model.phone_normalized.is_(None))).scalar()
+
+
+def merge_duplicate_guests(chunk_size=1000, dry_run=False, echo=lambda message: None):
+    """dry_run нічого не змінює: backfilled - скільки рядків буде заповнено, а дублікати шукаються лише серед
+    рядків, де phone_normalized уже є."""
+    if dry_run:
+        backfilled = {model.__tablename__: count_missing_normalized(model) for model in (Guest, User)}
+    else:
+        backfilled = {model.__tablename__: backfill_phone_normalized(model, chunk_size) for model in (Guest, User)}
+    stats = {'backfilled': backfilled, 'numbers': 0, 'guests_removed': 0,
+             'moved': {model.__tablename__: 0 for model in GUEST_REFERENCES}}
+    after = None
+    while True:
+        groups = duplicate_groups(after)
+        if not groups:
+            return stats
+        for phone, guest_ids in groups:
+            stats['numbers'] += 1
+            stats['guests_removed'] += len(guest_ids) - 1
+            if dry_run:
+                echo(f'{phone}: залишиться гість {guest_ids[0]}, дублікати {guest_ids[1:]}')
+                continue
+            for table_name, count in merge_guest_group(guest_ids, chunk_size).items():
+                stats['moved'][table_name] += count
+        after = groups[-1][0]
+
+
+@click.command('merge-guests')
+@with_appcontext
+@click.option('--chunk-size', type=click.IntRange(1), default=1000, show_default=True,
+              help='Рядків в одній транзакції.')
+@click.option('--dry-run', is_flag=True, help='Лише показати, яких гостей буде злито, без змін у базі.')
+def merge_guests_command(chunk_size, dry_run):
+    """Заповнити phone_normalized і злити гостей з однаковим номером телефону."""
+    started = time.perf_counter()
+    stats = merge_duplicate_guests(chunk_size, dry_run, echo=click.echo)
+    elapsed = time.perf_counter() - started
+    for table_name, count in stats['backfilled'].items():
+        click.echo(f"phone_normalized {'буде заповнено' if dry_run else 'заповнено'} в {table_name}: {count}")
+    if dry_run and any(stats['backfilled'].values()):
+        click.echo('Рядки без phone_normalized не враховані в дублікатах нижче.')
+    action = 'Буде видалено' if dry_run else 'Видалено'
+    click.echo(f"{action} {stats['guests_removed']} дублікатів гостей для {stats['numbers']} номерів за {elapsed:.1f} с.")
+    if not dry_run:
+        for table_name, count in stats['moved'].items():
+            click.echo(f'  перенесено {table_name}: {count}')
+
+
+@click.command('link-guests')
+@with_appcontext
+@click.option('--chunk-size', type=click.IntRange(1), default=1000, show_default=True,
+              help='Гостей в одній транзакції.')
+def link_guests_command(chunk_size):
+    """Привʼязати гостей до користувачів з тим самим номером телефону (для записів до реєстрації)."""
+    started = time.perf_counter()
+    backfilled = sum(backfill_phone_normalized(model, chunk_size) for model in (Guest, User))
+    linked = link_guests_to_users(chunk_size)
+    click.echo(f'phone_normalized заповнено: {backfilled}. Привʼязано гостей: {linked} за {time.perf_counter() - started:.1f} с.')
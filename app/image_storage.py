@@ -0,0 +1,101 @@
+"""Сховища файлів зображень. Бекенд обирається через IMAGE_STORAGE_BACKEND: 'local' або шлях до власного класу
+у форматі 'package.module:ClassName' (наприклад, для S3), який реалізує той самий інтерфейс, що й ImageStorage.
+
+Публічні URL формуються з IMAGE_CDN_BASE_URL, якщо його задано, інакше з IMAGE_BASE_URL. Ключі файлів
+унікальні для кожного завантаження, тому CDN і браузери можуть кешувати їх без обмежень за часом."""
+import importlib
+import os
+from abc import ABC, abstractmethod
+from threading import Lock
+from flask import current_app
+
+_storage_lock = Lock()
+
+
+class ImageStorageError(Exception):
+    pass
+
+
+class ImageStorage(ABC):
+    """Інтерфейс сховища. key - відносний шлях на кшталт 'images/12/320w.webp'."""
+
+    def __init__(self, config):
+        self.base_url = (config.get('IMAGE_CDN_BASE_URL') or config.get('IMAGE_BASE_URL') or '').rstrip('/')
+
+    @abstractmethod
+    def save(self, key, data, content_type):
+        pass
+
+    @abstractmethod
+    def load(self, key):
+        pass
+
+    @abstractmethod
+    def delete(self, key):
+        pass
+
+    def url(self, key):
+        return f'{self.base_url}/{key}'
+
+    def local_path(self, key):
+        """Шлях на диску, якщо файли віддає сам застосунок (/api/images/files/<key>). None - віддає зовнішній сервер/CDN."""
+        return None
+
+
+class LocalImageStorage(ImageStorage):
+    """Файли в IMAGE_STORAGE_DIR (за замовчуванням instance/images)."""
+
+    def __init__(self, config, root):
+        super().__init__(config)
+        self.root = os.path.abspath(root)
+
+    def _path(self, key):
+        path = os.path.abspath(os.path.join(self.root, key))
+        if os.path.commonpath([path, self.root]) != self.root:
+            raise ImageStorageError(f'Некоректний ключ файлу: {key}')
+        return path
+
+    def save(self, key, data, content_type):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Запис у тимчасовий файл і перейменування: файл ніколи не віддається наполовину записаним
+        temporary_path = f'{path}.tmp'
+        with open(temporary_path, 'wb') as image_file:
+            image_file.write(data)
+        os.replace(temporary_path, path)
+
+    def load(self, key):
+        with open(self._path(key), 'rb') as image_file:
+            return image_file.read()
+
+    def delete(self, key):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def local_path(self, key):
+        return self._path(key)
+
+
+def create_storage(app):
+    backend = app.config.get('IMAGE_STORAGE_BACKEND') or 'local'
+    if backend == 'local':
+        root = app.config.get('IMAGE_STORAGE_DIR') or os.path.join(app.instance_path, 'images')
+        return LocalImageStorage(app.config, root)
+    module_name, _, class_name = backend.partition(':')
+    if not class_name:
+        raise ImageStorageError(f"IMAGE_STORAGE_BACKEND має бути 'local' або 'package.module:ClassName', отримано {backend!r}")
+    return getattr(importlib.import_module(module_name), class_name)(app.config)
+
+
+def get_storage():
+    """Одне сховище на застосунок, створюється при першому зверненні."""
+    storage = current_app.extensions.get('image_storage')
+    if storage is not None:
+        return storage
+    with _storage_lock:
+        storage = current_app.extensions.get('image_storage')
+        if storage is None:
+            storage = current_app.extensions['image_storage'] = create_storage(current_app)
+    return storage
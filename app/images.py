@@ -0,0 +1,190 @@
+"""Зображення страв і новин: завантаження оригіналу, фонове створення зменшених копій та WebP, маніфест для відповідей.
+
+Оригінал зберігається одразу під час запиту, а копії шириною IMAGE_VARIANT_WIDTHS (у форматі оригіналу та WebP)
+генеруються в пулі з IMAGE_WORKERS потоків: Pillow відпускає GIL під час декодування і масштабування, тож пул
+не блокує воркер. IMAGE_WORKERS=0 обробляє зображення одразу в запиті (зручно в тестах).
+Черга пулу живе лише в памʼяті воркера: зображення, що чекали обробки під час перезапуску, лишаються pending,
+і їх доробляє flask process-images.
+Pillow імпортується лише при першому завантаженні, веб-воркери без адмін-запитів його не вантажать."""
+import io
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from threading import Lock
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from app import db
+from app.image_storage import get_storage
+from app.models import Image
+
+# Формат Pillow -> (розширення, content-type). Інші формати приводяться до JPEG або PNG (якщо є прозорість)
+IMAGE_FORMATS = {
+    'JPEG': ('jpg', 'image/jpeg'),
+    'PNG': ('png', 'image/png'),
+    'WEBP': ('webp', 'image/webp'),
+}
+WEBP_FORMAT = 'WEBP'
+
+_pool_lock = Lock()
+
+
+class ImageUploadError(ValueError):
+    pass
+
+
+def _open(data):
+    from PIL import Image as PilImage, UnidentifiedImageError # Лінивий імпорт, див. докстрінг модуля
+    try:
+        picture = PilImage.open(io.BytesIO(data))
+        picture.load()
+    except (UnidentifiedImageError, PilImage.DecompressionBombError, OSError) as e:
+        raise ImageUploadError(f'Не вдалося прочитати зображення: {e}')
+    return picture
+
+
+def _output_format(picture):
+    if picture.format in IMAGE_FORMATS and picture.format != WEBP_FORMAT:
+        return picture.format
+    return 'PNG' if picture.mode in ('RGBA', 'LA', 'P') else 'JPEG'
+
+
+def _encode(picture, image_format):
+    buffer = io.BytesIO()
+    if image_format == 'JPEG':
+        picture.convert('RGB').save(buffer, 'JPEG', quality=82, optimize=True, progressive=True)
+    elif image_format == WEBP_FORMAT:
+        picture.save(buffer, 'WEBP', quality=80, method=4)
+    else:
+        picture.save(buffer, image_format, optimize=True)
+    return buffer.getvalue()
+
+
+def variant_widths(original_width, widths):
+    """Ширини копій: лише менші за оригінал. Якщо оригінал вужчий за всі, лишається одна копія його ширини (для WebP)."""
+    result = sorted({width for width in widths if width < original_width})
+    return result or [original_width]
+
+
+def store_upload(data):
+    """Перевіряє файл, зберігає оригінал і створює запис Image у статусі pending. Commit робить викликач."""
+    picture = _open(data)
+    image_format = picture.format if picture.format in IMAGE_FORMATS else None
+    if image_format is None:
+        raise ImageUploadError(f"Непідтримуваний формат {picture.format}. Дозволені: {', '.join(IMAGE_FORMATS)}")
+    extension, content_type = IMAGE_FORMATS[image_format]
+    image = Image(storage_key='', content_type=content_type, width=picture.width, height=picture.height,
+                  status='pending', variants=[])
+    db.session.add(image)
+    db.session.flush() # id потрібен для ключа файлу
+    image.storage_key = f'images/{image.id}/original.{extension}'
+    get_storage().save(image.storage_key, data, content_type)
+    return image
+
+
+def generate_variants(image):
+    """Створює зменшені копії у форматі оригіналу та WebP і зберігає їх у сховищі. Повертає список для Image.variants."""
+    from PIL import Image as PilImage, ImageOps
+    storage = get_storage()
+    original = ImageOps.exif_transpose(_open(storage.load(image.storage_key)))
+    output_format = _output_format(original)
+    if original.mode not in ('RGB', 'RGBA', 'L'):
+        original = original.convert('RGBA' if output_format == 'PNG' else 'RGB') # Палітра не масштабується з LANCZOS
+    variants = []
+    for width in variant_widths(original.width, current_app.config.get('IMAGE_VARIANT_WIDTHS', (320, 640))):
+        height = max(1, round(original.height * width / original.width))
+        resized = original if width == original.width else original.resize((width, height), PilImage.LANCZOS)
+        for image_format in dict.fromkeys((output_format, WEBP_FORMAT)):
+            extension, content_type = IMAGE_FORMATS[image_format]
+            key = f'images/{image.id}/{width}w.{extension}'
+            data = _encode(resized, image_format)
+            storage.save(key, data, content_type)
+            variants.append({'width': width, 'height': height, 'format': extension, 'key': key, 'bytes': len(data)})
+    return variants
+
+
+def process_image(image_id):
+    """Обробка одного зображення. Помилка не губиться: статус failed і текст помилки видно в маніфесті."""
+    image = db.session.get(Image, image_id)
+    if image is None:
+        return
+    try:
+        image.variants = generate_variants(image)
+        image.status = 'ready'
+        image.error = None
+    except Exception as e:
+        current_app.logger.exception(f"Не вдалося обробити зображення {image_id}")
+        image.status = 'failed'
+        image.error = str(e)
+    db.session.commit()
+
+
+def _process_in_background(app, image_id):
+    with app.app_context():
+        process_image(image_id)
+
+
+def image_pool():
+    """Один пул потоків на застосунок, створюється при першому завантаженні (вже після fork воркера gunicorn)."""
+    pool = current_app.extensions.get('image_pool')
+    if pool is not None:
+        return pool
+    with _pool_lock:
+        pool = current_app.extensions.get('image_pool')
+        if pool is None:
+            pool = ThreadPoolExecutor(max_workers=current_app.config['IMAGE_WORKERS'], thread_name_prefix='images')
+            current_app.extensions['image_pool'] = pool
+    return pool
+
+
+def schedule_processing(image_id):
+    """Викликати після commit запису Image, інакше фоновий потік його не побачить."""
+    if not current_app.config.get('IMAGE_WORKERS'):
+        process_image(image_id)
+        return
+    image_pool().submit(_process_in_background, current_app._get_current_object(), image_id)
+
+
+def stale_image_ids(older_than_minutes, include_failed=False):
+    """Зображення, що лишились pending довше за older_than_minutes (обробку перервав перезапуск воркера)."""
+    statuses = ('pending', 'failed') if include_failed else ('pending',)
+    cutoff = datetime.now(timezone.utc) - timedelta(minutes=older_than_minutes)
+    return db.session.execute(db.select(Image.id).where(Image.status.in_(statuses), Image.created_at < cutoff)
+                              .order_by(Image.id)).scalars().all()
+
+
+@click.command('process-images')
+@with_appcontext
+@click.option('--older-than', 'older_than_minutes', type=click.IntRange(0), default=10, show_default=True,
+              help='Лише зображення, завантажені більше ніж стільки хвилин тому (свіжі ще обробляє воркер).')
+@click.option('--include-failed', is_flag=True, help='Також повторити обробку зображень зі статусом failed.')
+def process_images_command(older_than_minutes, include_failed):
+    """Обробити зображення, що застрягли в pending після перезапуску воркера."""
+    started = time.perf_counter()
+    image_ids = stale_image_ids(older_than_minutes, include_failed)
+    for image_id in image_ids:
+        process_image(image_id)
+    statuses = dict(db.session.execute(db.select(Image.status, db.func.count(Image.id))
+                                       .where(Image.id.in_(image_ids)).group_by(Image.status)).all()) if image_ids else {}
+    click.echo(f"Оброблено зображень: {len(image_ids)} (ready: {statuses.get('ready', 0)}, "
+               f"failed: {statuses.get('failed', 0)}) за {time.perf_counter() - started:.1f} с.")
+
+
+def image_manifest(image):
+    """Оригінал і копії з публічними URL (з урахуванням IMAGE_CDN_BASE_URL) та готові srcset за форматами."""
+    storage = get_storage()
+    variants = [{'width': variant['width'], 'height': variant['height'], 'format': variant['format'],
+                 'url': storage.url(variant['key'])} for variant in image.variants or []]
+    srcset = {}
+    for variant in variants:
+        srcset.setdefault(variant['format'], []).append(f"{variant['url']} {variant['width']}w")
+    return {
+        'id': image.id,
+        'status': image.status,
+        'error': image.error,
+        'width': image.width,
+        'height': image.height,
+        'original': storage.url(image.storage_key),
+        'variants': variants,
+        'srcset': {image_format: ', '.join(entries) for image_format, entries in srcset.items()},
+    }
@@ -0,0 +1,196 @@
+import time
+from threading import Lock
+from flask import g, has_request_context, request, request_started
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Межі гістограми тривалості запиту (секунди)
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class RequestStats:
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.query_count = 0
+        self.db_time = 0.0
+        self.serialize_time = 0.0
+
+
+class EndpointStats:
+    def __init__(self):
+        self.requests = {} # статус -> кількість
+        self.duration_sum = 0.0
+        self.duration_buckets = [0] * len(DURATION_BUCKETS)
+        self.query_count = 0
+        self.db_time = 0.0
+        self.serialize_time = 0.0
+        self.handler_time = 0.0
+
+
+class MetricsRegistry:
+    """Агреговані метрики по ендпоінтах у межах процесу."""
+
+    def __init__(self):
+        self._lock = Lock()
+        self.endpoints = {}
+        self.collectors = [] # Додаткові функції, що повертають рядки у форматі Prometheus
+
+    def observe(self, endpoint, method, status, duration, stats):
+        handler_time = max(duration - stats.db_time - stats.serialize_time, 0.0)
+        with self._lock:
+            endpoint_stats = self.endpoints.setdefault((endpoint, method), EndpointStats())
+            endpoint_stats.requests[status] = endpoint_stats.requests.get(status, 0) + 1
+            endpoint_stats.duration_sum += duration
+            for index, bound in enumerate(DURATION_BUCKETS):
+                if duration <= bound:
+                    endpoint_stats.duration_buckets[index] += 1
+            endpoint_stats.query_count += stats.query_count
+            endpoint_stats.db_time += stats.db_time
+            endpoint_stats.serialize_time += stats.serialize_time
+            endpoint_stats.handler_time += handler_time
+
+    def reset(self):
+        with self._lock:
+            self.endpoints.clear()
+
+    def render_prometheus(self):
+        lines = []
+
+        def metric(name, metric_type, help_text, samples):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {metric_type}')
+            lines.extend(samples)
+
+        with self._lock:
+            items = sorted(self.endpoints.items())
+            requests, buckets, sums, counts, queries, db_time, serialize_time, handler_time = [], [], [], [], [], [], [], []
+            for (endpoint, method), stats in items:
+                labels = f'endpoint="{endpoint}",method="{method}"'
+                total = sum(stats.requests.values())
+                for status, count in sorted(stats.requests.items()):
+                    requests.append(f'restaurant_http_requests_total{{{labels},status="{status}"}} {count}')
+                for bound, count in zip(DURATION_BUCKETS, stats.duration_buckets):
+                    buckets.append(f'restaurant_http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {count}')
+                buckets.append(f'restaurant_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {total}')
+                sums.append(f'restaurant_http_request_duration_seconds_sum{{{labels}}} {stats.duration_sum:.6f}')
+                counts.append(f'restaurant_http_request_duration_seconds_count{{{labels}}} {total}')
+                queries.append(f'restaurant_db_queries_total{{{labels}}} {stats.query_count}')
+                db_time.append(f'restaurant_db_time_seconds_total{{{labels}}} {stats.db_time:.6f}')
+                serialize_time.append(f'restaurant_serialization_time_seconds_total{{{labels}}} {stats.serialize_time:.6f}')
+                handler_time.append(f'restaurant_handler_time_seconds_total{{{labels}}} {stats.handler_time:.6f}')
+
+        metric('restaurant_http_requests_total', 'counter', 'Кількість HTTP-запитів', requests)
+        metric('restaurant_http_request_duration_seconds', 'histogram', 'Повна тривалість обробки запиту', buckets + sums + counts)
+        metric('restaurant_db_queries_total', 'counter', 'Кількість SQL-запитів', queries)
+        metric('restaurant_db_time_seconds_total', 'counter', 'Час виконання SQL-запитів', db_time)
+        metric('restaurant_serialization_time_seconds_total', 'counter', 'Час серіалізації відповіді', serialize_time)
+        metric('restaurant_handler_time_seconds_total', 'counter', 'Час обробника без БД та серіалізації', handler_time)
+        for collector in self.collectors:
+            lines.extend(collector())
+        return '\n'.join(lines) + '\n'
+
+
+metrics = MetricsRegistry()
+
+
+def current_stats():
+    if has_request_context():
+        return g.get('request_stats')
+    return None
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_started_at', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get('query_started_at')
+    if not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    stats = current_stats()
+    if stats is not None:
+        stats.query_count += 1
+        stats.db_time += elapsed
+    for observer in query_observers:
+        observer(conn, cursor, statement, parameters, executemany, elapsed)
+
+
+def _handle_error(exception_context):
+    # Запит впав - after_cursor_execute не буде, тож знімаємо його час зі стеку, щоб наступні запити на цьому
+    # зʼєднанні не рахувались від чужого старту. Без execution_context помилка сталась ще до before_cursor_execute
+    conn = exception_context.connection
+    if conn is not None and exception_context.execution_context is not None:
+        started = conn.info.get('query_started_at')
+        if started:
+            started.pop()
+
+
+# Функції observer(conn, cursor, statement, parameters, executemany, elapsed), які викликаються після кожного SQL-запиту
+query_observers = []
+_engine_listeners_registered = False
+
+
+def _register_engine_listeners():
+    global _engine_listeners_registered
+    if _engine_listeners_registered:
+        return
+    event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+    event.listen(Engine, 'handle_error', _handle_error)
+    _engine_listeners_registered = True
+
+
+def add_query_observer(observer):
+    _register_engine_listeners()
+    if observer not in query_observers:
+        query_observers.append(observer)
+
+
+def timed_representation(representation):
+    """Обгортає функцію представлення flask-restx, щоб рахувати час серіалізації."""
+    def wrapper(data, code, headers=None):
+        started = time.perf_counter()
+        try:
+            return representation(data, code, headers)
+        finally:
+            stats = current_stats()
+            if stats is not None:
+                stats.serialize_time += time.perf_counter() - started
+    return wrapper
+
+
+def _start_request(sender, **extra):
+    g.request_stats = RequestStats()
+
+
+def _finish_request(response):
+    stats = g.pop('request_stats', None)
+    if stats is None:
+        return response
+    duration = time.perf_counter() - stats.started_at
+    handler_time = max(duration - stats.db_time - stats.serialize_time, 0.0)
+    endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+    metrics.observe(endpoint, request.method, response.status_code, duration, stats)
+
+    response.headers.add('Server-Timing', ', '.join([
+        f'db;dur={stats.db_time * 1000:.2f};desc="{stats.query_count} queries"',
+        f'serialize;dur={stats.serialize_time * 1000:.2f}',
+        f'handler;dur={handler_time * 1000:.2f}',
+        f'total;dur={duration * 1000:.2f}'
+    ]))
+    return response
+
+
+def init_instrumentation(app, api):
+    """Лічильники SQL-запитів і часу на запит: заголовок Server-Timing та агрегати для /api/_metrics."""
+    if not app.config.get('INSTRUMENTATION_ENABLED', True):
+        return
+    _register_engine_listeners()
+    for mediatype, representation in list(api.representations.items()):
+        if not getattr(representation, 'is_timed', False):
+            wrapped = timed_representation(representation)
+            wrapped.is_timed = True
+            api.representations[mediatype] = wrapped
+    request_started.connect(_start_request, app)
+    app.after_request(_finish_request)
@@ -0,0 +1,16 @@
+import importlib
+
+
+class LazyModule:
+    """Модуль, що імпортується при першому зверненні до його атрибута.
+    importlib.import_module бере блокування модуля, тож одночасні перші звернення з різних потоків безпечні."""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        module = self._module
+        if module is None:
+            module = self._module = importlib.import_module(self._name)
+        return getattr(module, attr)
@@ -0,0 +1,59 @@
+from flask import current_app
+from sqlalchemy.orm import joinedload, raiseload, selectinload
+from app.models import (Dish, ModifierGroup, News, Order, OrderItem, OrderItemModifier, Reservation)
+
+# Політики завантаження звʼязків для кожного типу ендпоінта.
+# Моделі за замовчуванням вантажать звʼязки ліниво, а тут задається, що саме потрібно відповіді.
+# У тестах (SQLALCHEMY_RAISELOAD) все, що не описано політикою, кидає помилку замість тихого N+1.
+
+
+def _finalize(options):
+    if current_app.config.get('SQLALCHEMY_RAISELOAD'):
+        options.append(raiseload('*'))
+    return options
+
+
+def dish_full_options():
+    """Повна модель Dish: варіанти, теги, групи модифікаторів з опціями, маніфест зображення."""
+    return _finalize([
+        selectinload(Dish.image),
+        selectinload(Dish.variants),
+        selectinload(Dish.tags),
+        selectinload(Dish.modifier_groups).selectinload(ModifierGroup.options)
+    ])
+
+
+def news_options():
+    """NewsSchema: маніфест зображення."""
+    return _finalize([selectinload(News.image)])
+
+
+def modifier_group_options():
+    return _finalize([selectinload(ModifierGroup.options)])
+
+
+def order_full_options():
+    """OrderSchema: позиції з стравою, варіантом і модифікаторами, користувач/гість."""
+    return _finalize([
+        joinedload(Order.user),
+        joinedload(Order.guest),
+        selectinload(Order.items).options(
+            joinedload(OrderItem.dish),
+            joinedload(OrderItem.variant),
+            selectinload(OrderItem.modifiers).joinedload(OrderItemModifier.modifier_option)
+        )
+    ])
+
+
+def order_delete_options():
+    """Для каскадного видалення потрібні лише id позицій та їх модифікаторів."""
+    return [selectinload(Order.items).selectinload(OrderItem.modifiers)]
+
+
+def reservation_full_options():
+    """reservation_model/ReservationSchema: користувач, гість і столик."""
+    return _finalize([
+        joinedload(Reservation.user),
+        joinedload(Reservation.guest),
+        joinedload(Reservation.table)
+    ])
@@ -0,0 +1,294 @@
+import csv
+import io
+from decimal import Decimal, InvalidOperation
+from sqlalchemy.orm import selectinload
+from app import db
+from app.models import Dish, DishVariant, ModifierGroup
+from app.tags import resolve_tags
+from app.dish_summary import update_dish_summary
+
+DISH_FIELDS = ('name', 'description', 'detailed_description', 'image_url', 'category', 'is_available')
+VARIANT_FIELDS = ('size_label', 'weight_grams', 'volume_ml', 'price', 'is_default')
+
+# Один рядок CSV = один варіант страви. Поля страви повторюються в кожному рядку її варіантів
+CSV_FIELDS = ('dish_id', 'name', 'description', 'detailed_description', 'image_url', 'category', 'is_available',
+              'tags', 'modifier_group_ids', 'variant_id', 'size_label', 'weight_grams', 'volume_ml', 'price', 'is_default')
+CSV_LIST_SEPARATOR = ';'
+
+TRUE_VALUES = ('1', 'true', 'yes', 'так', 'y', 't')
+
+
+class ImportDocumentError(Exception):
+    """Документ неможливо розібрати взагалі (а не окремий рядок)."""
+
+
+def _csv_bool(value, default):
+    if value is None or value.strip() == '':
+        return default
+    return value.strip().lower() in TRUE_VALUES
+
+
+def _csv_int(value):
+    return int(value) if value is not None and value.strip() != '' else None
+
+
+def _csv_list(value):
+    if not value:
+        return []
+    return [part.strip() for part in value.split(CSV_LIST_SEPARATOR) if part.strip()]
+
+
+def parse_json_document(document):
+    """Приймає {'dishes': [...]} або просто список страв. Повертає [(номер рядка, дані страви)]."""
+    dishes = document.get('dishes') if isinstance(document, dict) else document
+    if not isinstance(dishes, list):
+        raise ImportDocumentError("Очікується список страв або об'єкт з ключем 'dishes'.")
+    return [(index, dish_data) for index, dish_data in enumerate(dishes, start=1)]
+
+
+def parse_csv_document(text):
+    """Групує рядки CSV за dish_id (або назвою, якщо id немає). Номер рядка - перший рядок страви у файлі."""
+    reader = csv.DictReader(io.StringIO(text))
+    if not reader.fieldnames or 'name' not in reader.fieldnames:
+        raise ImportDocumentError("CSV має містити заголовок з колонкою 'name'.")
+
+    grouped = {}
+    for line_number, row in enumerate(reader, start=2):
+        try:
+            dish_id = _csv_int(row.get('dish_id'))
+        except ValueError:
+            dish_id = row.get('dish_id')
+        key = ('id', dish_id) if dish_id is not None else ('name', (row.get('name') or '').strip())
+        if key not in grouped:
+            dish_data = {
+                'name': (row.get('name') or '').strip(),
+                'tags': _csv_list(row.get('tags')),
+                'modifier_groups': [],
+                'variants': []
+            }
+            if dish_id is not None:
+                dish_data['id'] = dish_id
+            for field in ('description', 'detailed_description', 'image_url', 'category'):
+                if row.get(field):
+                    dish_data[field] = row[field]
+            dish_data['is_available'] = _csv_bool(row.get('is_available'), True)
+            for group_id in _csv_list(row.get('modifier_group_ids')):
+                dish_data['modifier_groups'].append({'id': int(group_id) if group_id.isdigit() else group_id})
+            grouped[key] = (line_number, dish_data)
+
+        dish_data = grouped[key][1]
+        if row.get('size_label') or row.get('price'):
+            variant = {
+                'size_label': row.get('size_label'),
+                'price': row.get('price'),
+                'is_default': _csv_bool(row.get('is_default'), False)
+            }
+            for field in ('variant_id', 'weight_grams', 'volume_ml'):
+                try:
+                    value = _csv_int(row.get(field))
+                except ValueError:
+                    value = row.get(field)
+                if value is not None:
+                    variant['id' if field == 'variant_id' else field] = value
+            dish_data['variants'].append(variant)
+
+    return list(grouped.values())
+
+
+def _validate_dish(dish_data):
+    """Перевіряє одну страву без звернень до БД. Повертає список помилок."""
+    if not isinstance(dish_data, dict):
+        return ["Страва має бути об'єктом."]
+    errors = []
+    if dish_data.get('id') is not None and not isinstance(dish_data['id'], int):
+        errors.append("Поле 'id' має бути цілим числом.")
+    if not dish_data.get('name'):
+        errors.append("Поле 'name' є обов'язковим.")
+
+    tags = dish_data.get('tags') or []
+    if not isinstance(tags, list) or not all(isinstance(name, str) and name for name in tags):
+        errors.append("Теги повинні бути непорожніми рядками.")
+
+    groups = dish_data.get('modifier_groups') or []
+    if not isinstance(groups, list) or not all(isinstance(group, dict) and isinstance(group.get('id'), int) for group in groups):
+        errors.append("Невірний формат modifier_groups: очікується [{'id': N}].")
+
+    variants = dish_data.get('variants')
+    if not variants or not isinstance(variants, list):
+        errors.append("Поле 'variants' є обов'язковим.")
+        return errors
+    for position, variant in enumerate(variants, start=1):
+        if not isinstance(variant, dict) or not variant.get('size_label') or variant.get('price') in (None, ''):
+            errors.append(f"Варіант {position} має містити 'size_label' та 'price'.")
+            continue
+        try:
+            price = Decimal(str(variant['price']))
+            # NaN та Infinity Decimal приймає, але numeric їх не зберігає, а розрахунок замовлення на них падає
+            if not price.is_finite():
+                raise InvalidOperation
+            negative = price < 0
+        except InvalidOperation:
+            errors.append(f"Варіант {position}: невірна ціна '{variant['price']}'.")
+            continue
+        if negative:
+            errors.append(f"Варіант {position}: ціна не може бути від'ємною.")
+        for field in ('id', 'weight_grams', 'volume_ml'):
+            if variant.get(field) is not None and not isinstance(variant[field], int):
+                errors.append(f"Варіант {position}: поле '{field}' має бути цілим числом.")
+    return errors
+
+
+def _apply_variants(dish, variants_data):
+    """Оновлює варіанти на місці (за id або size_label), додає нові та прибирає зайві."""
+    existing_by_id = {variant.id: variant for variant in dish.variants if variant.id is not None}
+    existing_by_label = {variant.size_label: variant for variant in dish.variants}
+    result = []
+    for variant_data in variants_data:
+        variant = existing_by_id.get(variant_data.get('id')) or existing_by_label.get(variant_data['size_label'])
+        if variant is None or variant in result:
+            variant = DishVariant()
+        for field in VARIANT_FIELDS:
+            if field in variant_data:
+                value = variant_data[field]
+                setattr(variant, field, Decimal(str(value)) if field == 'price' else value)
+        result.append(variant)
+    dish.variants = result
+
+
+def import_dishes(rows, dry_run=False):
+    """Створює/оновлює страви однією транзакцією. rows - [(номер рядка, дані страви)].
+    Невалідні рядки не переривають імпорт, а повертаються в 'errors'."""
+    errors = []
+    valid_rows = []
+    for row_number, dish_data in rows:
+        row_errors = _validate_dish(dish_data)
+        if row_errors:
+            errors.append({'row': row_number, 'errors': row_errors})
+        else:
+            valid_rows.append((row_number, dish_data))
+
+    # Всі зв'язані сутності дістаємо кількома IN-запитами на весь документ
+    group_ids = {group['id'] for _, dish_data in valid_rows for group in dish_data.get('modifier_groups') or []}
+    groups = {group.id: group for group in ModifierGroup.query.filter(ModifierGroup.id.in_(group_ids)).all()} if group_ids else {}
+
+    dish_ids = {dish_data['id'] for _, dish_data in valid_rows if dish_data.get('id') is not None}
+    names = {dish_data['name'] for _, dish_data in valid_rows if dish_data.get('id') is None}
+    load_options = (selectinload(Dish.variants), selectinload(Dish.tags), selectinload(Dish.modifier_groups))
+    dishes_by_id = {dish.id: dish for dish in Dish.query.options(*load_options).filter(Dish.id.in_(dish_ids)).all()} if dish_ids else {}
+    dishes_by_name = {}
+    if names:
+        for dish in Dish.query.options(*load_options).filter(Dish.name.in_(names)).order_by(Dish.id).all():
+            dishes_by_name.setdefault(dish.name, dish)
+
+    accepted_rows = []
+    for row_number, dish_data in valid_rows:
+        row_errors = []
+        missing_groups = {group['id'] for group in dish_data.get('modifier_groups') or []} - set(groups)
+        if missing_groups:
+            row_errors.append(f"Групи модифікаторів з ID {sorted(missing_groups)} не знайдено.")
+        if dish_data.get('id') is not None and dish_data['id'] not in dishes_by_id:
+            row_errors.append(f"Страву з ID {dish_data['id']} не знайдено.")
+        if row_errors:
+            errors.append({'row': row_number, 'errors': row_errors})
+        else:
+            accepted_rows.append((row_number, dish_data))
+
+    tags = resolve_tags(name for _, dish_data in accepted_rows for name in dish_data.get('tags') or [])
+
+    created, updated = [], []
+    new_dishes = []
+    for row_number, dish_data in accepted_rows:
+        if dish_data.get('id') is not None:
+            dish = dishes_by_id[dish_data['id']]
+        else:
+            dish = dishes_by_name.get(dish_data['name'])
+        if dish is None:
+            dish = Dish()
+            dishes_by_name[dish_data['name']] = dish
+            new_dishes.append(dish)
+            created.append(row_number)
+        else:
+            updated.append(row_number)
+
+        for field in DISH_FIELDS:
+            if field in dish_data:
+                setattr(dish, field, dish_data[field])
+        if dish.is_available is None:
+            dish.is_available = True
+        _apply_variants(dish, dish_data['variants'])
+        # Як і в PUT, відсутній ключ не чіпає наявні зв'язки
+        if 'tags' in dish_data:
+            dish.tags = [tags[name] for name in dict.fromkeys(dish_data['tags'] or [])]
+        if 'modifier_groups' in dish_data:
+            dish.modifier_groups = [groups[group['id']] for group in dish_data['modifier_groups'] or []]
+        update_dish_summary(dish)
+
+    # Нові страви вставляються пакетно (insertmanyvalues) одним flush
+    db.session.add_all(new_dishes)
+    if dry_run:
+        db.session.flush() # Обмеження БД перевіряються і в пробному імпорті, помилку обробляє викликач
+        db.session.rollback()
+    else:
+        db.session.commit()
+
+    return {
+        'created': len(created),
+        'updated': len(updated),
+        'dry_run': dry_run,
+        'errors': errors
+    }
+
+
+def export_dishes():
+    dishes = Dish.query.options(
+        selectinload(Dish.variants), selectinload(Dish.tags), selectinload(Dish.modifier_groups)
+    ).order_by(Dish.id).all()
+    return [{
+        'id': dish.id,
+        'name': dish.name,
+        'description': dish.description,
+        'detailed_description': dish.detailed_description,
+        'image_url': dish.image_url,
+        'category': dish.category,
+        'is_available': dish.is_available,
+        'tags': [tag.name for tag in dish.tags],
+        'modifier_groups': [{'id': group.id} for group in dish.modifier_groups],
+        'variants': [{
+            'id': variant.id,
+            'size_label': variant.size_label,
+            'weight_grams': variant.weight_grams,
+            'volume_ml': variant.volume_ml,
+            'price': float(variant.price),
+            'is_default': variant.is_default
+        } for variant in dish.variants]
+    } for dish in dishes]
+
+
+def export_dishes_csv(dishes):
+    output = io.StringIO()
+    writer = csv.DictWriter(output, fieldnames=CSV_FIELDS)
+    writer.writeheader()
+    for dish in dishes:
+        base = {
+            'dish_id': dish['id'],
+            'name': dish['name'],
+            'description': dish['description'],
+            'detailed_description': dish['detailed_description'],
+            'image_url': dish['image_url'],
+            'category': dish['category'],
+            'is_available': dish['is_available'],
+            'tags': CSV_LIST_SEPARATOR.join(dish['tags']),
+            'modifier_group_ids': CSV_LIST_SEPARATOR.join(str(group['id']) for group in dish['modifier_groups'])
+        }
+        for variant in dish['variants'] or [{}]:
+            row = dict(base)
+            row.update({
+                'variant_id': variant.get('id'),
+                'size_label': variant.get('size_label'),
+                'weight_grams': variant.get('weight_grams'),
+                'volume_ml': variant.get('volume_ml'),
+                'price': variant.get('price'),
+                'is_default': variant.get('is_default')
+            })
+            writer.writerow(row)
+    return output.getvalue()
@@ -0,0 +1,138 @@
+import re
+from bisect import bisect_left
+from decimal import Decimal
+from app import db
+from app.cache import SnapshotCache
+from app.models import Dish, DishVariant, Tag, dish_tags_table
+
+TOKEN_RE = re.compile(r"[\w']+", re.UNICODE)
+
+
+def tokenize(text):
+    return [token.replace("'", '') for token in TOKEN_RE.findall((text or '').lower())]
+
+
+class MenuIndex:
+    """Інвертований індекс меню: категорія/тег/доступність/слова -> множина id страв."""
+
+    def __init__(self, dish_rows, variant_rows, tag_rows):
+        self.dish_ids = []
+        self.by_category = {}
+        self.category_names = {}
+        self.by_tag = {}
+        self.tag_names = {}
+        self.available = set()
+        self.prices = {}
+        self.by_token = {}
+
+        for dish_id, name, description, category, is_available in dish_rows:
+            self.dish_ids.append(dish_id)
+            if category:
+                key = category.lower()
+                self.by_category.setdefault(key, set()).add(dish_id)
+                self.category_names.setdefault(key, category)
+            if is_available:
+                self.available.add(dish_id)
+            for token in tokenize(name) + tokenize(description):
+                self.by_token.setdefault(token, set()).add(dish_id)
+
+        for dish_id, price in variant_rows:
+            self.prices.setdefault(dish_id, []).append(Decimal(price))
+
+        for dish_id, tag_name in tag_rows:
+            key = tag_name.lower() # Як і категорії, теги порівнюються без урахування регістру
+            self.by_tag.setdefault(key, set()).add(dish_id)
+            self.tag_names.setdefault(key, tag_name)
+
+        self.all_ids = frozenset(self.dish_ids)
+        self.vocabulary = sorted(self.by_token)
+
+    def _match_token(self, token):
+        # Пошук за префіксом: "карб" знайде "карбонара". Словник відсортований, тому це бінарний пошук
+        result = set()
+        position = bisect_left(self.vocabulary, token)
+        while position < len(self.vocabulary) and self.vocabulary[position].startswith(token):
+            result |= self.by_token[self.vocabulary[position]]
+            position += 1
+        return result
+
+    def _category_ids(self, categories):
+        result = set()
+        for category in categories:
+            result |= self.by_category.get(category.lower(), set())
+        return result
+
+    def _tag_ids(self, tags, tag_mode):
+        sets = [self.by_tag.get(tag.lower(), set()) for tag in tags]
+        if tag_mode == 'all':
+            return set.intersection(*sets)
+        return set().union(*sets)
+
+    def _price_ids(self, min_price, max_price):
+        result = set()
+        for dish_id, prices in self.prices.items():
+            if any((min_price is None or price >= min_price) and (max_price is None or price <= max_price) for price in prices):
+                result.add(dish_id)
+        return result
+
+    def _filter_sets(self, filters):
+        """Множини id для кожного активного фільтра окремо (потрібно для фасетів)."""
+        sets = {}
+        if filters.get('category'):
+            sets['category'] = self._category_ids(filters['category'])
+        if filters.get('tag'):
+            sets['tag'] = self._tag_ids(filters['tag'], filters.get('tag_mode') or 'any')
+        if filters.get('available') is not None:
+            sets['available'] = self.available if filters['available'] else self.all_ids - self.available
+        if filters.get('min_price') is not None or filters.get('max_price') is not None:
+            sets['price'] = self._price_ids(filters.get('min_price'), filters.get('max_price'))
+        if filters.get('q'):
+            tokens = tokenize(filters['q'])
+            sets['q'] = set.intersection(*[self._match_token(token) for token in tokens]) if tokens else set(self.all_ids)
+        return sets
+
+    def _intersect(self, sets, exclude=None):
+        result = set(self.all_ids)
+        for name, ids in sets.items():
+            if name != exclude:
+                result &= ids
+        return result
+
+    def search(self, filters):
+        """Відфільтровані id страв у порядку id."""
+        matched = self._intersect(self._filter_sets(filters))
+        return [dish_id for dish_id in self.dish_ids if dish_id in matched]
+
+    def facets(self, filters):
+        """Кількість страв по категоріях і тегах. Фасет рахується без власного фільтра,
+        щоб клієнт бачив, скільки страв дасть вибір іншої категорії/тегу."""
+        sets = self._filter_sets(filters)
+        matched = self._intersect(sets)
+        category_base = self._intersect(sets, exclude='category')
+        tag_base = self._intersect(sets, exclude='tag')
+
+        categories = [
+            {'value': self.category_names[key], 'count': len(ids & category_base)}
+            for key, ids in self.by_category.items()
+        ]
+        tags = [{'value': self.tag_names[key], 'count': len(ids & tag_base)} for key, ids in self.by_tag.items()]
+        return {
+            'total': len(matched),
+            'available': len(matched & self.available),
+            'categories': sorted([c for c in categories if c['count']], key=lambda c: (-c['count'], c['value'])),
+            'tags': sorted([t for t in tags if t['count']], key=lambda t: (-t['count'], t['value']))
+        }
+
+
+def build_menu_index():
+    dish_rows = db.session.query(Dish.id, Dish.name, Dish.description, Dish.category, Dish.is_available).order_by(Dish.id).all()
+    variant_rows = db.session.query(DishVariant.dish_id, DishVariant.price).all()
+    tag_rows = db.session.query(dish_tags_table.c.dish_id, Tag.name).join(Tag, Tag.id == dish_tags_table.c.tag_id).all()
+    return MenuIndex(dish_rows, variant_rows, tag_rows)
+
+
+menu_index = SnapshotCache(build_menu_index, ('dishes', 'dish_variants', 'tags', 'dish_tags'))
+
+
+def has_filters(filters):
+    return any(filters.get(name) not in (None, [], '') for name in ('category', 'tag', 'available', 'min_price', 'max_price', 'q'))
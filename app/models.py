@@ -2,6 +2,12 @@ from app import db
 from datetime import datetime, timezone,timedelta
 from werkzeug.security import generate_password_hash, check_password_hash
 from sqlalchemy.sql import func
+from sqlalchemy.orm import deferred, validates
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from app.phones import normalize_phone
+
+# Повнотекстовий вектор для пошуку. В Postgres це tsvector з GIN-індексом, в інших БД колонка не використовується
+SearchVector = db.Text().with_variant(TSVECTOR(), 'postgresql')
 
 variant_id = db.Column(db.Integer, db.ForeignKey('dish_variants.id'), nullable=False)
 variant = db.relationship('DishVariant')
@@ -60,10 +66,16 @@ class User(db.Model):
     first_name = db.Column(db.String(80))
     last_name = db.Column(db.String(80))
     phone_number = db.Column(db.String(20), unique = True, nullable = False)
+    phone_normalized = db.Column(db.String(20), nullable=True, index=True) # Для пошуку, див. app/phones.py
     is_admin = db.Column(db.Boolean, default=False)  # Потенційне адмін меню
 
     orders = db.relationship('Order', backref='user', lazy='dynamic')
 
+    @validates('phone_number')
+    def _normalize_phone(self, key, value):
+        self.phone_normalized = normalize_phone(value)
+        return value
+
     def set_password(self, password):
         self.password_hash = generate_password_hash(password)
 
@@ -78,6 +90,10 @@ class Guest(db.Model):
 
     id = db.Column(db.Integer, primary_key=True)
     phone_number = db.Column(db.String(20), nullable=False, unique=True)
+    # Один гість на номер: пошук і дедуплікація (flask merge-guests) йдуть по нормалізованому номеру
+    phone_normalized = db.Column(db.String(20), nullable=True, index=True)
+    # Користувач, який зареєструвався з номером гостя: його гостьова історія видна в /api/users/<id>/history
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True, index=True)
     name = db.Column(db.String(100))
     created_at = db.Column(db.DateTime, default=func.now())
     
@@ -85,6 +101,11 @@ class Guest(db.Model):
                           foreign_keys='Order.guest_id')
     reservations = db.relationship('Reservation', backref='guest', lazy='dynamic',
                                foreign_keys='Reservation.guest_id')
+
+    @validates('phone_number')
+    def _normalize_phone(self, key, value):
+        self.phone_normalized = normalize_phone(value)
+        return value
     
     def __repr__(self):
         return f'<Guest {self.phone_number}>'
@@ -147,16 +168,45 @@ class DishVariant(db.Model):
     def __repr__(self):
         return f'<DishVariant {self.size_label} for Dish ID {self.dish_id}>'
 
+class Image(db.Model):
+    __tablename__ = 'images'
+
+    id = db.Column(db.Integer, primary_key=True)
+    storage_key = db.Column(db.String(255), nullable=False) # Ключ оригіналу у сховищі (app/image_storage.py)
+    content_type = db.Column(db.String(50), nullable=False)
+    width = db.Column(db.Integer, nullable=False)
+    height = db.Column(db.Integer, nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='pending') # pending -> ready або failed
+    # Зменшені копії: [{'width': 320, 'height': 240, 'format': 'webp', 'key': 'images/1/320w.webp', 'bytes': 12345}, ...]
+    variants = db.Column(db.JSON, nullable=False, default=list)
+    error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc))
+
+    def __repr__(self):
+        return f'<Image {self.id} {self.status}>'
+
+
 class Dish(db.Model):
     __tablename__ = 'dishes'
+    __table_args__ = (
+        db.Index('ix_dishes_search_vector', 'search_vector', postgresql_using='gin'),
+        db.Index('ix_dishes_name_trgm', 'name', postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     description = db.Column(db.Text)
     detailed_description = db.Column(db.Text)
     image_url = db.Column(db.String(255))  # URL зображення
+    image_id = db.Column(db.Integer, db.ForeignKey('images.id'), nullable=True) # Завантажене зображення з маніфестом розмірів
     category = db.Column(db.String(50))  # Категорія страви (наприклад, "Кофе", "Десерти")
     is_available = db.Column(db.Boolean, default=True)  # Чи доступна страва зараз
+    search_vector = deferred(db.Column(SearchVector, nullable=True)) # Оновлюється автоматично в app/search.py
+    # Денормалізовані підсумки для списків меню, підтримуються в app/dish_summary.py
+    min_price = db.Column(db.Numeric(10, 2), nullable=True) # Мінімальна ціна серед варіантів
+    max_price = db.Column(db.Numeric(10, 2), nullable=True) # Максимальна ціна серед варіантів
+    variant_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    has_required_modifiers = db.Column(db.Boolean, nullable=False, default=False, server_default=db.false())
 
     variants = db.relationship(
         'DishVariant', back_populates='dish', cascade='all, delete-orphan', lazy='select'
@@ -164,6 +214,7 @@ class Dish(db.Model):
     tags = db.relationship(
         'Tag', secondary=dish_tags_table, backref=db.backref('dishes', lazy='dynamic'), lazy='select'
     )
+    image = db.relationship('Image', lazy='select')
     modifier_groups = db.relationship( 
         'ModifierGroup',
         secondary=dish_modifier_groups_table, 
@@ -177,12 +228,29 @@ class Dish(db.Model):
 
 class News(db.Model):
     __tablename__ = 'news'
-    # Мабуть додати новинам перевірку на дату і якщо дата більше за потрібну вони самі вимикаються
+    __table_args__ = (
+        db.Index('ix_news_search_vector', 'search_vector', postgresql_using='gin'),
+        db.Index('ix_news_name_trgm', 'name', postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}),
+    )
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100))
     description = db.Column(db.Text)
     image_url = db.Column(db.String(255))  # URL зображення
-    is_actual = db.Column(db.Boolean, default=True)  # Чи актуальна новина
+    image_id = db.Column(db.Integer, db.ForeignKey('images.id'), nullable=True)
+    is_actual = db.Column(db.Boolean, default=True)  # Ручний вимикач новини, незалежно від дат
+    # Період показу (UTC): без publish_at показується одразу, без expire_at - безстроково. Див. app/news_feed.py
+    publish_at = db.Column(db.DateTime(timezone=True), nullable=True, index=True)
+    expire_at = db.Column(db.DateTime(timezone=True), nullable=True, index=True)
+    search_vector = deferred(db.Column(SearchVector, nullable=True)) # Оновлюється автоматично в app/search.py
+
+    image = db.relationship('Image', lazy='select')
+
+    @validates('publish_at', 'expire_at')
+    def _to_utc(self, key, value):
+        # SQLite зберігає дату без часового поясу, тому всі дати новин приводяться до UTC (дата без поясу вважається UTC)
+        if value is None:
+            return None
+        return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
 
     def __repr__(self):
         return f'<News {self.name}>'
@@ -191,8 +259,8 @@ class Order(db.Model):
     __tablename__ = 'orders'
 
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
-    guest_id = db.Column(db.Integer, db.ForeignKey('guests.id'), nullable=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True, index=True)
+    guest_id = db.Column(db.Integer, db.ForeignKey('guests.id'), nullable=True, index=True)
     order_date = db.Column(db.DateTime, default=func.now())
     status = db.Column(db.String(50), default='В обробці')  # Статус замовлення ("В обробці", "Готується", "Доставлено", інші статуси)
     total_price = db.Column(db.Numeric(10, 2))
@@ -204,7 +272,7 @@ class Order(db.Model):
     'OrderItem',
     back_populates='order',
     cascade='all, delete-orphan',
-    lazy='joined'
+    lazy='select' # Що підвантажувати, вирішує політика ендпоінта в app/loading.py
     )
 
     def __repr__(self):
@@ -231,7 +299,7 @@ class OrderItem(db.Model):
         'OrderItemModifier',
         backref='order_item',
         cascade="all, delete-orphan",
-        lazy='joined'
+        lazy='select'
     )
 
     def __repr__(self):
@@ -257,7 +325,7 @@ class Reservation(db.Model):
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
-    guest_id = db.Column(db.Integer, db.ForeignKey('guests.id'), nullable=True)
+    guest_id = db.Column(db.Integer, db.ForeignKey('guests.id'), nullable=True, index=True)
     table_id = db.Column(db.Integer, db.ForeignKey('tables.id'), nullable=False)
 
     reservation_start_time = db.Column(db.DateTime, nullable=False, index=True)
@@ -0,0 +1,67 @@
+from collections import namedtuple
+from app import db
+from app.cache import SnapshotCache
+from app.models import ModifierGroup, ModifierOption, dish_modifier_groups_table
+
+GroupRule = namedtuple('GroupRule', 'id name is_required selection_type option_ids')
+
+
+class DishModifierRules:
+    """Правила вибору модифікаторів однієї страви: групи та індекс опція -> група."""
+
+    def __init__(self, groups):
+        self.groups = groups
+        self.option_groups = {option_id: group.id for group in groups.values() for option_id in group.option_ids}
+
+
+EMPTY_RULES = DishModifierRules({})
+
+
+def build_modifier_index():
+    options_by_group = {}
+    for option_id, group_id in db.session.query(ModifierOption.id, ModifierOption.group_id):
+        options_by_group.setdefault(group_id, set()).add(option_id)
+
+    groups = {
+        row.id: GroupRule(row.id, row.name, bool(row.is_required), row.selection_type, frozenset(options_by_group.get(row.id, ())))
+        for row in db.session.query(ModifierGroup.id, ModifierGroup.name, ModifierGroup.is_required, ModifierGroup.selection_type)
+    }
+
+    groups_by_dish = {}
+    links = db.session.query(dish_modifier_groups_table.c.dish_id, dish_modifier_groups_table.c.modifier_group_id)
+    for dish_id, group_id in links:
+        if group_id in groups:
+            groups_by_dish.setdefault(dish_id, {})[group_id] = groups[group_id]
+
+    return {dish_id: DishModifierRules(dish_groups) for dish_id, dish_groups in groups_by_dish.items()}
+
+
+# Індекс перебудовується після змін страв, груп модифікаторів чи їх опцій
+modifier_index = SnapshotCache(
+    build_modifier_index,
+    ('dishes', 'dish_modifier_groups', 'modifier_groups', 'modifier_options')
+)
+
+
+def get_dish_rules(dish_id):
+    return modifier_index.get().get(dish_id, EMPTY_RULES)
+
+
+def check_modifier_selection(rules, dish_name, option_ids):
+    """Перевіряє вибрані опції за правилами страви. Повертає список помилок (порожній, якщо все гаразд)."""
+    errors = []
+    selected_per_group = {}
+    for option_id in option_ids:
+        group_id = rules.option_groups.get(option_id)
+        if group_id is None:
+            errors.append(f'Модифікатор з id {option_id} недоступний для страви "{dish_name}"')
+            continue
+        selected_per_group[group_id] = selected_per_group.get(group_id, 0) + 1
+
+    for group in rules.groups.values():
+        selected = selected_per_group.get(group.id, 0)
+        if group.is_required and selected == 0:
+            errors.append(f'Потрібно обрати опцію в групі "{group.name}" для страви "{dish_name}"')
+        if group.selection_type == 'single' and selected > 1:
+            errors.append(f'У групі "{group.name}" можна обрати лише одну опцію')
+    return errors
@@ -0,0 +1,64 @@
+"""Стрічка новин за періодом показу (News.publish_at/expire_at) та кеш активних новин.
+
+Активна новина: is_actual, вже опублікована (publish_at порожня або настала) і ще не завершена (expire_at порожня
+або в майбутньому). Список активних новин будується один раз і живе в SnapshotCache до найближчої межі - моменту,
+коли якась новина закінчується або публікується, - тож він сам застаріває саме тоді, коли змінюється його вміст."""
+from collections import namedtuple
+from datetime import datetime, timezone
+from sqlalchemy import and_, func, not_, or_
+from app import db
+from app.cache import SnapshotCache
+from app.lazy import LazyModule
+from app.loading import news_options
+from app.models import News
+
+schemas = LazyModule('app.schemas')
+
+ActiveNews = namedtuple('ActiveNews', 'items valid_until')
+
+
+def utcnow():
+    return datetime.now(timezone.utc)
+
+
+def as_utc(value):
+    # SQLite повертає дати без часового поясу, вони зберігаються в UTC (див. News._to_utc)
+    if value is None or value.tzinfo is not None:
+        return value
+    return value.replace(tzinfo=timezone.utc)
+
+
+def published_condition(now):
+    return or_(News.publish_at.is_(None), News.publish_at <= now)
+
+
+def active_condition(now):
+    return and_(News.is_actual.is_(True), published_condition(now), or_(News.expire_at.is_(None), News.expire_at > now))
+
+
+def archive_condition(now):
+    """Вже опубліковані новини, які більше не показуються: завершені або вимкнені вручну."""
+    return and_(published_condition(now), not_(active_condition(now)))
+
+
+def feed_order():
+    # Новіші спершу. Новини без publish_at показуються з моменту створення, тож ідуть за id
+    return (News.publish_at.desc().nulls_last(), News.id.desc())
+
+
+def next_boundary(now):
+    """Найближчий момент після now, коли зміниться список активних новин: чиясь публікація або завершення."""
+    next_publish = db.session.query(func.min(News.publish_at)).filter(News.is_actual.is_(True), News.publish_at > now).scalar()
+    next_expire = db.session.query(func.min(News.expire_at)).filter(active_condition(now), News.expire_at.isnot(None)).scalar()
+    boundaries = [as_utc(value) for value in (next_publish, next_expire) if value is not None]
+    return min(boundaries) if boundaries else None
+
+
+def build_active_news():
+    now = utcnow()
+    news = News.query.options(*news_options()).filter(active_condition(now)).order_by(*feed_order()).all()
+    # Кешується вже серіалізований список, тож запит до кешу не платить і за NewsSchema
+    return ActiveNews(schemas.NewsSchema(many=True).dump(news), next_boundary(now))
+
+
+active_news = SnapshotCache(build_active_news, ('news', 'images'), valid_until=lambda snapshot: snapshot.valid_until)
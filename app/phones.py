@@ -0,0 +1,17 @@
+"""Нормалізація номерів телефону до E.164 (+380XXXXXXXXX для українських номерів).
+
+Номери зберігаються так, як їх ввели ("050 123-45-67", "+380501234567"), а пошук іде по нормалізованій колонці
+phone_normalized у User та Guest, яка заповнюється при записі phone_number (див. app/models.py)."""
+import re
+
+
+def normalize_phone(number):
+    """Прибирає все, крім цифр і +, та додає код України до локальних номерів. Порожній номер -> None."""
+    if not number:
+        return None
+    cleaned = re.sub(r"[^\d+]", "", number)
+    if re.fullmatch(r"0\d{9}", cleaned): # Якщо номер починається з 0 і має довжину в 10 цифр то додаємо код країни
+        cleaned = "+380" + cleaned[1:]
+    elif re.fullmatch(r"380\d{9}", cleaned): # Додаємо + якщо '380...'
+        cleaned = "+" + cleaned
+    return cleaned or None
@@ -0,0 +1,144 @@
+from collections import namedtuple
+from decimal import Decimal
+from app import db
+from app.cache import SnapshotCache
+from app.modifiers import get_dish_rules, check_modifier_selection
+from app.models import Dish, DishVariant, ModifierOption
+
+CENTS = Decimal('0.01')
+
+DishPrice = namedtuple('DishPrice', 'id name is_available')
+VariantPrice = namedtuple('VariantPrice', 'id dish_id size_label price')
+OptionPrice = namedtuple('OptionPrice', 'id group_id name price')
+QuoteLine = namedtuple('QuoteLine', 'dish_id variant_id quantity modifier_option_ids unit_price line_total dish_name variant_label')
+
+
+class CartQuote(namedtuple('CartQuote', 'lines total_price')):
+    def as_dict(self):
+        return {'items': [line._asdict() for line in self.lines], 'total_price': self.total_price}
+
+
+class PricingError(Exception):
+    """Помилка в кошику. message та status_code повертаються клієнту як є."""
+
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+
+class PriceTable:
+    def __init__(self, dishes, variants, options):
+        self.dishes = dishes
+        self.variants = variants
+        self.options = options
+
+
+def _to_decimal(value):
+    return Decimal(value if value is not None else 0).quantize(CENTS)
+
+
+def build_price_table():
+    dishes = {
+        row.id: DishPrice(row.id, row.name, bool(row.is_available))
+        for row in db.session.query(Dish.id, Dish.name, Dish.is_available)
+    }
+    variants = {
+        row.id: VariantPrice(row.id, row.dish_id, row.size_label, _to_decimal(row.price))
+        for row in db.session.query(DishVariant.id, DishVariant.dish_id, DishVariant.size_label, DishVariant.price)
+    }
+    options = {
+        row.id: OptionPrice(row.id, row.group_id, row.name, _to_decimal(row.price_modifier))
+        for row in db.session.query(ModifierOption.id, ModifierOption.group_id, ModifierOption.name, ModifierOption.price_modifier)
+    }
+    return PriceTable(dishes, variants, options)
+
+
+# Таблиця цін перебудовується після будь-якого коміту, що змінив меню в цьому процесі. Інші воркери бачать зміну
+# лише через MENU_CACHE_TTL_SECONDS, тому знімок використовується для /quote, а замовлення - fresh_price_table
+price_table = SnapshotCache(build_price_table, ('dishes', 'dish_variants', 'modifier_options'))
+
+
+def _cart_ids(items):
+    dish_ids, variant_ids, option_ids = set(), set(), set()
+    for item_data in items:
+        dish_ids.add(item_data.get('dish_id'))
+        variant_ids.add(item_data.get('variant_id'))
+        option_ids.update(item_data.get('modifier_option_ids') or [])
+    return [{value for value in ids if isinstance(value, int)} for ids in (dish_ids, variant_ids, option_ids)]
+
+
+def fresh_price_table(items):
+    """Ціни та доступність лише для страв, варіантів і модифікаторів кошика - прямо з БД, не зі знімка процесу.
+    Страви з варіантами - один запит з IN, модифікатори - ще один (якщо вибрані)."""
+    dish_ids, variant_ids, option_ids = _cart_ids(items)
+    dishes, variants, options = {}, {}, {}
+    if dish_ids:
+        rows = db.session.execute(
+            db.select(Dish.id, Dish.name, Dish.is_available,
+                      DishVariant.id.label('variant_id'), DishVariant.size_label, DishVariant.price)
+            .outerjoin(DishVariant, db.and_(DishVariant.dish_id == Dish.id, DishVariant.id.in_(variant_ids)))
+            .where(Dish.id.in_(dish_ids))
+        )
+        for row in rows:
+            dishes[row.id] = DishPrice(row.id, row.name, bool(row.is_available))
+            if row.variant_id is not None:
+                variants[row.variant_id] = VariantPrice(row.variant_id, row.id, row.size_label, _to_decimal(row.price))
+    if option_ids:
+        options = {
+            row.id: OptionPrice(row.id, row.group_id, row.name, _to_decimal(row.price_modifier))
+            for row in db.session.query(ModifierOption.id, ModifierOption.group_id, ModifierOption.name,
+                                        ModifierOption.price_modifier).filter(ModifierOption.id.in_(option_ids))
+        }
+    return PriceTable(dishes, variants, options)
+
+
+def price_cart(items, table=None):
+    """Рахує ціну кошика в Decimal за один прохід по позиціях. Кидає PricingError на невалідну позицію.
+    table - PriceTable (за замовчуванням знімок процесу price_table)."""
+    if table is None:
+        table = price_table.get()
+    lines = []
+    total_price = Decimal('0.00')
+
+    for item_data in items:
+        dish_id = item_data.get('dish_id')
+        variant_id = item_data.get('variant_id')
+        quantity = item_data.get('quantity')
+        modifier_option_ids = item_data.get('modifier_option_ids') or []
+
+        if not dish_id or not variant_id or not quantity:
+            raise PricingError('Кожен item повинен мати dish_id, variant_id і quantity')
+
+        dish = table.dishes.get(dish_id)
+        if dish is None:
+            raise PricingError('Dish not found', 404)
+
+        variant = table.variants.get(variant_id)
+        if variant is None or variant.dish_id != dish.id:
+            raise PricingError('Варіант страви не знайдено')
+
+        if not dish.is_available:
+            raise PricingError(f'Страва "{dish.name}" недоступна')
+
+        if quantity <= 0:
+            raise PricingError("Кількість страв має бути більше нуля")
+
+        # Ціна: базова з варіанту + сума модифікаторів
+        unit_price = variant.price
+        for mod_id in modifier_option_ids:
+            option = table.options.get(mod_id)
+            if option is None:
+                raise PricingError(f'Модифікатор з id {mod_id} не знайдено')
+            unit_price += option.price
+
+        modifier_errors = check_modifier_selection(get_dish_rules(dish.id), dish.name, modifier_option_ids)
+        if modifier_errors:
+            raise PricingError('; '.join(modifier_errors))
+
+        line_total = unit_price * quantity
+        total_price += line_total
+        lines.append(QuoteLine(dish.id, variant.id, quantity, list(modifier_option_ids),
+                               unit_price, line_total, dish.name, variant.size_label))
+
+    return CartQuote(lines, total_price)
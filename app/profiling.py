@@ -0,0 +1,171 @@
+import cProfile
+import io
+import json
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+import uuid
+from functools import wraps
+from flask import current_app, request
+from app.security import admin_token_valid
+
+PROFILE_HEADER = 'X-Profile' # cprofile (за замовчуванням) або sampling
+PROFILE_QUERY_ARG = '_profile'
+PROFILE_ID_HEADER = 'X-Profile-Id'
+PROFILE_FORMATS = {'cprofile': '.prof', 'sampling': '.speedscope.json'}
+_PROFILE_ID_RE = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+
+
+class SamplingProfiler:
+    """Періодично знімає стек потоку запиту (sys._current_frames) і зберігає у форматі speedscope."""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.samples = []
+        self._stop = threading.Event()
+        self._thread = None
+        self._target = None
+
+    def start(self):
+        self._target = threading.get_ident()
+        self._started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name='request-sampler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.duration = time.perf_counter() - self._started_at
+
+    def _run(self):
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            now = time.perf_counter()
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+                frame = frame.f_back
+            if stack:
+                self.samples.append((now - last, stack[::-1]))
+            last = now
+
+    def to_speedscope(self, name):
+        frames, frame_index, samples, weights = [], {}, [], []
+        for weight, stack in self.samples:
+            indexes = []
+            for key in stack:
+                if key not in frame_index:
+                    frame_index[key] = len(frames)
+                    frames.append({'name': key[0], 'file': key[1], 'line': key[2]})
+                indexes.append(frame_index[key])
+            samples.append(indexes)
+            weights.append(round(weight * 1000, 3))
+        return {
+            '$schema': 'https://www.speedscope.app/file-format-schema.json',
+            'name': name,
+            'exporter': 'restaurant-api',
+            'shared': {'frames': frames},
+            'profiles': [{'type': 'sampled', 'name': name, 'unit': 'milliseconds', 'startValue': 0,
+                          'endValue': round(sum(weights), 3), 'samples': samples, 'weights': weights}]
+        }
+
+
+def profile_dir(app=None):
+    app = app or current_app
+    return app.config.get('PROFILE_DIR') or os.path.join(app.instance_path, 'profiles')
+
+
+def requested_profile_mode():
+    """Режим профілювання для поточного запиту або None. Потрібні PROFILING_ENABLED та адмін-токен."""
+    if not current_app.config.get('PROFILING_ENABLED'):
+        return None
+    value = request.headers.get(PROFILE_HEADER) or request.args.get(PROFILE_QUERY_ARG)
+    if not value:
+        return None
+    if not admin_token_valid():
+        current_app.logger.warning(f"Запит на профілювання {request.path} без правильного адмін-токена проігноровано.")
+        return None
+    return 'sampling' if value.lower() in ('sampling', 'speedscope') else 'cprofile'
+
+
+def _profile_id():
+    candidate = request.headers.get('X-Request-ID', '')
+    return candidate if _PROFILE_ID_RE.match(candidate) else uuid.uuid4().hex
+
+
+def _prune(directory, keep):
+    files = sorted((os.path.join(directory, name) for name in os.listdir(directory)), key=os.path.getmtime)
+    for path in files[:-keep] if keep else []:
+        os.remove(path)
+
+
+def save_profile(profile_id, mode, profiler, name):
+    directory = profile_dir()
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, profile_id + PROFILE_FORMATS[mode])
+    if mode == 'cprofile':
+        profiler.dump_stats(path)
+    else:
+        with open(path, 'w', encoding='utf-8') as profile_file:
+            json.dump(profiler.to_speedscope(name), profile_file)
+    _prune(directory, current_app.config.get('PROFILE_MAX_FILES', 50))
+    return path
+
+
+def find_profile(profile_id):
+    """Шлях до збереженого профілю та його формат, або (None, None)."""
+    if not _PROFILE_ID_RE.match(profile_id):
+        return None, None
+    for mode, suffix in PROFILE_FORMATS.items():
+        path = os.path.join(profile_dir(), profile_id + suffix)
+        if os.path.exists(path):
+            return path, mode
+    return None, None
+
+
+def pstats_summary(path, limit=40, sort='cumulative'):
+    output = io.StringIO()
+    stats = pstats.Stats(path, stream=output)
+    stats.strip_dirs().sort_stats(sort).print_stats(limit)
+    return output.getvalue()
+
+
+def profile_dispatch(view):
+    """Декоратор для Api.decorators: профілює диспетчеризацію ресурсу flask-restx, якщо цього попросили."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        mode = requested_profile_mode()
+        if mode is None:
+            return view(*args, **kwargs)
+
+        profile_id = _profile_id()
+        name = f'{request.method} {request.full_path.rstrip("?")}'
+        if mode == 'cprofile':
+            profiler = cProfile.Profile()
+            profiler.enable()
+        else:
+            profiler = SamplingProfiler(current_app.config.get('PROFILE_SAMPLING_INTERVAL_MS', 1) / 1000)
+            profiler.start()
+        try:
+            response = view(*args, **kwargs)
+        finally:
+            # Профіль зберігається і тоді, коли обробник завершився помилкою
+            if mode == 'cprofile':
+                profiler.disable()
+            else:
+                profiler.stop()
+            save_profile(profile_id, mode, profiler, name)
+
+        response.headers[PROFILE_ID_HEADER] = profile_id
+        return response
+    return wrapper
+
+
+def init_profiling(api):
+    if profile_dispatch not in api.decorators:
+        api.decorators.append(profile_dispatch)
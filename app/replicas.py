@@ -0,0 +1,200 @@
+"""Читання з реплік Postgres.
+
+GET/HEAD/OPTIONS-запити читають з однієї з реплік (round-robin серед здорових), усе інше - з основної бази.
+Одразу після запиту, що змінює дані, клієнт отримує cookie, і його наступні читання протягом
+DB_READ_YOUR_WRITES_SECONDS йдуть в основну базу, щоб він бачив власні зміни попри затримку реплікації.
+Те саме можна попросити явно заголовком X-Read-Primary: 1.
+Знімки в памʼяті процесу (SnapshotCache) завжди будуються з основної бази, див. primary_reads."""
+import time
+from contextlib import contextmanager
+from itertools import count
+from threading import Lock
+from flask import current_app, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.sql import Select
+
+REPLICA_BIND_PREFIX = 'replica_'
+READ_PRIMARY_COOKIE = 'read_primary'
+READ_PRIMARY_HEADER = 'X-Read-Primary'
+READ_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+def replica_bind_keys(urls):
+    return [f'{REPLICA_BIND_PREFIX}{index}' for index in range(len(urls))]
+
+
+class ReplicaRouter:
+    """Вибір репліки: round-robin серед здорових; впала або відстає - виключається на DB_REPLICA_RETRY_SECONDS."""
+
+    def __init__(self, keys, health_interval=10, retry_after=30, max_lag_seconds=None):
+        self.keys = list(keys)
+        self.health_interval = health_interval
+        self.retry_after = retry_after
+        self.max_lag_seconds = max_lag_seconds
+        self._lock = Lock()
+        self._counter = count()
+        self._down_until = {}
+        self._checked_at = {}
+        self.reads = {key: 0 for key in self.keys}
+
+    def mark_down(self, key, reason):
+        with self._lock:
+            self._down_until[key] = time.monotonic() + self.retry_after
+        current_app.logger.warning(f"Репліку {key} тимчасово виключено: {reason}")
+
+    def is_healthy(self, key):
+        return self._down_until.get(key, 0) <= time.monotonic()
+
+    def _check(self, key, engine):
+        """Легка перевірка доступності та відставання репліки, не частіше ніж раз на health_interval."""
+        now = time.monotonic()
+        if now - self._checked_at.get(key, 0) < self.health_interval:
+            return True
+        self._checked_at[key] = now
+        try:
+            with engine.connect() as connection:
+                if self.max_lag_seconds and engine.dialect.name == 'postgresql':
+                    # Без нових записів на основній базі час останньої відтвореної транзакції не змінюється,
+                    # тож відставання рахуємо лише тоді, коли репліка справді має що відтворювати
+                    lag = connection.execute(text(
+                        'SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 '
+                        'ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END')).scalar()
+                    if lag is not None and lag > self.max_lag_seconds:
+                        self.mark_down(key, f'відставання {lag:.1f} с')
+                        return False
+                else:
+                    connection.execute(text('SELECT 1'))
+        except DBAPIError as e:
+            self.mark_down(key, e.orig)
+            return False
+        return True
+
+    def choose(self, engines):
+        for _ in range(len(self.keys)):
+            key = self.keys[next(self._counter) % len(self.keys)]
+            if self.is_healthy(key) and self._check(key, engines[key]):
+                with self._lock:
+                    self.reads[key] += 1
+                return key
+        return None
+
+    def render_metrics(self):
+        lines = ['# HELP restaurant_db_replica_healthy Чи використовується репліка для читань',
+                 '# TYPE restaurant_db_replica_healthy gauge']
+        lines += [f'restaurant_db_replica_healthy{{replica="{key}"}} {int(self.is_healthy(key))}' for key in self.keys]
+        lines += ['# HELP restaurant_db_replica_sessions_total Скільки сесій читали з репліки',
+                  '# TYPE restaurant_db_replica_sessions_total counter']
+        lines += [f'restaurant_db_replica_sessions_total{{replica="{key}"}} {value}' for key, value in self.reads.items()]
+        return lines
+
+
+def _router():
+    return current_app.extensions.get('db_replicas')
+
+
+def reads_from_replica_allowed():
+    if not has_request_context() or request.method not in READ_METHODS:
+        return False
+    if request.headers.get(READ_PRIMARY_HEADER) == '1' or request.cookies.get(READ_PRIMARY_COOKIE):
+        return False
+    return True
+
+
+class RoutingSession(Session):
+    """Сесія Flask-SQLAlchemy, що спрямовує SELECT-и читаючих запитів на репліку.
+    Будь-який запис (flush, INSERT/UPDATE/DELETE) переводить сесію на основну базу до її закриття."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is not None:
+            return bind
+        primary = super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+        router = _router()
+        if router is None or self._flushing or self.info.get('use_primary') or self.info.get('primary_reads'):
+            return primary
+        if getattr(clause, 'is_dml', False):
+            self.info['use_primary'] = True
+            return primary
+        if not isinstance(clause, Select) or not reads_from_replica_allowed():
+            return primary
+
+        key = self.info.get('replica_key')
+        if key is None or not router.is_healthy(key):
+            key = router.choose(self._db.engines)
+            if key is None:
+                return primary
+            self.info['replica_key'] = key
+        return self._db.engines[key]
+
+
+@contextmanager
+def primary_reads(session):
+    """SELECT-и всередині блоку йдуть в основну базу. Для знімків, які живуть у процесі довше за запит:
+    збудований з репліки одразу після локального commit знімок лишився б застарілим до кінця TTL."""
+    session.info['primary_reads'] = session.info.get('primary_reads', 0) + 1
+    try:
+        yield
+    finally:
+        session.info['primary_reads'] -= 1
+
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _stick_to_primary(session, flush_context):
+    # Після запису читаємо з основної бази, інакше репліка не побачить щойно записаного
+    session.info['use_primary'] = True
+
+
+@event.listens_for(RoutingSession, 'after_commit')
+def _reset_routing(session):
+    session.info.pop('replica_key', None)
+    session.info.pop('use_primary', None)
+
+
+def render_replica_metrics():
+    router = current_app.extensions.get('db_replicas')
+    return router.render_metrics() if router else []
+
+
+def _remember_writes(response):
+    """Після успішного запису клієнт ще DB_READ_YOUR_WRITES_SECONDS читає з основної бази."""
+    if request.method not in READ_METHODS and response.status_code < 400:
+        response.set_cookie(READ_PRIMARY_COOKIE, '1', max_age=current_app.config.get('DB_READ_YOUR_WRITES_SECONDS', 5),
+                            httponly=True, samesite='Lax')
+    return response
+
+
+def configure_replica_binds(app, engine_options):
+    """Додає репліки з DATABASE_REPLICA_URLS у SQLALCHEMY_BINDS (до db.init_app). engine_options(url) -> опції рушія."""
+    urls = app.config.get('DATABASE_REPLICA_URLS') or []
+    if not urls:
+        return
+    binds = dict(app.config.get('SQLALCHEMY_BINDS') or {})
+    for key, url in zip(replica_bind_keys(urls), urls):
+        binds[key] = {'url': url, **engine_options(url)}
+    app.config['SQLALCHEMY_BINDS'] = binds
+
+
+def init_replicas(app, db, metrics):
+    urls = app.config.get('DATABASE_REPLICA_URLS') or []
+    if not urls:
+        return
+    keys = replica_bind_keys(urls)
+    router = ReplicaRouter(keys,
+                           health_interval=app.config.get('DB_REPLICA_HEALTH_INTERVAL_SECONDS', 10),
+                           retry_after=app.config.get('DB_REPLICA_RETRY_SECONDS', 30),
+                           max_lag_seconds=app.config.get('DB_REPLICA_MAX_LAG_SECONDS'))
+    app.extensions['db_replicas'] = router
+
+    with app.app_context():
+        for key in keys:
+            def on_error(context, key=key):
+                # Обрив зʼєднання з реплікою - виключаємо її, а повтор GET (app/db_pool.py) піде на іншу
+                if context.is_disconnect:
+                    with app.app_context():
+                        router.mark_down(key, context.original_exception)
+            event.listen(db.engines[key], 'handle_error', on_error)
+
+    app.after_request(_remember_writes)
+    if render_replica_metrics not in metrics.collectors:
+        metrics.collectors.append(render_replica_metrics)
@@ -0,0 +1,78 @@
+"""Бінарні представлення відповідей API для мобільних клієнтів: MessagePack та CBOR.
+
+Клієнт із `Accept: application/msgpack` (або `application/cbor`) отримує ті самі змаршалені моделі, що й у JSON,
+лише в компактнішому кодуванні. Значення, які JSON-версія показує через fields.Float та fields.DateTime, мають той самий
+вигляд і тут: Decimal -> float, datetime/date/time -> рядок ISO 8601. Бібліотеки необовʼязкові (requirements-binary.txt):
+якщо пакет не встановлено, формат просто не реєструється, і клієнт отримує JSON."""
+import importlib.util
+from datetime import date, datetime, time
+from decimal import Decimal
+from flask import make_response
+from app.lazy import LazyModule
+
+MSGPACK_MEDIATYPE = 'application/msgpack'
+CBOR_MEDIATYPE = 'application/cbor'
+
+msgpack = LazyModule('msgpack')
+cbor2 = LazyModule('cbor2')
+
+
+def plain_value(value):
+    """Типи, яких немає в MessagePack/CBOR без розширень -> ті самі значення, що бачить JSON-клієнт."""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    raise TypeError(f'Тип {type(value).__name__} не підтримується у бінарній відповіді')
+
+
+def _encode_plain(encoder, value):
+    encoder.encode(plain_value(value))
+
+
+# cbor2 сам кодує Decimal і datetime своїми тегами (4 та 0), тому для однаковості з MessagePack і JSON
+# перевизначаємо кодувальники цих типів
+CBOR_ENCODERS = {value_type: _encode_plain for value_type in (Decimal, datetime, date, time)}
+
+
+def _binary_response(body, code, headers, mediatype):
+    response = make_response(body, code)
+    response.headers.extend(headers or {})
+    response.headers['Content-Type'] = mediatype
+    return response
+
+
+def output_msgpack(data, code, headers=None):
+    return _binary_response(msgpack.packb(data, default=plain_value, use_bin_type=True), code, headers, MSGPACK_MEDIATYPE)
+
+
+def output_cbor(data, code, headers=None):
+    return _binary_response(cbor2.dumps(data, encoders=CBOR_ENCODERS), code, headers, CBOR_MEDIATYPE)
+
+
+# mediatype -> (пакет, функція представлення). application/x-msgpack - стара назва, яку шлють частина клієнтів
+BINARY_REPRESENTATIONS = {
+    MSGPACK_MEDIATYPE: ('msgpack', output_msgpack),
+    'application/x-msgpack': ('msgpack', output_msgpack),
+    CBOR_MEDIATYPE: ('cbor2', output_cbor),
+}
+
+
+def _vary_on_accept(response):
+    # Одна й та сама URL віддає різні формати залежно від Accept, кеші мають це враховувати
+    response.vary.add('Accept')
+    return response
+
+
+def init_representations(app, api):
+    """Реєструє доступні бінарні формати в Api. Викликати до init_instrumentation, щоб серіалізація теж враховувалась."""
+    if not app.config.get('BINARY_RESPONSES_ENABLED', True):
+        return
+    registered = False
+    for mediatype, (package, representation) in BINARY_REPRESENTATIONS.items():
+        # find_spec не імпортує пакет, тож старт застосунку не сповільнюється (див. benchmarks/startup.py)
+        if importlib.util.find_spec(package) is not None:
+            api.representations.setdefault(mediatype, representation)
+            registered = True
+    if registered:
+        app.after_request(_vary_on_accept)
@@ -0,0 +1,39 @@
+"""Ресурси API, згруповані за просторами імен flask-restx: один модуль на простір імен.
+
+Процес імпортує та реєструє лише простори імен з API_NAMESPACES (порожньо - всі). Так можна запускати
+окремий легкий рівень лише з меню (API_NAMESPACES=dishes,modifier-groups,search), який не завантажує
+модулі замовлень, бронювань і користувачів. Службові /api/_metrics та /api/_profiles реєструються завжди."""
+import importlib
+from app.api import api, namespaces
+
+# Простір імен -> модуль з його ресурсами. Порядок визначає порядок у Swagger
+NAMESPACE_MODULES = {
+    'users': 'app.routes.users',
+    'guests': 'app.routes.guests',
+    'dishes': 'app.routes.dishes',
+    'orders': 'app.routes.orders',
+    'tables': 'app.routes.tables',
+    'modifier-groups': 'app.routes.modifier_groups',
+    'reservations': 'app.routes.reservations',
+    'news': 'app.routes.news',
+    'search': 'app.routes.search',
+    'analytics': 'app.routes.analytics',
+    'images': 'app.routes.images',
+}
+
+
+def selected_namespaces(config):
+    names = config.get('API_NAMESPACES') or list(NAMESPACE_MODULES)
+    unknown = set(names) - set(NAMESPACE_MODULES)
+    if unknown:
+        raise ValueError(f"Невідомі простори імен у API_NAMESPACES: {', '.join(sorted(unknown))}")
+    return [name for name in NAMESPACE_MODULES if name in names]
+
+
+def register_routes(app):
+    """Імпортує модулі вибраних просторів імен і додає їх до api. Викликається з create_app після api.decorators."""
+    importlib.import_module('app.routes.service')
+    for name in selected_namespaces(app.config):
+        importlib.import_module(NAMESPACE_MODULES[name])
+        if namespaces[name] not in api.namespaces:
+            api.add_namespace(namespaces[name])
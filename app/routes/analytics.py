@@ -0,0 +1,41 @@
+from flask import current_app
+from flask_restx import Resource, reqparse
+from app.api import *
+from app.models import *
+from datetime import datetime
+from app.analytics import compute_occupancy
+
+
+occupancy_parser = reqparse.RequestParser()
+occupancy_parser.add_argument('date_from', type=str, required=True, help='Початок діапазону у форматі YYYY-MM-DD', location='args')
+occupancy_parser.add_argument('date_to', type=str, required=True, help='Кінець діапазону у форматі YYYY-MM-DD', location='args')
+
+
+@analytics_ns.route('/occupancy')
+class OccupancyAnalytics(Resource):
+    @analytics_ns.expect(occupancy_parser)
+    @analytics_ns.marshal_with(occupancy_response_model)
+    @analytics_ns.response(400, 'Невірний діапазон дат')
+    def get(self):
+        """Завантаженість столиків по днях тижня та слотах за діапазон дат.
+        Формат команди - /api/analytics/occupancy?date_from=2025-04-01&date_to=2025-04-30"""
+        args = occupancy_parser.parse_args()
+        try:
+            date_from = datetime.strptime(args['date_from'], '%Y-%m-%d').date()
+            date_to = datetime.strptime(args['date_to'], '%Y-%m-%d').date()
+        except ValueError:
+            analytics_ns.abort(400, "Невірний формат дати. Очікується YYYY-MM-DD.")
+
+        if date_from > date_to:
+            analytics_ns.abort(400, "date_from не може бути пізніше за date_to.")
+        max_days = current_app.config.get('OCCUPANCY_MAX_RANGE_DAYS', 366)
+        if (date_to - date_from).days + 1 > max_days:
+            analytics_ns.abort(400, f"Діапазон не може перевищувати {max_days} днів.")
+
+        return compute_occupancy(
+            date_from,
+            date_to,
+            current_app.config.get('RESTAURANT_OPENING_HOUR', 10),
+            current_app.config.get('RESTAURANT_CLOSING_HOUR', 23),
+            current_app.config.get('RESERVATION_SLOT_DURATION_HOURS', 1)
+        )
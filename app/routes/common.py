@@ -0,0 +1,42 @@
+from flask import request
+from flask_restx import inputs, reqparse
+from urllib.parse import urlencode
+from app.lazy import LazyModule
+
+# marshmallow-sqlalchemy будує поля авто-схем під час імпорту, тому схеми завантажуються при першому використанні
+schemas = LazyModule('app.schemas')
+
+def get_object_or_404(model, id, options=()):
+    obj = model.query.options(*options).get(id)
+    if obj is None:
+        return {'message': f'{model.__name__} not found'}, 404
+    return obj, 200
+
+
+def pagination_parser(per_page=20, max_per_page=100):
+    """Парсер ?page=&per_page=. Інші аргументи ендпоінт додає через add_argument."""
+    parser = reqparse.RequestParser()
+    parser.add_argument('page', type=inputs.int_range(1, 1000000), location='args', help='Сторінка (з 1)')
+    parser.add_argument('per_page', type=inputs.int_range(1, max_per_page), default=per_page, location='args',
+                        help=f'Записів на сторінці (1-{max_per_page})')
+    return parser
+
+
+def _page_link(page, per_page, rel):
+    params = dict(request.args, page=page, per_page=per_page)
+    return f'<{request.path}?{urlencode(params)}>; rel="{rel}"'
+
+
+def paginate(query, page, per_page):
+    """Сторінка запиту та заголовки X-Total-Count і Link (rel=next/prev), тіло відповіді лишається списком."""
+    total = query.order_by(None).count()
+    items = query.offset((page - 1) * per_page).limit(per_page).all()
+    links = []
+    if page * per_page < total:
+        links.append(_page_link(page + 1, per_page, 'next'))
+    if page > 1:
+        links.append(_page_link(page - 1, per_page, 'prev'))
+    headers = {'X-Total-Count': str(total)}
+    if links:
+        headers['Link'] = ', '.join(links)
+    return items, headers
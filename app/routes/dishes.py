@@ -0,0 +1,317 @@
+from flask import request, Response
+from flask_restx import Resource, reqparse, inputs
+from app import db, api 
+from app.api import *
+from app.models import *
+from decimal import Decimal, InvalidOperation
+from sqlalchemy.exc import DataError, IntegrityError
+from app.tags import resolve_tags
+from app.menu_index import menu_index, has_filters
+from app.loading import dish_full_options
+from app.fieldsets import parse_dish_fieldset, dish_query_options, dish_output_fields, FieldsetError
+from flask_restx import marshal
+from sqlalchemy.orm import load_only
+from app.dish_summary import update_dish_summary
+from app.menu_import import (parse_json_document, parse_csv_document, import_dishes, export_dishes,
+                             export_dishes_csv, ImportDocumentError)
+import csv
+
+
+def price_value(value):
+    """Ціна з query string: скінченне невідʼємне число. NaN та Infinity Decimal приймає, але порівнювати їх не можна."""
+    try:
+        price = Decimal(value)
+    except InvalidOperation:
+        price = None
+    if price is None or not price.is_finite() or price < 0:
+        raise ValueError(f"(невідʼємне число, отримано '{value}')")
+    return price
+
+dish_filter_parser = reqparse.RequestParser()
+dish_filter_parser.add_argument('category', type=str, action='append', help='Категорія (можна кілька через кому або повтором параметра)', location='args')
+dish_filter_parser.add_argument('tag', type=str, action='append', help='Тег (можна кілька через кому або повтором параметра)', location='args')
+dish_filter_parser.add_argument('tag_mode', type=str, choices=('any', 'all'), default='any', help='any - хоча б один тег, all - всі теги', location='args')
+dish_filter_parser.add_argument('available', type=inputs.boolean, help='Лише доступні (true) або недоступні (false) страви', location='args')
+dish_filter_parser.add_argument('min_price', type=price_value, help='Мінімальна ціна варіанту', location='args')
+dish_filter_parser.add_argument('max_price', type=price_value, help='Максимальна ціна варіанту', location='args')
+dish_filter_parser.add_argument('q', type=str, help='Пошук за назвою та описом', location='args')
+
+def parse_dish_filters():
+    args = dish_filter_parser.parse_args()
+    for name in ('category', 'tag'): # Підтримуємо і ?tag=a,b і ?tag=a&tag=b
+        args[name] = [part.strip() for value in args[name] or [] for part in value.split(',') if part.strip()]
+    return args
+
+dish_fieldset_parser = reqparse.RequestParser()
+dish_fieldset_parser.add_argument('fields', type=str, help='Поля страви через кому (id,name,image_url,min_price,...)', location='args')
+dish_fieldset_parser.add_argument('embed', type=str, help='Вкладені звʼязки через кому: variants,tags,modifier_groups,image', location='args')
+
+def parse_dish_fieldset_args():
+    args = dish_fieldset_parser.parse_args()
+    try:
+        return parse_dish_fieldset(args['fields'], args['embed'])
+    except FieldsetError as e:
+        api.abort(400, str(e))
+
+dish_summary_parser = reqparse.RequestParser()
+dish_summary_parser.add_argument('category', type=str, help='Категорія', location='args')
+dish_summary_parser.add_argument('available', type=inputs.boolean, help='Лише доступні (true) або недоступні (false) страви', location='args')
+
+dishes_bulk_import_parser = reqparse.RequestParser()
+dishes_bulk_import_parser.add_argument('dry_run', type=inputs.boolean, default=False, help='Лише перевірити документ без збереження', location='args')
+
+dishes_bulk_export_parser = reqparse.RequestParser()
+dishes_bulk_export_parser.add_argument('format', type=str, choices=('json', 'csv'), default='json', help='Формат експорту: json або csv', location='args')
+
+
+@dishes_ns.route('/')
+class DishList(Resource):
+
+    @dishes_ns.doc('list_dishes')
+    @dishes_ns.expect(dish_filter_parser, dish_fieldset_parser)
+    # Використовуємо єдину модель API для відповіді
+    @dishes_ns.response(200, 'Success', [dish_model])
+    def get(self):
+        """Отримати список страв. Без параметрів повертає всі страви.
+        Приклад фільтрації - /api/dishes/?category=Кава&tag=hot,new&tag_mode=all&available=true&max_price=100&q=лате
+        Легкий список для карток - /api/dishes/?fields=id,name,image_url,min_price (вкладені звʼязки через &embed=variants,tags)"""
+        filters = parse_dish_filters()
+        fieldset = parse_dish_fieldset_args()
+        output_fields = dish_output_fields(fieldset) if fieldset else dish_model
+
+        query = Dish.query.options(*(dish_query_options(fieldset) if fieldset else dish_full_options()))
+        if has_filters(filters):
+            # Фільтрація йде по індексу в пам'яті, з БД дістаємо лише знайдені страви
+            dish_ids = menu_index.get().search(filters)
+            if not dish_ids:
+                return []
+            query = query.filter(Dish.id.in_(dish_ids)).order_by(Dish.id)
+        return marshal(query.all(), output_fields), 200
+
+    @dishes_ns.doc('create_dish')
+    @dishes_ns.expect(dish_model) 
+    # Повертаємо у форматі єдиної моделі API
+    @dishes_ns.marshal_with(dish_model, code=201)
+    def post(self):
+        """Створити нову страву."""
+        try:
+            data = api.payload
+
+            # Витягуємо дані для зв'язків ПЕРЕД створенням об'єкта Dish
+            modifier_groups_input = data.pop('modifier_groups', [])
+            tag_names = data.pop('tags', [])
+            variants_data = data.pop('variants', [])
+            data.pop('image', None) # Маніфест лише для читання, зображення привʼязується через image_id
+
+            # Валідація базових даних
+            if not data.get('name'): api.abort(400, "Поле 'name' є обов'язковим.")
+            if not variants_data: api.abort(400, "Поле 'variants' є обов'язковим.")
+
+            # --- Обробка Modifier Groups ---
+            linked_modifier_groups = []
+            if modifier_groups_input:
+                 group_ids_to_find = []
+                 for group_data in modifier_groups_input:
+                     group_id = group_data.get('id')
+                     if group_id and isinstance(group_id, int): group_ids_to_find.append(group_id)
+                     else: api.abort(400, f"Невірний формат modifier_groups: очікується [{'id': N}].")
+                 if group_ids_to_find:
+                     found_groups = ModifierGroup.query.filter(ModifierGroup.id.in_(group_ids_to_find)).all()
+                     if len(found_groups) != len(set(group_ids_to_find)):
+                          found_ids = {g.id for g in found_groups}; missing_ids = set(group_ids_to_find) - found_ids
+                          api.abort(400, f"Групи модифікаторів з ID {missing_ids} не знайдено.")
+                     linked_modifier_groups = found_groups
+
+            # --- Обробка Tags ---
+            linked_tags = []
+            if tag_names:
+                 if not all(isinstance(name, str) for name in tag_names): api.abort(400, f"Теги повинні бути рядками.")
+                 linked_tags = list(resolve_tags(tag_names).values()) # Всі теги одним запитом, нові створюються через upsert
+
+            # --- Створення основного об'єкта Dish ---
+            dish_fields = {k: v for k, v in data.items() if hasattr(Dish, k)}
+            new_dish = Dish(**dish_fields)
+
+            # --- Створення та прив'язка Variants ---
+            for variant_data in variants_data:
+                 if not isinstance(variant_data, dict) or not all(k in variant_data for k in ('size_label', 'price')): api.abort(400, "Варіант має містити 'size_label' та 'price'.")
+                 variant_fields = {k: v for k, v in variant_data.items() if hasattr(DishVariant, k)}
+                 variant = DishVariant(**variant_fields)
+                 new_dish.variants.append(variant)
+
+            # --- Прив'язка знайдених груп та тегів ---
+            new_dish.modifier_groups = linked_modifier_groups
+            new_dish.tags = linked_tags
+            update_dish_summary(new_dish)
+
+            # --- Збереження ---
+            db.session.add(new_dish)
+            db.session.commit()
+
+            return new_dish, 201
+
+        except IntegrityError as e: db.session.rollback(); return {'message': 'Помилка цілісності даних.', 'error': str(getattr(e, 'orig', e))}, 400
+        except ValueError as e: db.session.rollback(); api.abort(400, str(e))
+        except Exception as e: db.session.rollback(); print(f"Error: {e}"); return {'message': 'Внутрішня помилка сервера.', 'error': str(e)}, 500
+
+@dishes_ns.route('/facets')
+class DishFacets(Resource):
+    @dishes_ns.doc('dish_facets')
+    @dishes_ns.expect(dish_filter_parser)
+    @dishes_ns.marshal_with(dish_facets_model)
+    def get(self):
+        """Кількість страв по категоріях і тегах для тих самих фільтрів, що й у списку страв."""
+        return menu_index.get().facets(parse_dish_filters())
+
+@dishes_ns.route('/summary')
+class DishSummaryList(Resource):
+    @dishes_ns.doc('dish_summaries')
+    @dishes_ns.expect(dish_summary_parser)
+    @dishes_ns.marshal_list_with(dish_summary_model)
+    def get(self):
+        """Легкий список страв для карток меню ("від X грн"). Читає лише таблицю dishes з готовими підсумками."""
+        args = dish_summary_parser.parse_args()
+        query = Dish.query.options(load_only(*[getattr(Dish, name) for name in dish_summary_model]))
+        if args['category']:
+            query = query.filter(Dish.category == args['category'])
+        if args['available'] is not None:
+            query = query.filter(Dish.is_available.is_(args['available']))
+        return query.order_by(Dish.id).all()
+
+@dishes_ns.route('/bulk')
+class DishBulk(Resource):
+    @dishes_ns.doc('import_dishes', description='Приймає JSON ({"dishes": [...]}) у форматі моделі Dish або CSV (text/csv чи файл у полі "file"), '
+                                                 'де кожен рядок - один варіант страви. Теги та групи модифікаторів у CSV розділяються ";".')
+    @dishes_ns.expect(dishes_bulk_import_parser)
+    @dishes_ns.response(200, 'Import finished')
+    @dishes_ns.response(400, 'Validation Error')
+    def post(self):
+        """Масовий імпорт/оновлення страв однією транзакцією."""
+        args = dishes_bulk_import_parser.parse_args()
+        try:
+            if 'file' in request.files:
+                rows = parse_csv_document(request.files['file'].read().decode('utf-8-sig'))
+            elif request.mimetype == 'text/csv':
+                rows = parse_csv_document(request.get_data(as_text=True))
+            else:
+                document = request.get_json(silent=True)
+                if document is None:
+                    return {'message': 'Некоректні дані'}, 400
+                rows = parse_json_document(document)
+        except (ImportDocumentError, UnicodeDecodeError, csv.Error) as e:
+            return {'message': 'Не вдалося розібрати документ', 'error': str(e)}, 400
+
+        try:
+            result = import_dishes(rows, dry_run=args['dry_run'])
+        except (IntegrityError, DataError) as e:
+            db.session.rollback()
+            return {'message': 'Помилка цілісності даних.', 'error': str(getattr(e, 'orig', e))}, 400
+        except Exception as e:
+            db.session.rollback()
+            return {'message': 'Помилка імпорту страв', 'error': str(e)}, 500
+
+        if result['errors'] and not (result['created'] or result['updated']):
+            return dict(result, message='Жодну страву не імпортовано'), 400
+        return result, 200
+
+    @dishes_ns.doc('export_dishes')
+    @dishes_ns.expect(dishes_bulk_export_parser)
+    @dishes_ns.response(200, 'Success')
+    def get(self):
+        """Експорт меню у форматі, сумісному з імпортом."""
+        args = dishes_bulk_export_parser.parse_args()
+        dishes = export_dishes()
+        if args['format'] == 'csv':
+            return Response(export_dishes_csv(dishes), mimetype='text/csv',
+                            headers={'Content-Disposition': 'attachment; filename=dishes.csv'})
+        return {'dishes': dishes}, 200
+
+@dishes_ns.route('/<int:dish_id>')
+@dishes_ns.param('dish_id', 'The dish identifier')
+class DishResource(Resource):
+    @dishes_ns.doc('get_dish')
+    @dishes_ns.expect(dish_fieldset_parser)
+    # Використовуємо єдину модель API для відповіді
+    @dishes_ns.response(200, 'Success', dish_model)
+    @dishes_ns.response(404, 'Dish not found')
+    def get(self, dish_id):
+        """Отримати страву за ID. Підтримує ?fields= та ?embed= як і список страв."""
+        fieldset = parse_dish_fieldset_args()
+        if not fieldset:
+            return marshal(Dish.query.options(*dish_full_options()).filter(Dish.id == dish_id).first_or_404(), dish_model), 200
+        dish = Dish.query.options(*dish_query_options(fieldset)).filter(Dish.id == dish_id).first_or_404()
+        return marshal(dish, dish_output_fields(fieldset)), 200
+
+    @dishes_ns.doc('update_dish')
+    @dishes_ns.expect(dish_model) 
+    @dishes_ns.marshal_with(dish_model)
+    @dishes_ns.response(400, 'Validation Error')
+    @dishes_ns.response(404, 'Dish not found')
+    def put(self, dish_id):
+        """Оновити страву за ID."""
+        dish = Dish.query.get_or_404(dish_id)
+        try:
+            data = api.payload
+
+            # Витягуємо дані для зв'язків
+            modifier_groups_input = data.pop('modifier_groups', None)
+            tag_names = data.pop('tags', None)
+            variants_data = data.pop('variants', None)
+            data.pop('image', None)
+
+            # --- Оновлення Modifier Groups (якщо передано) ---
+            if modifier_groups_input is not None:
+                linked_modifier_groups = []
+                if modifier_groups_input:
+                    group_ids_to_find = []
+                    for group_data in modifier_groups_input:
+                         group_id = group_data.get('id');
+                         if group_id and isinstance(group_id, int): group_ids_to_find.append(group_id)
+                         else: api.abort(400, f"Невірний формат modifier_groups.")
+                    if group_ids_to_find:
+                        found_groups = ModifierGroup.query.filter(ModifierGroup.id.in_(group_ids_to_find)).all()
+                        if len(found_groups) != len(set(group_ids_to_find)):
+                             missing_ids = set(group_ids_to_find) - {g.id for g in found_groups}
+                             api.abort(400, f"Групи модифікаторів з ID {missing_ids} не знайдено.")
+                        linked_modifier_groups = found_groups
+                dish.modifier_groups = linked_modifier_groups # Перезаписуємо
+
+            # --- Оновлення Tags (якщо передано) ---
+            if tag_names is not None:
+                 if not all(isinstance(name, str) for name in tag_names): api.abort(400, f"Теги повинні бути рядками.")
+                 dish.tags = list(resolve_tags(tag_names).values()) # Перезаписуємо
+
+            # --- Оновлення Variants (якщо передано) ---
+            if variants_data is not None:
+                 DishVariant.query.filter_by(dish_id=dish.id).delete(); db.session.flush()
+                 if not variants_data: api.abort(400, "Поле 'variants' не може бути порожнім.")
+                 new_variants = []
+                 for variant_data in variants_data:
+                      if not isinstance(variant_data, dict) or not all(k in variant_data for k in ('size_label', 'price')): api.abort(400, "Варіант має містити 'size_label' та 'price'.")
+                      variant_fields = {k: v for k, v in variant_data.items() if hasattr(DishVariant, k)}
+                      variant = DishVariant(**variant_fields)
+                      new_variants.append(variant)
+                 dish.variants = new_variants
+            # --- Оновлення основних полів страви ---
+            for key, value in data.items():
+                if hasattr(dish, key) and key not in ['id', 'variants', 'tags', 'modifier_groups']:
+                    setattr(dish, key, value)
+            update_dish_summary(dish) # Після полів, щоб підсумки не можна було перезаписати з payload
+
+            # --- Збереження ---
+            db.session.commit()
+
+            return dish
+        except IntegrityError as e: db.session.rollback(); return {'message': 'Помилка цілісності даних.', 'error': str(getattr(e, 'orig', e))}, 400
+        except ValueError as e: db.session.rollback(); api.abort(400, str(e))
+        except Exception as e: db.session.rollback(); print(f"Error updating dish: {e}"); return {'message': 'Внутрішня помилка сервера.', 'error': str(e)}, 500
+
+    @dishes_ns.doc('delete_dish')
+    @dishes_ns.response(204, 'Dish deleted')
+    @dishes_ns.response(404, 'Dish not found')
+    def delete(self, dish_id):
+        """Видалити страву за ID."""
+        dish = Dish.query.get_or_404(dish_id)
+        db.session.delete(dish)
+        db.session.commit()
+        return '', 204
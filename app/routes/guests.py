@@ -0,0 +1,74 @@
+from flask import request
+from flask_restx import Resource
+from app import db
+from app.api import *
+from app.models import *
+from marshmallow import ValidationError
+from app.loading import order_full_options, reservation_full_options
+from app.routes.common import schemas
+from app.guests import find_guest, new_guest
+
+
+@guests_ns.route('/')
+class GuestResource(Resource):
+    @guests_ns.doc('create_or_get_guest')
+    @guests_ns.expect(guest_input_model, validate=True)
+    @guests_ns.response(200, 'Guest found/created', guest_model)
+    @guests_ns.response(400, 'Validation Error')
+    def post(self):
+        """Створення або отримання гостя за номером телефону."""
+        try:
+            data = request.get_json()
+
+            if not data or 'phone_number' not in data:
+                return {"message": "Потрібно вказати номер телефону"}, 400
+
+            guest = find_guest(data['phone_number'])
+
+            if not guest:
+                guest = new_guest(data['phone_number'], data.get('name', ''))
+                db.session.add(guest)
+                db.session.commit()
+
+            guest_schema = schemas.GuestSchema()
+            return guest_schema.dump(guest), 200
+
+        except ValidationError as e:
+            return {'message': 'Помилка валідації', 'errors': e.messages}, 400
+        except Exception as e:
+            db.session.rollback()
+            return {'message': 'Помилка при обробці запиту', 'error': str(e)}, 500
+
+
+@guests_ns.route('/<string:phone_number>/orders')
+@guests_ns.param('phone_number', 'Guest phone number')
+class GuestOrders(Resource):
+    @guests_ns.doc('get_guest_orders')
+    @guests_ns.response(200, 'Success', order_model)
+    @guests_ns.response(404, 'Guest not found')
+    def get(self, phone_number):
+        """Отримати замовлення гостя за номером телефону."""
+        guest = find_guest(phone_number)
+        if not guest:
+            return {'message': 'Гостя з таким номером не знайдено'}, 404
+
+        orders = Order.query.options(*order_full_options()).filter_by(guest_id=guest.id).all()
+        order_schema = schemas.OrderSchema(many=True)
+        return order_schema.dump(orders), 200
+
+
+@guests_ns.route('/<string:phone_number>/reservations')
+@guests_ns.param('phone_number', 'Guest phone number')
+class GuestReservations(Resource):
+    @guests_ns.doc('get_guest_reservations')
+    @guests_ns.response(200, 'Success', reservation_model)
+    @guests_ns.response(404, 'Guest not found')
+    def get(self, phone_number):
+        """Отримати бронювання гостя за номером телефону."""
+        guest = find_guest(phone_number)
+        if not guest:
+            return {'message': 'Гостя з таким номером не знайдено'}, 404
+
+        reservations = Reservation.query.options(*reservation_full_options()).filter_by(guest_id=guest.id).all()
+        reservation_schema = schemas.ReservationSchema(many=True)
+        return reservation_schema.dump(reservations), 200
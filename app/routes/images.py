@@ -0,0 +1,77 @@
+from flask import current_app, request, send_file
+from flask_restx import Resource, reqparse
+from werkzeug.datastructures import FileStorage
+from app import db, api
+from app.api import *
+from app.models import *
+from app.images import ImageUploadError, image_manifest, schedule_processing, store_upload
+from app.image_storage import ImageStorageError, get_storage
+from app.security import admin_token_required
+import os
+
+
+image_upload_parser = reqparse.RequestParser()
+image_upload_parser.add_argument('file', type=FileStorage, location='files', required=True,
+                                 help='Файл зображення (JPEG, PNG або WebP)')
+
+
+@images_ns.route('/')
+class ImageUpload(Resource):
+    @images_ns.doc('upload_image', description='Зберігає оригінал і ставить генерацію зменшених копій та WebP у фонову чергу. '
+                                               'Отримане id передається як image_id у страву чи новину.')
+    @images_ns.expect(image_upload_parser)
+    @images_ns.response(202, 'Accepted', image_manifest_model)
+    @images_ns.response(400, 'Validation Error')
+    @images_ns.response(403, 'Admin token required')
+    @images_ns.response(413, 'File too large')
+    @admin_token_required
+    def post(self):
+        """Завантажити зображення (потрібен X-Admin-Token)."""
+        max_bytes = current_app.config.get('IMAGE_MAX_UPLOAD_BYTES')
+        if max_bytes and request.content_length and request.content_length > max_bytes:
+            return {'message': f'Файл більший за {max_bytes} байт'}, 413
+        args = image_upload_parser.parse_args()
+        data = args['file'].read()
+        if max_bytes and len(data) > max_bytes:
+            return {'message': f'Файл більший за {max_bytes} байт'}, 413
+        try:
+            image = store_upload(data)
+            db.session.commit()
+        except ImageUploadError as e:
+            db.session.rollback()
+            return {'message': str(e)}, 400
+        except (ImageStorageError, OSError) as e:
+            db.session.rollback()
+            current_app.logger.error(f"Не вдалося зберегти зображення: {e}")
+            return {'message': 'Не вдалося зберегти зображення', 'error': str(e)}, 500
+        schedule_processing(image.id)
+        db.session.refresh(image) # Без фонового пулу (IMAGE_WORKERS=0) копії вже готові
+        return image_manifest(image), 202
+
+
+@images_ns.route('/<int:image_id>')
+@images_ns.param('image_id', 'The image identifier')
+class ImageResource(Resource):
+    @images_ns.doc('get_image')
+    @images_ns.response(200, 'Success', image_manifest_model)
+    @images_ns.response(404, 'Image not found')
+    def get(self, image_id):
+        """Маніфест зображення: оригінал, зменшені копії та статус обробки."""
+        image = db.session.get(Image, image_id)
+        if image is None:
+            api.abort(404, f"Зображення з ID {image_id} не знайдено")
+        return image_manifest(image), 200
+
+
+@images_ns.route('/files/<path:key>', doc=False)
+class ImageFile(Resource):
+    def get(self, key):
+        """Файл з локального сховища. З CDN (IMAGE_CDN_BASE_URL) цей маршрут викликається лише при промаху кешу CDN."""
+        try:
+            path = get_storage().local_path(key)
+        except ImageStorageError:
+            path = None
+        if path is None or not os.path.isfile(path):
+            api.abort(404, 'Файл не знайдено')
+        # Ключ унікальний для кожного завантаження, тож вміст за ним ніколи не змінюється
+        return send_file(path, conditional=True, max_age=current_app.config.get('IMAGE_FILE_MAX_AGE_SECONDS', 31536000))
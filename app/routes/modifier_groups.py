@@ -0,0 +1,129 @@
+from flask import request
+from flask_restx import Resource
+from app import db
+from app.api import *
+from app.models import *
+from sqlalchemy.exc import IntegrityError
+from marshmallow import ValidationError
+from app.loading import modifier_group_options
+from app.dish_summary import refresh_dish_summaries, dishes_with_group
+
+
+@modifier_groups_ns.route('/')
+class ModifierGroupList(Resource):
+    @modifier_groups_ns.doc('list_modifier_groups')
+    @modifier_groups_ns.marshal_list_with(modifier_group_model) 
+    def get(self):
+        """Отримати список усіх груп модифікаторів."""
+        groups = ModifierGroup.query.options(*modifier_group_options()).all()
+        return groups
+
+    @modifier_groups_ns.doc('create_modifier_group')
+    @modifier_groups_ns.expect(modifier_group_model, validate=True)
+    @modifier_groups_ns.marshal_with(modifier_group_model, code=201)
+
+    def post(self):
+        """Створити нову групу модифікаторів."""
+        try:
+            data = request.get_json()
+            
+            # Отримуємо дані для створення групи та опцій
+            group_data = {
+                'name': data.get('name'),
+                'description': data.get('description'),
+                'is_required': data.get('is_required', True),
+                'selection_type': data.get('selection_type', 'single')
+            }
+            
+            # Групу створюєм напряму без схеми
+            new_group = ModifierGroup(**group_data)
+            db.session.add(new_group)
+            db.session.flush()  # отримуємо ID групи
+            
+            # Додаємо опції, якщо вони є
+            options_data = data.get('options', [])
+            for option_data in options_data:
+                option = ModifierOption(
+                    group_id=new_group.id,
+                    name=option_data.get('name'),
+                    price_modifier=option_data.get('price_modifier', 0.00),
+                    is_default=option_data.get('is_default', False)
+                )
+                db.session.add(option)
+            
+            db.session.commit()
+            return new_group, 201
+        except ValidationError as e:
+            db.session.rollback()
+            return {'message': 'Помилка валідації даних', 'errors': e.messages}, 400
+        except IntegrityError as e:
+            db.session.rollback()
+            return {'message': 'Помилка цілісності даних (можливо, група з такою назвою вже існує)', 'error': str(getattr(e, 'orig', e))}, 400
+        except Exception as e:
+            db.session.rollback()
+            print(f"Error creating modifier group: {e}")
+            return {'message': 'Внутрішня помилка сервера при створенні групи', 'error': str(e)}, 500
+
+@modifier_groups_ns.route('/<int:group_id>')
+@modifier_groups_ns.param('group_id', 'The modifier group identifier')
+class ModifierGroupResource(Resource):
+
+    @modifier_groups_ns.doc('get_modifier_group')
+    @modifier_groups_ns.marshal_with(modifier_group_model)
+    @modifier_groups_ns.response(404, 'Modifier Group not found')
+    def get(self, group_id):
+        """Отримати групу модифікаторів за ID."""
+        group = ModifierGroup.query.options(*modifier_group_options()).filter(ModifierGroup.id == group_id).first_or_404()
+        return group
+
+    @modifier_groups_ns.doc('update_modifier_group')
+    @modifier_groups_ns.expect(modifier_group_model, validate=True)
+    @modifier_groups_ns.marshal_with(modifier_group_model)
+    @modifier_groups_ns.response(400, 'Validation Error')
+    @modifier_groups_ns.response(404, 'Modifier Group not found')
+    def put(self, group_id):
+        """Оновити групу модифікаторів за ID."""
+        group = ModifierGroup.query.get_or_404(group_id)
+        try:
+            data = request.get_json()
+            
+            # Оновлюємо базові поля групи
+            if 'name' in data:
+                group.name = data['name']
+            if 'description' in data:
+                group.description = data['description']
+            if 'is_required' in data and data['is_required'] != group.is_required:
+                group.is_required = data['is_required']
+                db.session.flush()
+                refresh_dish_summaries(dishes_with_group(group_id)) # has_required_modifiers у стравах з цією групою
+            if 'selection_type' in data:
+                group.selection_type = data['selection_type']
+            
+            # Обробляємо опції, якщо вони передані
+            if 'options' in data:
+                # Видаляємо існуючі опції та створюємо нові
+                ModifierOption.query.filter_by(group_id=group_id).delete()
+                db.session.flush()
+                
+                for option_data in data.get('options', []):
+                    option = ModifierOption(
+                        group_id=group_id,
+                        name=option_data.get('name'),
+                        price_modifier=option_data.get('price_modifier', 0.00),
+                        is_default=option_data.get('is_default', False)
+                    )
+                    db.session.add(option)
+            
+            db.session.commit()
+            return group
+            
+        except ValidationError as e:
+             db.session.rollback()
+             return {'message': 'Помилка валідації', 'errors': e.messages}, 400
+        except IntegrityError as e:
+             db.session.rollback()
+             return {'message': 'Помилка цілісності даних.', 'error': str(getattr(e, 'orig', e))}, 400
+        except Exception as e:
+             db.session.rollback()
+             print(f"Error updating group {group_id}: {e}")
+             return {'message': 'Внутрішня помилка сервера.', 'error': str(e)}, 500
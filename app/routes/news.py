@@ -0,0 +1,123 @@
+from flask import request
+from flask_restx import Resource, inputs
+from app import db
+from app.api import *
+from app.models import *
+from sqlalchemy.exc import IntegrityError
+from marshmallow import ValidationError
+from app.routes.common import get_object_or_404, paginate, pagination_parser, schemas
+from app.loading import news_options
+from app.news_feed import active_news, archive_condition, feed_order, utcnow
+
+
+news_list_parser = pagination_parser()
+news_list_parser.add_argument('active', type=inputs.boolean, location='args',
+                              help='true - новини, що показуються зараз (з кешу); false - архів завершених і вимкнених')
+
+
+@news_ns.route('')
+class NewsList(Resource):
+    @news_ns.doc('list_news')
+    @news_ns.expect(news_list_parser)
+    @news_ns.response(200, 'Success', [news_model])
+    @news_ns.response(400, 'Validation error')
+    def get(self):
+        """Отримати список новин. ?active=1 - ті, що показуються зараз; ?active=0 - архів (посторінково, ?page=&per_page=).
+        Без параметрів повертає всі новини, включно із запланованими."""
+        args = news_list_parser.parse_args()
+        if args['active']:
+            return active_news.get().items, 200
+
+        query = News.query.options(*news_options()).order_by(*feed_order())
+        if args['active'] is not None:
+            query = query.filter(archive_condition(utcnow()))
+            args['page'] = args['page'] or 1 # Архів росте необмежено, тому завжди посторінково
+        news_schema = schemas.NewsSchema(many=True)
+        if args['page'] is None:
+            return news_schema.dump(query.all()), 200
+        news, headers = paginate(query, args['page'], args['per_page'])
+        return news_schema.dump(news), 200, headers
+    
+    @news_ns.doc('create_news')
+    @news_ns.expect(news_model, validate=True)
+    @news_ns.response(201, 'News created', news_model)
+    @news_ns.response(400, 'Validation Error')
+    def post(self):
+        """Створити нову новину."""
+        news_schema = schemas.NewsSchema()
+        try:
+            new_news = news_schema.load(request.get_json(), session=db.session)
+
+            db.session.add(new_news)
+            db.session.commit()
+
+            return news_schema.dump(new_news), 201
+
+        except ValidationError as e:
+            db.session.rollback()
+            return {'message': 'Помилка валідації', 'errors': e.messages}, 400
+        except IntegrityError as e:
+            db.session.rollback()
+            return {'message': 'Помилка цілісності даних', 'error': str(e)}, 400
+        except Exception as e:
+            db.session.rollback()
+            print(str(e))
+            return {'message': 'Помилка створення новини', 'error': str(e)}, 500
+        
+@news_ns.route('/<int:news_id>')
+@news_ns.param('news_id', 'The news identifier')
+class NewsResource(Resource):
+    @news_ns.doc('get_news')
+    @news_ns.response(200, 'Success', news_model)
+    @news_ns.response(404, 'News not found')
+    @news_ns.response(500, 'Internal Server Error')
+    def get(self, news_id):
+        """Отримати новину за ID."""
+        news_item, status_code = get_object_or_404(News, news_id)  #
+        if status_code == 404:
+            return news_item, status_code
+        news_schema = schemas.NewsSchema()
+        return news_schema.dump(news_item), 200
+
+    @news_ns.doc('update_news')
+    @news_ns.expect(news_model, validate=True)
+    @news_ns.response(200, 'News updated', news_model)
+    @news_ns.response(400, 'Validation Error')
+    @news_ns.response(404, 'News not found')
+    @news_ns.response(500, 'Internal Server Error')
+    def put(self, news_id):
+        """Оновити новину за ID."""
+        news_item, status_code = get_object_or_404(News, news_id)
+        if status_code == 404:
+            return news_item, status_code
+
+        news_schema = schemas.NewsSchema()
+        try:
+            updated_news = news_schema.load(
+                request.get_json(), instance=news_item, partial=True, session=db.session
+            )
+            db.session.commit()
+            return news_schema.dump(updated_news), 200
+        except ValidationError as e:
+            db.session.rollback()
+            return {'message': 'Помилка валідації', 'errors': e.messages}, 400
+        except Exception as e:
+            db.session.rollback()
+            return {'message': 'Помилка при оновленні новини', 'error': str(e)}, 500
+
+    @news_ns.doc('delete_news')
+    @news_ns.response(204, 'News deleted')
+    @news_ns.response(404, 'News not found')
+    @news_ns.response(500, 'Internal Server Error')
+    def delete(self, news_id):
+        """Видалити новину за ID."""
+        news_item, status_code = get_object_or_404(News, news_id)
+        if status_code == 404:
+            return news_item, status_code
+        try:
+            db.session.delete(news_item)
+            db.session.commit()
+            return '', 204  # 204 Нема валідного контенту на видалення
+        except Exception as e:
+            db.session.rollback()
+            return {'message':"Помилка при видаленні",  'error': str(e)}, 500
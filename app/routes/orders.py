@@ -0,0 +1,153 @@
+from flask import request
+from flask_restx import Resource
+from app import db
+from app.api import *
+from app.models import *
+from sqlalchemy.exc import IntegrityError
+from app.pricing import fresh_price_table, price_cart, PricingError
+from app.loading import order_full_options, order_delete_options
+from app.routes.common import get_object_or_404, schemas
+from app.guests import find_guest, new_guest
+
+
+@orders_ns.route('/')
+class OrderList(Resource):
+    @orders_ns.doc('create_order')
+    @orders_ns.expect(order_model, validate=True)
+    @orders_ns.response(201, 'Order created', order_model)
+    @orders_ns.response(400, 'Bad Request')
+    def post(self):
+        """Створити нове замовлення."""
+        try:
+            data = request.get_json()
+        except:
+            return {'message': 'Некоректні дані'}, 400
+
+        if not data or 'items' not in data or not data['items']:
+            return {'message': "Необхідно вказати список страв"}, 400
+
+        user_id = data.get('user_id')
+        phone_number = data.get('phone_number')
+
+        if not user_id and not phone_number:
+            return {'message': "Потрібно вказати user_id або phone_number"}, 400
+
+        try:
+            # Знімок цін може відставати від змін в інших воркерах, тому замовлення рахується за поточними цінами з БД
+            quote = price_cart(data['items'], fresh_price_table(data['items']))
+        except PricingError as e:
+            return {'message': e.message}, e.status_code
+
+        guest_id = None
+        if phone_number:
+            guest = find_guest(phone_number)
+            if not guest:
+                guest = new_guest(phone_number, data.get('name', ''))
+                db.session.add(guest)
+                db.session.flush()
+            guest_id = guest.id
+
+        elif user_id:
+            user, status_code = get_object_or_404(User, user_id)
+            if status_code == 404:
+                return user, status_code
+
+        order = Order(
+            user_id=user_id,
+            guest_id=guest_id,
+            phone_number=phone_number,
+            delivery_address=data.get('delivery_address'),
+            comments=data.get('comments')
+        )
+
+        # Ціни вже пораховані рушієм, тому тут лише створюємо рядки замовлення без додаткових запитів
+        for line in quote.lines:
+            order_item = OrderItem(dish_id=line.dish_id, variant_id=line.variant_id, quantity=line.quantity, price=line.unit_price)
+            for mod_id in line.modifier_option_ids:
+                order_item.modifiers.append(OrderItemModifier(modifier_option_id=mod_id))
+            order.items.append(order_item)
+
+        order.total_price = quote.total_price
+
+        try:
+            db.session.add(order)
+            db.session.commit()
+            order = Order.query.options(*order_full_options()).get(order.id)
+            order_schema = schemas.OrderSchema()
+            return order_schema.dump(order), 201
+        except IntegrityError as e:
+            # Страву чи модифікатор видалили між перевіркою та commit
+            db.session.rollback()
+            return {'message': 'Страву або модифікатор щойно змінено, оновіть меню', 'error': str(getattr(e, 'orig', e))}, 400
+        except Exception as e:
+            db.session.rollback()
+            return {'message': 'Помилка створення замовлення', 'error': str(e)}, 500
+    def get(self):
+        """Отримати всі замовлення"""
+        orders = Order.query.options(*order_full_options()).all()  # Отримуємо всі замовлення
+        order_schema = schemas.OrderSchema(many=True)
+        return order_schema.dump(orders), 200    
+    
+@orders_ns.route('/quote')
+class OrderQuote(Resource):
+    @orders_ns.doc('quote_order')
+    @orders_ns.expect(order_quote_input_model, validate=True)
+    @orders_ns.response(200, 'Success', order_quote_model)
+    @orders_ns.response(400, 'Bad Request')
+    @orders_ns.response(404, 'Dish not found')
+    def post(self):
+        """Порахувати вартість кошика без створення замовлення."""
+        data = request.get_json()
+        try:
+            quote = price_cart(data['items'])
+        except PricingError as e:
+            return {'message': e.message}, e.status_code
+        return orders_ns.marshal(quote.as_dict(), order_quote_model), 200
+
+@orders_ns.route('/<int:order_id>')
+@orders_ns.param('order_id', 'The order identifier')
+class OrderResource(Resource):
+    @orders_ns.doc('get_order')
+    @orders_ns.response(200, 'Success', order_model)
+    @orders_ns.response(404, 'Order not found')
+    def get(self, order_id):
+        """Отримати замовлення за ID."""
+        order, status_code = get_object_or_404(Order, order_id, order_full_options())
+        if status_code == 404: return order, status_code
+
+        order_schema = schemas.OrderSchema()
+        return order_schema.dump(order), 200
+
+    @orders_ns.doc('update_order_status')
+    @orders_ns.expect(order_model, validate=False)  
+    @orders_ns.response(200, 'Order updated', order_model)
+    @orders_ns.response(400, 'Bad Request')
+    @orders_ns.response(404, 'Order not found')
+    def put(self, order_id):
+        """Оновити статус замовлення."""
+        order, status_code = get_object_or_404(Order, order_id, order_full_options())
+        if status_code == 404: return order, status_code
+
+        try:
+            data = request.get_json()
+        except:
+            return{'message':'Некоректні данні'}, 400
+
+        if 'status' in data:
+              order.status = data['status']
+
+        db.session.commit()
+        order_schema = schemas.OrderSchema()
+        return order_schema.dump(order), 200
+
+    @orders_ns.doc('delete_order')
+    @orders_ns.response(204, 'Order deleted')
+    @orders_ns.response(404, 'Order not found')
+    def delete(self, order_id):
+        """Видалити замовлення за ID."""
+        order, status_code = get_object_or_404(Order, order_id, order_delete_options())
+        if status_code == 404: return order, status_code
+
+        db.session.delete(order)
+        db.session.commit()
+        return '', 204
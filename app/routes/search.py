@@ -0,0 +1,22 @@
+from flask_restx import Resource, reqparse, inputs
+from app.api import *
+from app.models import *
+from app.search import search
+
+
+search_parser = reqparse.RequestParser()
+search_parser.add_argument('q', type=str, required=True, help='Пошуковий запит', location='args')
+search_parser.add_argument('type', type=str, choices=('dish', 'news'), action='append', help='Шукати лише страви або новини', location='args')
+search_parser.add_argument('limit', type=inputs.int_range(1, 100), default=20, help='Максимальна кількість результатів (1-100)', location='args')
+
+
+@search_ns.route('')
+class Search(Resource):
+    @search_ns.doc('search')
+    @search_ns.expect(search_parser)
+    @search_ns.marshal_list_with(search_result_model)
+    def get(self):
+        """Пошук по стравах (назва, опис, теги) і новинах з урахуванням опечаток.
+        Формат команди - /api/search?q=карбонара&type=dish&limit=10"""
+        args = search_parser.parse_args()
+        return search(args['q'], limit=args['limit'], types=args['type'])
@@ -0,0 +1,40 @@
+from flask import Response
+from flask_restx import Resource, reqparse
+from app.api import api
+from app.instrumentation import metrics
+from app.profiling import find_profile, pstats_summary
+from app.security import admin_token_required
+import os
+
+
+@api.route('/_metrics', doc=False)
+class Metrics(Resource):
+    method_decorators = [admin_token_required] # Трафік, латентність і стан пулу - не для публічного API
+
+    def get(self):
+        """Метрики по ендпоінтах у форматі Prometheus (у межах одного процесу)"""
+        return Response(metrics.render_prometheus(), mimetype='text/plain; version=0.0.4')
+
+
+profile_parser = reqparse.RequestParser()
+profile_parser.add_argument('format', type=str, choices=('raw', 'text'), default='raw', location='args',
+                            help='raw - файл профілю (pstats або speedscope), text - зведення pstats')
+
+
+@api.route('/_profiles/<string:profile_id>', doc=False)
+class ProfileResource(Resource):
+    method_decorators = [admin_token_required]
+
+    def get(self, profile_id):
+        """Збережений профіль запиту за його X-Profile-Id"""
+        path, mode = find_profile(profile_id)
+        if path is None:
+            api.abort(404, f"Профіль {profile_id} не знайдено")
+        args = profile_parser.parse_args()
+        if args['format'] == 'text' and mode == 'cprofile':
+            return Response(pstats_summary(path), mimetype='text/plain')
+        with open(path, 'rb') as profile_file:
+            content = profile_file.read()
+        mimetype = 'application/octet-stream' if mode == 'cprofile' else 'application/json'
+        return Response(content, mimetype=mimetype,
+                        headers={'Content-Disposition': f'attachment; filename={os.path.basename(path)}'})
@@ -0,0 +1,92 @@
+from flask import request
+from flask_restx import Resource
+from app import db
+from app.api import *
+from app.models import *
+from sqlalchemy.exc import IntegrityError
+from marshmallow import ValidationError
+from app.routes.common import get_object_or_404, schemas
+
+
+@tables_ns.route('/')
+class TableList(Resource):
+    @tables_ns.doc('list_tables')
+    @tables_ns.response(200, 'Success', table_model)
+    def get(self):
+        """Отримати список усіх столиків."""
+        tables = Table.query.all()
+        table_schema = schemas.TableSchema(many=True)
+        return table_schema.dump(tables), 200
+
+    @tables_ns.doc('create_table')
+    @tables_ns.expect(table_model, validate=True)
+    @tables_ns.response(201, 'Table created', table_model)
+    @tables_ns.response(400, 'Validation Error')
+    def post(self):
+        """Створити новий столик."""
+        table_schema = schemas.TableSchema()
+        try:
+            data = table_schema.load(request.get_json(), session=db.session)
+            db.session.add(data)
+            db.session.commit()
+
+            return table_schema.dump(data), 201
+
+        except ValidationError as e:
+            db.session.rollback()
+            return {'message': 'Помилка валідації', 'errors': e.messages}, 400
+        except IntegrityError as e:
+            db.session.rollback()
+            return {'message': 'Помилка цілісності даних', 'error': str(e)}, 400
+        except Exception as e:
+            db.session.rollback()
+            print(str(e))
+            return {'message': 'Помилка створення страви', 'error': str(e)}, 500
+
+
+
+@tables_ns.route('/<int:table_id>')
+@tables_ns.param('table_id', 'The table identifier')
+class TableResource(Resource):
+    @tables_ns.doc('get_table')
+    @tables_ns.response(200, 'Success', table_model)
+    @tables_ns.response(404, 'Table not found')
+    def get(self, table_id):
+        """Отримати столик за ID."""
+        table, status_code = get_object_or_404(Table, table_id)
+        if status_code == 404: return table, status_code
+        table_schema = schemas.TableSchema()
+        return table_schema.dump(table), 200
+
+    @tables_ns.doc('update_table')
+    @tables_ns.expect(table_model, validate=True)
+    @tables_ns.response(200, 'Table updated', table_model)
+    @tables_ns.response(400, 'Validation Error')
+    @tables_ns.response(404, 'Table not found')
+    def put(self, table_id):
+        """Оновити столик за ID."""
+        table, status_code = get_object_or_404(Table, table_id)
+        if status_code == 404: return table, status_code
+
+        table_schema = schemas.TableSchema()
+        try:
+           updated_table = table_schema.load(request.get_json(), instance=table, partial=True, session=db.session)
+           db.session.commit()
+           return table_schema.dump(updated_table), 200
+        except ValidationError as e:
+              return {'message': 'Помилка валідації', 'errors': e.messages}, 400
+        except Exception as e:
+            db.session.rollback()
+            return {'message': str(e)}, 500
+
+    @tables_ns.doc('delete_table')
+    @tables_ns.response(204, 'Table deleted')
+    @tables_ns.response(404, 'Table not found')
+    def delete(self, table_id):
+        """Видалити столик за ID."""
+        table, status_code = get_object_or_404(Table, table_id)
+        if status_code == 404: return table, status_code
+
+        db.session.delete(table)
+        db.session.commit()
+        return '', 204
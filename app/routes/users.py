@@ -0,0 +1,324 @@
+from flask import request, current_app
+from flask_restx import Resource
+from app import db
+from app.api import *
+from app.models import *
+from sqlalchemy.exc import IntegrityError
+from marshmallow import ValidationError
+from app.sms import send_sms, sms_configured
+from app.loading import order_full_options, reservation_full_options
+import random
+import string
+from app.routes.common import get_object_or_404, paginate, pagination_parser, schemas
+from app.guests import find_user, link_guests, user_orders_condition
+
+
+@users_ns.route('/register')
+class UserRegistration(Resource):
+    @users_ns.doc('create_new_user')
+    @users_ns.expect(registration_model, validate=True)
+    @users_ns.response(201, 'User created successfully', user_model)
+    @users_ns.response(400, 'Validation Error or Phone number already exists')
+    @users_ns.response(500, 'Internal Server Error')
+    def post(self):
+        """Реєстрація нового користувача."""
+        user_schema = schemas.UserSchema()
+        try:
+            new_user = user_schema.load(request.get_json(), session=db.session)
+        except ValidationError as e:
+             return {'message': 'Помилка валідації даних', 'errors': e.messages}, 400
+
+        if 'password' in request.get_json():
+            new_user.set_password(request.get_json()['password'])
+        else:
+            return {'message': 'Пароль є обов\'язковим '}, 400 # Може щось змінювати буду нехай тут буде
+        
+        db.session.add(new_user)
+
+        try:
+            db.session.flush()
+            link_guests(new_user) # Гостьові замовлення та бронювання з цим номером стають історією користувача
+            db.session.commit()
+            return user_schema.dump(new_user), 201
+        except IntegrityError as e:
+            db.session.rollback()
+            return {'message': 'Помилка при створенні користувача', 'error': str(e)}, 500
+
+
+@users_ns.route('/login')
+class UserLogin(Resource):
+    @users_ns.doc('user_login')
+    @users_ns.expect(user_model, validate=True)  
+    @users_ns.response(200, 'Login successful')
+    @users_ns.response(400, 'Bad Request')
+    @users_ns.response(401, 'Invalid credentials')
+    def post(self):
+        """Вхід користувача."""
+        data = request.get_json()
+        phone_number = data.get('phone_number')
+        password = data.get('password')
+
+        if not phone_number or not password:
+            return {'message': 'Номер телефону та пароль є обов\'язковими'}, 400
+
+        user = find_user(phone_number)
+
+        if user and user.check_password(password):
+            return {'message': 'Успішний вхід', 'user_id': user.id}, 200
+        else:
+            return {'message': 'Неправильний номер телефону або пароль'}, 401
+
+@users_ns.route('/<int:user_id>')
+@users_ns.param('user_id', 'The user identifier')
+class UserResource(Resource):
+    @users_ns.doc('get_user_details')
+    @users_ns.marshal_with(user_model) 
+    @users_ns.response(404, 'Користувача не знайдено')
+    def get(self, user_id):
+        """Отримати детальну інформацію про користувача за ID."""
+        user, status_code = get_object_or_404(User, user_id)
+        if status_code == 404:
+            return user, status_code 
+        return user, 200 
+    
+    @users_ns.doc('partially_update_user')
+    @users_ns.expect(user_patch_model)
+    @users_ns.marshal_with(user_model)
+    @users_ns.response(404, 'Користувача не знайдено')
+    @users_ns.response(400, 'Помилка валідації')
+    def patch(self, user_id):
+        """Оновити інформацію про користувача за ID."""
+        user_obj = User.query.get(user_id)
+        if not user_obj:
+            users_ns.abort(404, f"Користувача з ID {user_id} не знайдено.")
+        data_to_update = users_ns.payload
+
+        if not data_to_update:
+            users_ns.abort(400, "Нема даних для оновлення")
+        
+        updated_fields_count = 0
+
+        for key, value in data_to_update.items():
+            if hasattr(user_obj, key) and key != 'id' :
+                setattr(user_obj, key, value)
+                updated_fields_count += 1
+            else:
+                current_app.logger.warning(f"Спроба оновити відстунє чи захищене поле '{key}' для користувача {user_id}")
+        if updated_fields_count == 0:
+            return {'message': 'Не було надано дійсних полів для оновлення або вказані поля не існують'}, 400
+        try:
+            db.session.commit()
+            db.session.refresh(user_obj)
+            current_app.logger.info(f"Користувача {user_id} успішно оновленно.")
+            return user_obj, 200
+        except Exception as e:
+            db.session.rollback()
+            current_app.logger.error(f"Помилка у БД при оновленні користувача {user_id}: {str(e)}")
+            users_ns.abort(500, "Внутрішня помилка сервера при оновленні користувача")
+
+
+@users_ns.route('/passwordreset') 
+class RequestPasswordReset(Resource):
+    @users_ns.doc('request_password_reset')
+    @users_ns.expect(request_otp_model, validate=True)
+    @users_ns.response(200, 'OTP успішно надіслано.')
+    @users_ns.response(400, 'Невірний запит або помилка відправки OTP.')
+    @users_ns.response(404, 'Користувача з таким номером телефону не знайдено.')
+    @users_ns.response(500, 'Помилка на сервері Twilio')
+    def post(self):
+        """Запит на відправку OTP для скидання пароля."""
+        data = request.get_json()
+        phone_number = data.get('phone_number')
+
+        if not phone_number:
+            return {'message': 'Номер телефону є обов\'язковим.'}, 400
+        
+        user = find_user(phone_number)
+        if not user:
+            return {'message': 'Користувача з таким номером телефону не знайдено.'}, 404
+
+        normalized_phonenumber = user.phone_normalized
+        
+        def generate_otp(length=6):
+            return "".join(random.choices(string.digits, k=length))
+        
+        otp_code = generate_otp()
+        otp_expiration_seconds = current_app.config.get('OTP_EXPIRATION_SECONDS', 1800)
+
+        PasswordResetOTP.query.filter_by(phone_number=normalized_phonenumber, used=False).delete() # Видаляємо старі OTP при генерації нових 
+        db.session.commit()
+
+        new_otp_entry = PasswordResetOTP(
+            phone_number=normalized_phonenumber, # Код перевіряється за номером у будь-якому записі
+            otp_code=otp_code,
+            expires_in_seconds=otp_expiration_seconds
+        )
+        db.session.add(new_otp_entry)
+        db.session.commit()
+
+
+        if not sms_configured() or not normalized_phonenumber:
+            current_app.logger.error("Twilio credentials не налаштовані.")
+            return {'message': 'Помилка конфігурації сервісу.'}, 500
+        
+        message_body = f"Ваш код для скидання пароля: {otp_code}."
+        
+        try:
+            message = send_sms(normalized_phonenumber, message_body)
+        except Exception as e:
+            current_app.logger.error(f"Загальна помилка при відправці SMS для {phone_number}: {e}")
+            return {'message': 'Внутрішня помилка сервера.'}, 500
+
+@users_ns.route('/otpverify')
+class VerifyOTPAndResetPassword(Resource):
+    @users_ns.doc('verify_otp_and_reset_password')
+    @users_ns.expect(verify_otp_and_reset_password_model, validate=True)
+    @users_ns.response(200, 'Пароль успішно змінено.')
+    @users_ns.response(400, 'Невірні вхідні дані - не всі поля заповнені.')
+    @users_ns.response(401, 'Невірний або прострочений OTP-код.')
+    @users_ns.response(404, 'Користувача з таким номером телефону не знайдено.')
+    @users_ns.response(500, 'Внутрішня помилка сервера при спробі змінити пароль.')
+    def post(self):
+        """Запит на верифікацію OTP для скидання пароля."""
+        data = request.get_json()
+        phone_number = data.get('phone_number')
+        provided_otp = data.get('otp_code')
+        new_password = data.get('new_password')
+
+        if not phone_number or not provided_otp or not new_password:
+            return {'message': 'Номер телефону, OTP-код та новий пароль є обов\'язковими.'}, 400
+        
+        user = find_user(phone_number)
+        if not user:
+            current_app.logger.info(f"Спроба верифікації OTP для неіснуючого користувача: {phone_number}")
+            return {'message': 'Користувача з таким номером телефону не знайдено.'}, 404
+        
+        otp_entry = PasswordResetOTP.query.filter_by(
+            phone_number=user.phone_normalized,
+            used=False
+        ).order_by(PasswordResetOTP.created_at.desc()).first() # Беремо найостанніший пароль. Це важливо, якщо користувач міг кілька разів запитувати OTP
+
+        if not otp_entry:
+            current_app.logger.warning(f"Не знайдено активного OTP для {phone_number} при спробі верифікації.")
+            return {'message': 'Для цього номеру телефону не було запитано OTP, або він вже використаний/прострочений.'}, 401
+        
+        if not otp_entry.is_valid(provided_otp):
+            current_app.logger.warning(f"Невдала спроба верифікації OTP для {phone_number}. Надано: {provided_otp}, Очікувалось: {otp_entry.otp_code if otp_entry else 'N/A'}")
+            # Якщо треба буде то можу зробити тут логіку таймаута після декількох невдалих спроб
+            return {'message': 'Невірний або прострочений OTP-код.'}, 401
+        
+        user.set_password(new_password)
+        otp_entry.mark_as_used() # Встановлюємо пароль та ставимо otp як використаний
+
+        try:
+            db.session.add(user) # Це для ясності зроблено, приберу за непотребою якщо багів не буде
+            db.session.add(otp_entry) 
+            db.session.commit() 
+            current_app.logger.info(f"Пароль для користувача {phone_number} успішно змінено.")
+            return {'message': 'Пароль успішно змінено.'}, 200
+        except Exception as e:
+            db.session.rollback() 
+            current_app.logger.error(f"Помилка бази даних при зміні пароля для {phone_number} після валідації OTP: {str(e)}")
+            return {'message': 'Внутрішня помилка сервера при спробі оновити пароль.'}, 500
+
+@users_ns.route('/passwordresetclassic')
+class ResetPasswordClassic(Resource):
+    @users_ns.doc('reset_password')
+    @users_ns.expect(reset_password_model, validate=True)
+    @users_ns.response(200, 'Пароль успішно змінено.')
+    @users_ns.response(400, 'Невірні вхідні дані - не всі поля правильно заповнені.')
+    @users_ns.response(401, 'Помилка авторизації')
+    @users_ns.response(404, 'Користувача з таким номером телефону не знайдено.')
+    @users_ns.response(500, 'Внутрішня помилка сервера при спробі змінити пароль.')
+
+    def post(self):
+        """Запит на скидання пароля класичним методом"""
+        data = request.get_json()
+        first_name = data.get('first_name')
+        last_name = data.get('last_name')
+        phone_number = data.get('phone_number')
+        old_password = data.get('old_password')
+        old_password_input = data.get('old_password')
+        new_password = data.get('new_password')
+        new_password_repeat = data.get('new_password_repeat')
+
+        if not all([first_name,last_name,phone_number,old_password,new_password,new_password]):
+            return {'message': 'Номер телефону, прізвище, ім\'я, поточний пароль та новий пароль з повтором є обов\'язковими.'}, 400
+        user = find_user(phone_number)
+        if not user:
+            return {'message': 'Користувача з таким номером телефону не знайдено.'}, 404
+    
+        if new_password != new_password_repeat:
+            return {'message': 'Введені паролі не збігаються. Будь ласка, переконайтеся, що обидва паролі однакові.'}, 400
+        
+        if not user.check_password(old_password_input):
+            current_app.logger.warning(f"Невдала спроба зміни пароля для {phone_number}: невірний старий пароль.")
+            return {'message': 'Невірний поточний пароль.'}, 401
+        
+        user.set_password(new_password)
+
+        try:
+            db.session.add(user) # Це для ясності зроблено, приберу за непотребою якщо багів не буде
+            db.session.commit() 
+            current_app.logger.info(f"Пароль для користувача {phone_number} успішно змінено.")
+            return {'message': 'Пароль успішно змінено.'}, 200
+        except Exception as e:
+            db.session.rollback() 
+            current_app.logger.error(f"Помилка бази даних при зміні пароля для {phone_number}: {str(e)}")
+            return {'message': 'Внутрішня помилка сервера при спробі оновити пароль.'}, 500
+
+
+@users_ns.route('/<int:user_id>/orders')
+@users_ns.param('user_id', 'The user identifier')
+class UserOrders(Resource):
+    @users_ns.doc('get_user_orders')
+    @users_ns.response(200, 'Success', order_model)
+    @users_ns.response(404, 'User not found')
+    def get(self, user_id):
+        """Отримати замовлення користувача."""
+        user, status_code = get_object_or_404(User, user_id)
+        if status_code == 404: return user, status_code
+
+        orders = Order.query.options(*order_full_options()).filter_by(user_id=user_id).all()
+        order_schema = schemas.OrderSchema(many=True)
+        return order_schema.dump(orders), 200
+
+
+user_history_parser = pagination_parser()
+
+
+@users_ns.route('/<int:user_id>/history')
+@users_ns.param('user_id', 'The user identifier')
+class UserOrderHistory(Resource):
+    @users_ns.doc('get_user_order_history')
+    @users_ns.expect(user_history_parser)
+    @users_ns.response(200, 'Success', [order_model])
+    @users_ns.response(404, 'User not found')
+    def get(self, user_id):
+        """Історія замовлень користувача разом із замовленнями, зробленими як гість до реєстрації (новіші спершу).
+        Посторінково: ?page=&per_page=, загальна кількість - у заголовку X-Total-Count."""
+        args = user_history_parser.parse_args()
+        user, status_code = get_object_or_404(User, user_id)
+        if status_code == 404: return user, status_code
+
+        query = (Order.query.options(*order_full_options()).filter(user_orders_condition(user_id))
+                 .order_by(Order.order_date.desc(), Order.id.desc()))
+        orders, headers = paginate(query, args['page'] or 1, args['per_page'])
+        order_schema = schemas.OrderSchema(many=True)
+        return order_schema.dump(orders), 200, headers
+
+
+@users_ns.route('/<int:user_id>/reservations')
+@users_ns.param('user_id', 'The user identifier')
+class UserReservations(Resource):
+    @users_ns.doc('get_user_reservations')
+    @users_ns.response(200, 'Success', reservation_model)
+    @users_ns.response(404, 'User not found')
+    def get(self, user_id):
+        """Отримати бронювання користувача."""
+        user, status_code = get_object_or_404(User, user_id)
+        if status_code == 404: return user, status_code
+        
+        reservations = Reservation.query.options(*reservation_full_options()).filter_by(user_id=user_id).all()
+        reservation_schema = schemas.ReservationSchema(many=True)
+        return reservation_schema.dump(reservations), 200
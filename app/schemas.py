@@ -1,6 +1,10 @@
 from marshmallow_sqlalchemy import SQLAlchemyAutoSchema, auto_field
 from app.models import *
-from marshmallow import fields, ValidationError, validates, Schema
+from marshmallow import fields, ValidationError, validates, validates_schema, Schema, pre_load
+from app.images import image_manifest
+from app.news_feed import as_utc
+from app.guests import find_user
+from datetime import timezone
 
 class UserSchema(SQLAlchemyAutoSchema):
     class Meta:
@@ -22,7 +26,7 @@ class UserSchema(SQLAlchemyAutoSchema):
         if len(value) < 10: # Проста перевірка довжини
              raise ValidationError('Номер телефону має містити мінімум 10 символів')
 
-        if User.query.filter_by(phone_number=value).first():
+        if find_user(value): # Той самий номер в іншому записі (0501234567 і +380501234567) теж зайнятий
             raise ValidationError('Цей номер телефону вже зареєстрований.')
 
     
@@ -90,11 +94,44 @@ class DishSchema(SQLAlchemyAutoSchema):
     tags = fields.Nested(TagSchema, many=True, only=("id", "name")) # Повертаємо ID і name тегу
     modifier_groups = fields.Nested(ModifierGroupSchema, many=True) # Повертаємо повну структуру груп
 
+class UtcDateTime(fields.AwareDateTime):
+    """Дата в UTC: дата без поясу у запиті вважається UTC, у відповіді пояс є завжди (SQLite повертає дати без нього)."""
+
+    def __init__(self, **kwargs):
+        super().__init__(default_timezone=timezone.utc, **kwargs)
+
+    def _serialize(self, value, attr, obj, **kwargs):
+        return super()._serialize(as_utc(value), attr, obj, **kwargs)
+
+
 class NewsSchema(SQLAlchemyAutoSchema):
     class Meta:
         model = News
         load_instance = True
         include_fk = True
+        exclude = ('search_vector',)
+
+    image = fields.Method('get_image', dump_only=True) # Маніфест з app/images.py, привʼязка - через image_id
+    publish_at = UtcDateTime(allow_none=True)
+    expire_at = UtcDateTime(allow_none=True)
+
+    def get_image(self, news):
+        return image_manifest(news.image) if news.image is not None else None
+
+    @validates_schema
+    def validate_schedule(self, data, **kwargs):
+        # При частковому оновленні друга дата береться з новини, що оновлюється
+        publish_at = data.get('publish_at', getattr(self.instance, 'publish_at', None))
+        expire_at = data.get('expire_at', getattr(self.instance, 'expire_at', None))
+        if publish_at and expire_at and as_utc(expire_at) <= as_utc(publish_at):
+            raise ValidationError('expire_at має бути пізніше за publish_at.', 'expire_at')
+
+    @pre_load
+    def drop_image_manifest(self, data, **kwargs):
+        # Клієнт може надіслати назад отриману новину разом з маніфестом, він лише для читання
+        if isinstance(data, dict):
+            data = {key: value for key, value in data.items() if key != 'image'}
+        return data
 
 class OrderItemModifierSchema(SQLAlchemyAutoSchema):
     class Meta:
@@ -0,0 +1,186 @@
+import re
+from sqlalchemy import event, func, literal, or_, text
+from sqlalchemy.orm import Session, selectinload
+from app import db
+from app.cache import SnapshotCache
+from app.models import Dish, News
+
+WORD_RE = re.compile(r"\w+", re.UNICODE)
+TS_CONFIG = 'simple' # Українського стемера в Postgres з коробки немає, тому 'simple' + триграми для опечаток
+TRIGRAM_THRESHOLD = 0.3
+
+# Ваги полів для ранжування (назва важливіша за опис)
+FIELD_WEIGHTS = {'name': 3.0, 'tags': 2.0, 'description': 1.0}
+
+
+def normalize_words(value):
+    return [word.lower() for word in WORD_RE.findall(value or '')]
+
+
+def dish_search_text(dish):
+    return {
+        'name': dish.name,
+        'tags': ' '.join(tag.name for tag in dish.tags),
+        'description': ' '.join(filter(None, [dish.description, dish.detailed_description]))
+    }
+
+
+def news_search_text(news):
+    return {'name': news.name, 'tags': '', 'description': news.description}
+
+
+def _search_vector_expression(parts):
+    weighted = [
+        func.setweight(func.to_tsvector(TS_CONFIG, literal(parts.get(field) or '')), weight)
+        for field, weight in (('name', 'A'), ('tags', 'B'), ('description', 'C'))
+    ]
+    return weighted[0].op('||')(weighted[1]).op('||')(weighted[2])
+
+
+@event.listens_for(Session, 'before_flush')
+def _update_search_vectors(session, flush_context, instances):
+    # search_vector існує лише в Postgres (GIN-індекс). В SQLite використовується індекс у пам'яті
+    bind = session.get_bind()
+    if bind is None or bind.dialect.name != 'postgresql':
+        return
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, Dish):
+            obj.search_vector = _search_vector_expression(dish_search_text(obj))
+        elif isinstance(obj, News):
+            obj.search_vector = _search_vector_expression(news_search_text(obj))
+
+
+def refresh_dish_search_vectors():
+    """Заповнює search_vector для страв, вставлених в обхід ORM (COPY/пакетний INSERT). Лише Postgres."""
+    if db.session.get_bind().dialect.name != 'postgresql':
+        return
+    db.session.execute(text(f"""
+        UPDATE dishes SET search_vector =
+            setweight(to_tsvector('{TS_CONFIG}', coalesce(dishes.name, '')), 'A') ||
+            setweight(to_tsvector('{TS_CONFIG}', coalesce((
+                SELECT string_agg(tags.name, ' ')
+                FROM dish_tags JOIN tags ON tags.id = dish_tags.tag_id
+                WHERE dish_tags.dish_id = dishes.id
+            ), '')), 'B') ||
+            setweight(to_tsvector('{TS_CONFIG}', concat_ws(' ', dishes.description, dishes.detailed_description)), 'C')
+        WHERE dishes.search_vector IS NULL
+    """))
+
+
+def trigrams(word):
+    padded = f'  {word} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    """Триграмний індекс у пам'яті: триграма -> слова, слово -> документи з вагою поля.
+    Кандидати для слова запиту беруться лише з постингів його триграм, тому пошук не сканує весь каталог."""
+
+    def __init__(self, documents):
+        self.documents = {}
+        self.word_docs = {}
+        self.trigram_words = {}
+        self.word_trigrams = {}
+
+        for key, parts, payload in documents:
+            self.documents[key] = payload
+            for field, value in parts.items():
+                weight = FIELD_WEIGHTS[field]
+                for word in normalize_words(value):
+                    postings = self.word_docs.setdefault(word, {})
+                    postings[key] = max(postings.get(key, 0), weight)
+                    if word not in self.word_trigrams:
+                        grams = trigrams(word)
+                        self.word_trigrams[word] = grams
+                        for gram in grams:
+                            self.trigram_words.setdefault(gram, set()).add(word)
+
+    def _similar_words(self, word):
+        """{слово індексу: схожість 0..1} для слова запиту (префікс або триграмна схожість)."""
+        grams = trigrams(word)
+        shared = {}
+        for gram in grams:
+            for candidate in self.trigram_words.get(gram, ()):
+                shared[candidate] = shared.get(candidate, 0) + 1
+        result = {}
+        for candidate, count in shared.items():
+            if candidate.startswith(word):
+                result[candidate] = 1.0 if candidate == word else 0.9
+                continue
+            similarity = count / (len(grams) + len(self.word_trigrams[candidate]) - count)
+            if similarity >= TRIGRAM_THRESHOLD:
+                result[candidate] = similarity
+        return result
+
+    def search(self, query, limit, types=None):
+        words = normalize_words(query)
+        if not words:
+            return []
+        scores = None
+        for word in words:
+            word_scores = {}
+            for candidate, similarity in self._similar_words(word).items():
+                for key, weight in self.word_docs[candidate].items():
+                    if types and key[0] not in types:
+                        continue
+                    word_scores[key] = max(word_scores.get(key, 0), similarity * weight)
+            # Всі слова запиту мають знайтися в документі
+            if scores is None:
+                scores = word_scores
+            else:
+                scores = {key: score + word_scores[key] for key, score in scores.items() if key in word_scores}
+            if not scores:
+                return []
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        return [dict(self.documents[key], score=round(score, 4)) for key, score in ranked]
+
+
+def _payload(entity_type, obj):
+    return {
+        'type': entity_type,
+        'id': obj.id,
+        'name': obj.name,
+        'description': obj.description,
+        'image_url': obj.image_url
+    }
+
+
+def build_trigram_index():
+    documents = []
+    for dish in Dish.query.options(selectinload(Dish.tags)).all():
+        documents.append((('dish', dish.id), dish_search_text(dish), _payload('dish', dish)))
+    for news in News.query.all():
+        documents.append((('news', news.id), news_search_text(news), _payload('news', news)))
+    return TrigramIndex(documents)
+
+
+trigram_index = SnapshotCache(build_trigram_index, ('dishes', 'tags', 'dish_tags', 'news'))
+
+
+def _prefix_tsquery(words):
+    return func.to_tsquery(TS_CONFIG, ' & '.join(f'{word}:*' for word in words))
+
+
+def _postgres_search(model, entity_type, words, query, limit):
+    tsquery = _prefix_tsquery(words)
+    rank = (func.ts_rank(model.search_vector, tsquery) + func.similarity(model.name, query)).label('score')
+    rows = db.session.query(model, rank).filter(
+        or_(model.search_vector.op('@@')(tsquery), model.name.op('%')(query))
+    ).order_by(rank.desc(), model.id).limit(limit).all()
+    return [dict(_payload(entity_type, obj), score=round(float(score), 4)) for obj, score in rows]
+
+
+def search(query, limit=20, types=None):
+    """Пошук по стравах і новинах. Postgres: tsvector + GIN та pg_trgm; інші БД: триграмний індекс у пам'яті."""
+    words = normalize_words(query)
+    if not words:
+        return []
+    if db.session.get_bind().dialect.name != 'postgresql':
+        return trigram_index.get().search(query, limit, types)
+
+    results = []
+    if not types or 'dish' in types:
+        results += _postgres_search(Dish, 'dish', words, query, limit)
+    if not types or 'news' in types:
+        results += _postgres_search(News, 'news', words, query, limit)
+    return sorted(results, key=lambda item: -item['score'])[:limit]
@@ -0,0 +1,24 @@
+import hmac
+from functools import wraps
+from flask import current_app, request
+from flask_restx import abort
+
+ADMIN_TOKEN_HEADER = 'X-Admin-Token'
+
+
+def admin_token_valid():
+    """Чи передано правильний ADMIN_API_TOKEN у заголовку X-Admin-Token. Без налаштованого токена - завжди ні."""
+    expected = current_app.config.get('ADMIN_API_TOKEN')
+    provided = request.headers.get(ADMIN_TOKEN_HEADER)
+    if not expected or provided is None:
+        return False
+    return hmac.compare_digest(provided.encode(), expected.encode())
+
+
+def admin_token_required(func):
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if not admin_token_valid():
+            abort(403, f'Потрібен адміністративний токен у заголовку {ADMIN_TOKEN_HEADER}.')
+        return func(*args, **kwargs)
+    return wrapper
@@ -0,0 +1,399 @@
+"""Генератор синтетичних даних у формі, близькій до продакшену: `flask seed --scale medium --seed 42`.
+
+Популярність страв і частота повернення клієнтів розподілені за Ципфом, замовлення мають обідній і вечірній піки,
+бронювання робляться заздалегідь (lead time) і не перетинаються на одному столику. Рядки пишуться пачками:
+COPY на Postgres, пакетний INSERT на інших базах. Однаковий --seed і --end-date дають однакові дані."""
+import csv
+import io
+import random
+from collections import namedtuple
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from itertools import accumulate
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import func, insert, text
+from werkzeug.security import generate_password_hash
+from app import db
+from app.cache import bump_tables
+from app.models import (Dish, DishVariant, Guest, ModifierGroup, ModifierOption, Order, OrderItem, OrderItemModifier,
+                        Reservation, Table, User, dish_modifier_groups_table, dish_tags_table)
+from app.search import refresh_dish_search_vectors
+from app.dish_summary import refresh_dish_summaries
+from app.tags import resolve_tag_ids
+
+SEED_PASSWORD = 'seed-password' # Пароль усіх згенерованих користувачів
+CHUNK_SIZE = 10000
+
+PRESETS = {
+    'small': {'dishes': 60, 'modifier_groups': 10, 'tables': 15, 'users': 200, 'guests': 500, 'orders': 2000, 'reservations': 2000},
+    'medium': {'dishes': 300, 'modifier_groups': 30, 'tables': 30, 'users': 5000, 'guests': 20000, 'orders': 50000, 'reservations': 30000},
+    'large': {'dishes': 800, 'modifier_groups': 60, 'tables': 60, 'users': 50000, 'guests': 200000, 'orders': 500000, 'reservations': 300000},
+    'xl': {'dishes': 1500, 'modifier_groups': 100, 'tables': 120, 'users': 200000, 'guests': 1000000, 'orders': 3000000, 'reservations': 1500000},
+}
+
+SeedPlan = namedtuple('SeedPlan', 'dishes modifier_groups tables users guests orders reservations days end_date seed')
+
+MENU = {
+    'Кава': ['Еспресо', 'Американо', 'Лате', 'Капучино', 'Флет вайт', 'Раф'],
+    'Чай': ['Чорний чай', 'Зелений чай', 'Матча', 'Імбирний чай'],
+    'Десерти': ['Чізкейк', 'Тірамісу', 'Брауні', 'Макарон'],
+    'Бургери': ['Бургер', 'Чізбургер', 'Смаш-бургер'],
+    'Піца': ['Маргарита', 'Пепероні', 'Чотири сири'],
+    'Салати': ['Цезар', 'Грецький салат', 'Боул'],
+    'Супи': ['Борщ', 'Крем-суп', 'Рамен'],
+    'Напої': ['Лимонад', 'Смузі', 'Какао'],
+}
+TAGS = ['hot', 'cold', 'spicy', 'vegan', 'meat', 'sweet', 'new', 'hit']
+VARIANT_LABELS = ['S', 'M', 'L', 'XL']
+
+# Відносна частота замовлень по годинах (обідній та вечірній піки) і днях тижня (пн=0)
+ORDER_HOUR_WEIGHTS = {10: 2, 11: 4, 12: 10, 13: 12, 14: 8, 15: 4, 16: 3, 17: 5, 18: 10, 19: 13, 20: 11, 21: 6, 22: 2}
+RESERVATION_HOUR_WEIGHTS = {12: 6, 13: 8, 14: 4, 15: 1, 16: 1, 17: 3, 18: 10, 19: 14, 20: 12, 21: 5}
+WEEKDAY_WEIGHTS = [1.0, 1.0, 1.05, 1.1, 1.35, 1.5, 1.25]
+GUEST_COUNT_WEIGHTS = {1: 5, 2: 40, 3: 15, 4: 25, 5: 5, 6: 7, 8: 3}
+ITEMS_PER_ORDER_WEIGHTS = {1: 30, 2: 35, 3: 20, 4: 10, 5: 5}
+
+
+def zipf_cum_weights(count, exponent=1.1):
+    return list(accumulate(1 / rank ** exponent for rank in range(1, count + 1)))
+
+
+class BulkWriter:
+    """Пише пачки рядків у таблицю: COPY ... FROM STDIN на Postgres (psycopg2), інакше INSERT з executemany."""
+
+    def __init__(self, session, use_copy=True):
+        self.session = session
+        self.use_copy = use_copy and session.get_bind().dialect.name == 'postgresql'
+        self.written = {}
+
+    def write(self, table, rows):
+        if not rows:
+            return
+        if self.use_copy:
+            self._copy(table, rows)
+        else:
+            self.session.execute(insert(table), rows)
+        self.written[table.name] = self.written.get(table.name, 0) + len(rows)
+
+    def _copy(self, table, rows):
+        columns = list(rows[0])
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow([row[column] for column in columns]) # None -> порожнє поле без лапок, тобто NULL
+        buffer.seek(0)
+        cursor = self.session.connection().connection.cursor()
+        try:
+            cursor.copy_expert(f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+        finally:
+            cursor.close()
+
+
+class RestaurantSeeder:
+    def __init__(self, plan, writer, opening_hour=10, closing_hour=23, slot_hours=1):
+        self.plan = plan
+        self.writer = writer
+        self.rng = random.Random(plan.seed)
+        self.opening_hour = opening_hour
+        self.closing_hour = closing_hour
+        self.slot_hours = slot_hours
+        self.start_date = plan.end_date - timedelta(days=plan.days - 1)
+        # Нові id починаються після вже наявних, тож генератор можна запускати і на непорожній базі
+        self.offsets = {model: (db.session.query(func.max(model.id)).scalar() or 0)
+                        for model in (ModifierGroup, ModifierOption, Dish, DishVariant, Table, User, Guest,
+                                      Order, OrderItem, OrderItemModifier, Reservation)}
+        self.table_number_offset = db.session.query(func.max(Table.table_number)).scalar() or 0
+        self._weight_tables = {}
+
+    def _ids(self, model, count):
+        start = self.offsets[model] + 1
+        self.offsets[model] += count
+        return range(start, start + count)
+
+    def _next_id(self, model):
+        self.offsets[model] += 1
+        return self.offsets[model]
+
+    def _chunks(self, ids):
+        for start in range(0, len(ids), CHUNK_SIZE):
+            yield ids[start:start + CHUNK_SIZE]
+
+    def _weighted(self, weights):
+        population, cum_weights = self._weight_tables.get(id(weights)) or self._weight_tables.setdefault(
+            id(weights), (list(weights), list(accumulate(weights.values()))))
+        return self.rng.choices(population, cum_weights=cum_weights)[0]
+
+    def _days(self, start_date, days):
+        dates = [start_date + timedelta(days=offset) for offset in range(days)]
+        return dates, list(accumulate(WEEKDAY_WEIGHTS[day.weekday()] for day in dates))
+
+    def run(self):
+        self.seed_modifier_groups()
+        self.seed_dishes()
+        self.seed_tables()
+        self.seed_people()
+        self.seed_orders()
+        self.seed_reservations()
+        return self.writer.written
+
+    def seed_modifier_groups(self):
+        self.options_by_group = {}
+        self.group_required = {}
+        self.group_multiple = {}
+        group_rows, option_rows = [], []
+        for group_id in self._ids(ModifierGroup, self.plan.modifier_groups):
+            is_required = self.rng.random() < 0.35
+            selection_type = 'single' if is_required or self.rng.random() < 0.5 else 'multiple'
+            group_rows.append({'id': group_id, 'name': f'Модифікатори {group_id}', 'description': None,
+                               'is_required': is_required, 'selection_type': selection_type})
+            options = []
+            for position, option_id in enumerate(self._ids(ModifierOption, self.rng.randint(2, 6))):
+                price = Decimal(self.rng.choice(['0', '5', '7.50', '10', '15', '20']))
+                option_rows.append({'id': option_id, 'group_id': group_id, 'name': f'Опція {position + 1}',
+                                    'price_modifier': price, 'is_default': position == 0})
+                options.append((option_id, price))
+            self.options_by_group[group_id] = options
+            self.group_required[group_id] = is_required
+            self.group_multiple[group_id] = selection_type == 'multiple'
+        self.writer.write(ModifierGroup.__table__, group_rows)
+        self.writer.write(ModifierOption.__table__, option_rows)
+
+    def seed_dishes(self):
+        tag_ids = list(resolve_tag_ids(TAGS).values())
+        group_ids = list(self.options_by_group)
+        self.variants_by_dish = {}
+        self.groups_by_dish = {}
+        dish_rows, variant_rows, tag_rows, group_rows = [], [], [], []
+        for dish_id in self._ids(Dish, self.plan.dishes):
+            category = self.rng.choice(list(MENU))
+            dish_rows.append({'id': dish_id, 'name': f'{self.rng.choice(MENU[category])} #{dish_id}',
+                              'description': f'{category}, страва {dish_id}', 'detailed_description': None,
+                              'image_url': None, 'category': category, 'is_available': self.rng.random() > 0.05})
+            base_price = Decimal(self.rng.randint(40, 350))
+            labels = VARIANT_LABELS[:self.rng.choices([1, 2, 3], weights=[40, 35, 25])[0]]
+            variants = []
+            for position, variant_id in enumerate(self._ids(DishVariant, len(labels))):
+                price = (base_price * (1 + Decimal('0.25') * position)).quantize(Decimal('0.01'))
+                variant_rows.append({'id': variant_id, 'dish_id': dish_id, 'size_label': labels[position],
+                                     'weight_grams': None, 'volume_ml': None, 'price': price, 'is_default': position == 0})
+                variants.append((variant_id, price))
+            self.variants_by_dish[dish_id] = variants
+            for tag_id in self.rng.sample(tag_ids, self.rng.randint(0, 3)):
+                tag_rows.append({'dish_id': dish_id, 'tag_id': tag_id})
+            groups = self.rng.sample(group_ids, min(len(group_ids), self.rng.choices([0, 1, 2, 3], weights=[35, 35, 20, 10])[0]))
+            self.groups_by_dish[dish_id] = groups
+            group_rows.extend({'dish_id': dish_id, 'modifier_group_id': group_id} for group_id in groups)
+        self.writer.write(Dish.__table__, dish_rows)
+        self.writer.write(DishVariant.__table__, variant_rows)
+        self.writer.write(dish_tags_table, tag_rows)
+        self.writer.write(dish_modifier_groups_table, group_rows)
+
+        # Хіти меню - випадкові страви, а не ті, що мають найменші id
+        self.popular_dishes = [row['id'] for row in dish_rows if row['is_available']]
+        self.rng.shuffle(self.popular_dishes)
+        self.dish_cum_weights = zipf_cum_weights(len(self.popular_dishes))
+
+    def seed_tables(self):
+        self.table_capacities = {}
+        rows = []
+        for position, table_id in enumerate(self._ids(Table, self.plan.tables), start=1):
+            capacity = self.rng.choices([2, 4, 6, 8], weights=[35, 40, 18, 7])[0]
+            rows.append({'id': table_id, 'table_number': self.table_number_offset + position, 'capacity': capacity,
+                         'is_available': True})
+            self.table_capacities[table_id] = capacity
+        self.writer.write(Table.__table__, rows)
+
+    def seed_people(self):
+        password_hash = generate_password_hash(SEED_PASSWORD) # Хешування повільне, тому один хеш на всіх
+        self.user_ids = self._ids(User, self.plan.users)
+        self.guest_ids = self._ids(Guest, self.plan.guests)
+        for chunk in self._chunks(self.user_ids):
+            self.writer.write(User.__table__, [
+                {'id': user_id, 'username': None, 'email': None, 'password_hash': password_hash,
+                 'first_name': f'Користувач {user_id}', 'last_name': None, 'phone_number': f'+38067{user_id:07d}',
+                 'phone_normalized': f'+38067{user_id:07d}', 'is_admin': False} for user_id in chunk])
+        created_from = datetime.combine(self.start_date, datetime.min.time())
+        for chunk in self._chunks(self.guest_ids):
+            self.writer.write(Guest.__table__, [
+                {'id': guest_id, 'phone_number': f'+38050{guest_id:07d}', 'phone_normalized': f'+38050{guest_id:07d}',
+                 'name': f'Гість {guest_id}',
+                 'created_at': created_from + timedelta(minutes=self.rng.randint(0, self.plan.days * 1440))}
+                for guest_id in chunk])
+        # Постійні клієнти: невелика частина гостей і користувачів робить більшість замовлень
+        self.user_cum_weights = zipf_cum_weights(len(self.user_ids), 0.8) if self.user_ids else None
+        self.guest_cum_weights = zipf_cum_weights(len(self.guest_ids), 0.8) if self.guest_ids else None
+
+    def _customer(self):
+        if self.guest_ids and (not self.user_ids or self.rng.random() < 0.6):
+            return None, self.rng.choices(self.guest_ids, cum_weights=self.guest_cum_weights)[0]
+        if self.user_ids:
+            return self.rng.choices(self.user_ids, cum_weights=self.user_cum_weights)[0], None
+        return None, None
+
+    def _modifiers(self, dish_id):
+        selected = []
+        for group_id in self.groups_by_dish[dish_id]:
+            if not self.group_required[group_id] and self.rng.random() > 0.35:
+                continue
+            options = self.options_by_group[group_id]
+            count = self.rng.randint(1, min(2, len(options))) if self.group_multiple[group_id] else 1
+            selected.extend(self.rng.sample(options, count))
+        return selected
+
+    def seed_orders(self):
+        if not self.popular_dishes:
+            return
+        dates, date_weights = self._days(self.start_date, self.plan.days)
+        order_ids = self._ids(Order, self.plan.orders)
+        for chunk in self._chunks(order_ids):
+            order_rows, item_rows, modifier_rows = [], [], []
+            for order_id in chunk:
+                day = self.rng.choices(dates, cum_weights=date_weights)[0]
+                ordered_at = datetime.combine(day, datetime.min.time()).replace(
+                    hour=self._weighted(ORDER_HOUR_WEIGHTS), minute=self.rng.randint(0, 59))
+                user_id, guest_id = self._customer()
+                total = Decimal('0')
+                dish_ids = self.rng.choices(self.popular_dishes, cum_weights=self.dish_cum_weights,
+                                            k=self._weighted(ITEMS_PER_ORDER_WEIGHTS))
+                for dish_id in dish_ids:
+                    variant_id, price = self.rng.choice(self.variants_by_dish[dish_id])
+                    quantity = self.rng.choices([1, 2, 3], weights=[80, 15, 5])[0]
+                    modifiers = self._modifiers(dish_id)
+                    unit_price = price + sum((option_price for _, option_price in modifiers), Decimal('0'))
+                    item_id = self._next_id(OrderItem)
+                    item_rows.append({'id': item_id, 'order_id': order_id, 'dish_id': dish_id, 'variant_id': variant_id,
+                                      'quantity': quantity, 'price': unit_price})
+                    for option_id, _ in modifiers:
+                        modifier_rows.append({'id': self._next_id(OrderItemModifier), 'order_item_id': item_id,
+                                              'modifier_option_id': option_id})
+                    total += unit_price * quantity
+                order_rows.append({'id': order_id, 'user_id': user_id, 'guest_id': guest_id, 'order_date': ordered_at,
+                                   'status': 'В обробці' if day == self.plan.end_date else 'Доставлено',
+                                   'total_price': total, 'delivery_address': None, 'comments': None,
+                                   'phone_number': f'+38050{guest_id:07d}' if guest_id else None})
+            self.writer.write(Order.__table__, order_rows)
+            self.writer.write(OrderItem.__table__, item_rows)
+            self.writer.write(OrderItemModifier.__table__, modifier_rows)
+
+    def _lead_days(self):
+        # Третина бронює на сьогодні, решта - за кілька днів (логнормальний хвіст до двох місяців)
+        if self.rng.random() < 0.3:
+            return 0
+        return min(60, int(self.rng.lognormvariate(1.2, 0.8)))
+
+    def seed_reservations(self):
+        if not self.table_capacities:
+            return
+        hours = {hour: weight for hour, weight in RESERVATION_HOUR_WEIGHTS.items()
+                 if self.opening_hour <= hour and hour + self.slot_hours <= self.closing_hour}
+        if not hours:
+            return
+        tables_for_guests = {count: [table_id for table_id, capacity in self.table_capacities.items() if capacity >= count]
+                             for count in GUEST_COUNT_WEIGHTS}
+        dates, date_weights = self._days(self.start_date, self.plan.days)
+        occupied = set() # (стіл, день, година) - підтверджені бронювання не перетинаються
+        reservation_ids = self._ids(Reservation, self.plan.reservations)
+        for chunk in self._chunks(reservation_ids):
+            rows = []
+            for reservation_id in chunk:
+                guest_count = self._weighted(GUEST_COUNT_WEIGHTS)
+                candidates = tables_for_guests[guest_count] or list(self.table_capacities)
+                booked_on = self.rng.choices(dates, cum_weights=date_weights)[0]
+                day = booked_on + timedelta(days=self._lead_days())
+                status = 'Підтверджено' if self.rng.random() < 0.88 else 'Скасовано'
+                for _ in range(5):
+                    table_id = self.rng.choice(candidates)
+                    hour = self._weighted(hours)
+                    slot = (table_id, day.toordinal(), hour)
+                    if status != 'Підтверджено' or slot not in occupied:
+                        break
+                else:
+                    status = 'Скасовано' # Вільного столика не знайшлося - гість "не забронював"
+                if status == 'Підтверджено':
+                    occupied.add(slot)
+                start = datetime.combine(day, datetime.min.time()).replace(hour=hour)
+                user_id, guest_id = self._customer()
+                rows.append({'id': reservation_id, 'user_id': user_id, 'guest_id': guest_id, 'table_id': table_id,
+                             'reservation_start_time': start, 'reservation_end_time': start + timedelta(hours=self.slot_hours),
+                             'reservation_date': start, 'guest_count': guest_count, 'comments': None, 'status': status,
+                             'phone_number': None})
+            self.writer.write(Reservation.__table__, rows)
+
+
+def reset_sequences(tables):
+    """Id вставлялись явно, тому на Postgres підтягуємо послідовності, інакше наступні INSERT впадуть."""
+    if db.session.get_bind().dialect.name != 'postgresql':
+        return
+    for table in tables:
+        db.session.execute(text(f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), COALESCE(MAX(id), 1)) FROM {table}"))
+
+
+def truncate_all():
+    if db.session.get_bind().dialect.name == 'postgresql':
+        names = ', '.join(table.name for table in db.metadata.sorted_tables)
+        db.session.execute(text(f'TRUNCATE {names} RESTART IDENTITY CASCADE'))
+    else:
+        for table in reversed(db.metadata.sorted_tables):
+            db.session.execute(table.delete())
+    db.session.commit()
+
+
+def make_plan(scale='small', seed=42, days=180, end_date=None, **overrides):
+    sizes = dict(PRESETS[scale])
+    sizes.update({key: value for key, value in overrides.items() if value is not None})
+    return SeedPlan(days=days, end_date=end_date or date.today(), seed=seed, **sizes)
+
+
+def seed(plan, use_copy=True):
+    """Генерує дані за планом в одній транзакції. Повертає {таблиця: кількість рядків}."""
+    writer = BulkWriter(db.session, use_copy=use_copy)
+    seeder = RestaurantSeeder(plan, writer,
+                              opening_hour=current_app.config.get('RESTAURANT_OPENING_HOUR', 10),
+                              closing_hour=current_app.config.get('RESTAURANT_CLOSING_HOUR', 23),
+                              slot_hours=current_app.config.get('RESERVATION_SLOT_DURATION_HOURS', 1))
+    try:
+        written = seeder.run()
+        reset_sequences([model.__tablename__ for model in seeder.offsets])
+        refresh_dish_search_vectors()
+        refresh_dish_summaries()
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    # COPY оминає події сесії, тому кеші меню/цін скидаємо явно
+    bump_tables(*written)
+    return written
+
+
+@click.command('seed')
+@with_appcontext
+@click.option('--scale', type=click.Choice(list(PRESETS)), default='small', show_default=True, help='Базовий розмір даних.')
+@click.option('--seed', 'seed_value', type=int, default=42, show_default=True, help='Зерно генератора (відтворюваність).')
+@click.option('--days', type=int, default=180, show_default=True, help='Скільки днів історії замовлень і бронювань.')
+@click.option('--end-date', type=click.DateTime(formats=['%Y-%m-%d']), default=None, help='Останній день історії (за замовчуванням сьогодні).')
+@click.option('--dishes', type=int, default=None)
+@click.option('--modifier-groups', type=int, default=None)
+@click.option('--tables', type=int, default=None)
+@click.option('--users', type=int, default=None)
+@click.option('--guests', type=int, default=None)
+@click.option('--orders', type=int, default=None)
+@click.option('--reservations', type=int, default=None)
+@click.option('--no-copy', is_flag=True, help='Писати INSERT-ами навіть на Postgres.')
+@click.option('--truncate', is_flag=True, help='Спочатку очистити всі таблиці.')
+@click.option('--yes', is_flag=True, help='Не питати підтвердження для --truncate.')
+def seed_command(scale, seed_value, days, end_date, no_copy, truncate, yes, **overrides):
+    """Наповнює базу синтетичними даними (страви, модифікатори, гості, користувачі, замовлення, бронювання)."""
+    if truncate:
+        if not yes:
+            click.confirm(f'Видалити ВСІ дані з {db.engine.url.render_as_string(hide_password=True)}?', abort=True)
+        truncate_all()
+    plan = make_plan(scale, seed_value, days, end_date.date() if end_date else None, **overrides)
+    started = datetime.now()
+    written = seed(plan, use_copy=not no_copy)
+    elapsed = (datetime.now() - started).total_seconds()
+    total = sum(written.values())
+    click.echo(f'Згенеровано {total} рядків за {elapsed:.1f} с ({total / elapsed if elapsed else 0:.0f} рядків/с):')
+    for table_name, count in written.items():
+        click.echo(f'  {table_name}: {count}')
@@ -0,0 +1,308 @@
+import atexit
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+from threading import Lock
+import click
+from flask import current_app, has_request_context, request
+from flask.cli import with_appcontext
+from app.instrumentation import add_query_observer
+
+# Нормалізація SQL у "відбиток": літерали та параметри -> ?, списки IN (...) та VALUES згортаються
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_PARAM = re.compile(r"%\([^)]+\)s|%s|\$\d+|(?<![:\w]):[A-Za-z_]\w*|__\[POSTCOMPILE_\w+\]")
+_NUMBER = re.compile(r'(?<![\w.])-?\d+(?:\.\d+)?\b')
+_IN_LIST = re.compile(r'\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)', re.IGNORECASE)
+_VALUES_ROWS = re.compile(r'(\(\s*\?(?:\s*,\s*\?)*\s*\))(?:\s*,\s*\(\s*\?(?:\s*,\s*\?)*\s*\))+')
+_SPACE = re.compile(r'\s+')
+
+EXPLAIN_PREFIXES = {'sqlite': 'EXPLAIN QUERY PLAN ', 'postgresql': 'EXPLAIN ', 'mysql': 'EXPLAIN '}
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(statement):
+    """SELECT ... WHERE id IN (1, 2, 3) AND name = 'x' -> SELECT ... WHERE id IN (...) AND name = ?"""
+    normalized = _STRING.sub('?', statement)
+    normalized = _PARAM.sub('?', normalized)
+    normalized = _NUMBER.sub('?', normalized)
+    normalized = _SPACE.sub(' ', normalized).strip()
+    normalized = _IN_LIST.sub('IN (...)', normalized)
+    return _VALUES_ROWS.sub(r'\1, ...', normalized)
+
+
+def describe_parameters(parameters):
+    """Параметри без значень: у запитах до users та password_reset_otps там хеші паролів, OTP-коди і телефони."""
+    if isinstance(parameters, dict):
+        return '{' + ', '.join(f'{name}: {type(value).__name__}' for name, value in parameters.items()) + '}'
+    if isinstance(parameters, (list, tuple)):
+        return '(' + ', '.join(type(value).__name__ for value in parameters) + ')'
+    return type(parameters).__name__
+
+
+def percentile(sorted_samples, fraction):
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, max(0, int(round(fraction * len(sorted_samples) + 0.5)) - 1))
+    return sorted_samples[index]
+
+
+def current_route():
+    """Звідки прийшов запит: 'AvailableSlots.get' для ресурсів flask-restx, інакше endpoint або 'cli'."""
+    if not has_request_context():
+        return 'cli'
+    view = current_app.view_functions.get(request.endpoint)
+    view_class = getattr(view, 'view_class', None)
+    if view_class is not None:
+        return f'{view_class.__name__}.{request.method.lower()}'
+    return request.endpoint or 'unmatched'
+
+
+class QueryStats:
+    def __init__(self, window):
+        self.samples = deque(maxlen=window) # Останні тривалості (мс) для p50/p95/p99
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.slow_count = 0
+        self.example = None
+
+    def as_dict(self):
+        return {'count': self.count, 'total_ms': self.total_ms, 'max_ms': self.max_ms,
+                'slow_count': self.slow_count, 'example': self.example, 'samples': list(self.samples)}
+
+
+class SlowQueryRecorder:
+    def __init__(self):
+        self._lock = Lock()
+        self.stats = {}
+        self.threshold_ms = 200
+        self.window = 1000
+        self.explain = True
+        self.log_parameters = False
+        self.stats_dir = None
+        self.flush_seconds = 10
+        self.logger = None
+        self._flush_lock = Lock()
+        self._flusher_pid = None
+        self._atexit_registered = False
+
+    def configure(self, app):
+        self.threshold_ms = app.config.get('SLOW_QUERY_THRESHOLD_MS', 200)
+        self.window = app.config.get('SLOW_QUERY_WINDOW', 1000)
+        self.explain = app.config.get('SLOW_QUERY_EXPLAIN', True)
+        self.log_parameters = app.config.get('SLOW_QUERY_LOG_PARAMETERS', False)
+        self.stats_dir = stats_dir(app)
+        self.flush_seconds = app.config.get('SLOW_QUERY_FLUSH_SECONDS', 10)
+        if self.stats_dir:
+            prune_stats(self.stats_dir, app.config.get('SLOW_QUERY_STATS_MAX_AGE_SECONDS', 3600))
+        self.logger = app.logger
+        if not self._atexit_registered:
+            atexit.register(self.flush)
+            self._atexit_registered = True
+
+    def observe(self, conn, cursor, statement, parameters, executemany, elapsed):
+        elapsed_ms = elapsed * 1000
+        key = (fingerprint(statement), current_route())
+        with self._lock:
+            stats = self.stats.get(key)
+            if stats is None:
+                stats = self.stats[key] = QueryStats(self.window)
+            stats.samples.append(elapsed_ms)
+            stats.count += 1
+            stats.total_ms += elapsed_ms
+            stats.max_ms = max(stats.max_ms, elapsed_ms)
+            if stats.example is None:
+                stats.example = statement
+            is_slow = elapsed_ms >= self.threshold_ms
+            if is_slow:
+                stats.slow_count += 1
+            if self.stats_dir and self._flusher_pid != os.getpid():
+                self._start_flusher()
+
+        if is_slow:
+            plan = explain(conn, statement, parameters) if self.explain and not executemany else None
+            self.log_slow(key, elapsed_ms, statement, parameters, executemany, plan)
+
+    def _start_flusher(self):
+        # Викликається під _lock. Потік запускається в кожному воркері окремо: після fork потоки майстра не живуть
+        self._flusher_pid = os.getpid()
+        threading.Thread(target=self._run_flusher, name='slow-query-flush', daemon=True).start()
+
+    def _run_flusher(self):
+        while True:
+            time.sleep(self.flush_seconds)
+            self.flush()
+
+    def log_slow(self, key, elapsed_ms, statement, parameters, executemany, plan):
+        if self.logger is None:
+            return
+        if self.log_parameters:
+            described = repr(parameters)
+        elif executemany:
+            described = f'{len(parameters)} наборів'
+        else:
+            described = describe_parameters(parameters)
+        message = f"Повільний SQL-запит ({elapsed_ms:.1f} мс, {key[1]}): {statement} | параметри: {described}"
+        if plan:
+            # Postgres підставляє значення параметрів у Filter/Index Cond плану, тому рядкові літерали теж ховаємо
+            message += f"\nПлан виконання:\n{plan if self.log_parameters else _STRING.sub('?', plan)}"
+        self.logger.warning(message)
+
+    def snapshot(self):
+        with self._lock:
+            return [dict(fingerprint=key[0], route=key[1], **stats.as_dict()) for key, stats in self.stats.items()]
+
+    def flush(self):
+        """Зберігає статистику процесу у <stats_dir>/<pid>.json, щоб її міг прочитати `flask slow-queries`.
+        Викликається з фонового потоку та при виході, не з обробки запиту. Помилки диска лише логуються."""
+        if not self.stats_dir or not self.stats:
+            return
+        with self._flush_lock:
+            temp_path = None
+            try:
+                os.makedirs(self.stats_dir, exist_ok=True)
+                descriptor, temp_path = tempfile.mkstemp(dir=self.stats_dir, prefix=f'{os.getpid()}.', suffix='.tmp')
+                with os.fdopen(descriptor, 'w', encoding='utf-8') as stats_file:
+                    json.dump(self.snapshot(), stats_file, ensure_ascii=False)
+                os.replace(temp_path, os.path.join(self.stats_dir, f'{os.getpid()}.json'))
+            except OSError as e:
+                if temp_path is not None and os.path.exists(temp_path):
+                    try:
+                        os.remove(temp_path)
+                    except OSError:
+                        pass
+                if self.logger is not None:
+                    self.logger.warning(f'Не вдалося зберегти статистику SQL-запитів у {self.stats_dir}: {e}')
+
+    def reset(self):
+        with self._lock:
+            self.stats.clear()
+
+
+recorder = SlowQueryRecorder()
+
+
+def stats_dir(app):
+    return app.config.get('SLOW_QUERY_STATS_DIR') or os.path.join(app.instance_path, 'slow_queries')
+
+
+def explain(conn, statement, parameters):
+    """План виконання для SELECT-запиту на тому ж зʼєднанні (в обхід подій SQLAlchemy)."""
+    prefix = EXPLAIN_PREFIXES.get(conn.dialect.name)
+    if prefix is None or not statement.lstrip().upper().startswith(('SELECT', 'WITH')):
+        return None
+    # На Postgres помилка EXPLAIN зламала б поточну транзакцію, тому обгортаємо її у savepoint
+    use_savepoint = conn.dialect.name == 'postgresql' and conn.in_transaction()
+    cursor = conn.connection.cursor()
+    try:
+        if use_savepoint:
+            cursor.execute('SAVEPOINT slow_query_explain')
+        cursor.execute(prefix + statement, parameters)
+        rows = cursor.fetchall()
+        if use_savepoint:
+            cursor.execute('RELEASE SAVEPOINT slow_query_explain')
+        return '\n'.join(str(row[-1]) for row in rows)
+    except Exception as e:
+        if use_savepoint:
+            try:
+                cursor.execute('ROLLBACK TO SAVEPOINT slow_query_explain')
+            except Exception:
+                pass
+        return f'EXPLAIN не вдався: {e}'
+    finally:
+        cursor.close()
+
+
+def prune_stats(directory, max_age_seconds):
+    """Видаляє файли воркерів, які давно не оновлювались: живий воркер переписує свій файл кожні
+    SLOW_QUERY_FLUSH_SECONDS, тож старий файл лишився від зупиненого процесу (або недописаний .tmp)."""
+    if not max_age_seconds or not os.path.isdir(directory):
+        return
+    cutoff = time.time() - max_age_seconds
+    for file_name in os.listdir(directory):
+        path = os.path.join(directory, file_name)
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+        except OSError:
+            pass # Файл уже видалив інший воркер
+
+
+def load_report(directory, max_age_seconds=None):
+    """Обʼєднує статистику всіх процесів (воркерів) з директорії. Файли, старші за max_age_seconds, видаляються."""
+    merged = {}
+    if not os.path.isdir(directory):
+        return []
+    prune_stats(directory, max_age_seconds)
+    for file_name in os.listdir(directory):
+        if not file_name.endswith('.json'):
+            continue
+        try:
+            with open(os.path.join(directory, file_name), encoding='utf-8') as stats_file:
+                entries = json.load(stats_file)
+        except (OSError, ValueError):
+            continue
+        for entry in entries:
+            key = (entry['fingerprint'], entry['route'])
+            target = merged.setdefault(key, {'fingerprint': key[0], 'route': key[1], 'count': 0, 'total_ms': 0.0,
+                                             'max_ms': 0.0, 'slow_count': 0, 'example': entry.get('example'), 'samples': []})
+            target['count'] += entry['count']
+            target['total_ms'] += entry['total_ms']
+            target['max_ms'] = max(target['max_ms'], entry['max_ms'])
+            target['slow_count'] += entry['slow_count']
+            target['samples'].extend(entry['samples'])
+
+    report = []
+    for entry in merged.values():
+        samples = sorted(entry.pop('samples'))
+        entry['p50_ms'] = percentile(samples, 0.50)
+        entry['p95_ms'] = percentile(samples, 0.95)
+        entry['p99_ms'] = percentile(samples, 0.99)
+        report.append(entry)
+    return report
+
+
+@click.command('slow-queries')
+@with_appcontext
+@click.option('--top', default=20, show_default=True, help='Скільки відбитків показати.')
+@click.option('--sort', 'sort_by', type=click.Choice(['total', 'p95', 'p99', 'count', 'slow']), default='total',
+              show_default=True, help='Критерій сортування.')
+@click.option('--route', default=None, help='Лише запити з цього маршруту, напр. AvailableSlots.get.')
+@click.option('--reset', is_flag=True, help='Видалити накопичену статистику.')
+def slow_queries_command(top, sort_by, route, reset):
+    """Топ SQL-запитів за часом виконання (відбиток + маршрут, p50/p95/p99)."""
+    directory = stats_dir(current_app)
+    if reset:
+        if os.path.isdir(directory):
+            for file_name in os.listdir(directory):
+                os.remove(os.path.join(directory, file_name))
+        click.echo('Статистику повільних запитів очищено.')
+        return
+
+    report = load_report(directory, current_app.config.get('SLOW_QUERY_STATS_MAX_AGE_SECONDS'))
+    if route:
+        report = [entry for entry in report if entry['route'] == route]
+    sort_keys = {'total': 'total_ms', 'p95': 'p95_ms', 'p99': 'p99_ms', 'count': 'count', 'slow': 'slow_count'}
+    report.sort(key=lambda entry: entry[sort_keys[sort_by]], reverse=True)
+    if not report:
+        click.echo(f'Немає статистики у {directory}.')
+        return
+
+    for position, entry in enumerate(report[:top], start=1):
+        click.echo(f"{position}. {entry['route']}: {entry['count']} викликів, всього {entry['total_ms']:.1f} мс, "
+                   f"p50 {entry['p50_ms']:.2f} / p95 {entry['p95_ms']:.2f} / p99 {entry['p99_ms']:.2f} / "
+                   f"max {entry['max_ms']:.2f} мс, повільних {entry['slow_count']}")
+        click.echo(f"   {entry['fingerprint']}")
+
+
+def init_slow_query_log(app):
+    app.cli.add_command(slow_queries_command)
+    if not app.config.get('SLOW_QUERY_LOG_ENABLED', True):
+        return
+    recorder.configure(app)
+    add_query_observer(recorder.observe)
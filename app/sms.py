@@ -0,0 +1,34 @@
+"""Відправка SMS через Twilio. Пакет twilio (~0.1 с імпорту разом з requests/urllib3) завантажується
+лише під час першої відправки, а не при старті кожного воркера."""
+from threading import Lock
+from flask import current_app
+
+_client_lock = Lock()
+
+
+class SmsConfigurationError(Exception):
+    pass
+
+
+def sms_configured():
+    return bool(current_app.config.get('TWILIO_ACCOUNT_SID') and current_app.config.get('TWILIO_AUTH_TOKEN'))
+
+
+def twilio_client():
+    """Один клієнт Twilio на застосунок, створюється при першому зверненні."""
+    client = current_app.extensions.get('twilio_client')
+    if client is not None:
+        return client
+    if not sms_configured():
+        raise SmsConfigurationError("Twilio credentials не налаштовані.")
+    with _client_lock:
+        client = current_app.extensions.get('twilio_client')
+        if client is None:
+            from twilio.rest import Client # Лінивий імпорт, див. докстрінг модуля
+            client = Client(current_app.config['TWILIO_ACCOUNT_SID'], current_app.config['TWILIO_AUTH_TOKEN'])
+            current_app.extensions['twilio_client'] = client
+    return client
+
+
+def send_sms(to, body):
+    return twilio_client().messages.create(body=body, from_=current_app.config['TWILIO_FROM_NUMBER'], to=to)
@@ -0,0 +1,88 @@
+import time
+from threading import Lock
+from flask import current_app
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.dialects import postgresql, sqlite
+from app import db
+from app.cache import tables_version
+from app.models import Tag
+
+# Кеш назва -> id тегу в межах процесу. Скидається після будь-якого коміту/відкату, що змінив таблицю tags
+_tag_ids = {}
+_tag_ids_key = None
+_tag_ids_built_at = 0.0
+_tag_ids_lock = Lock()
+
+
+def _cache():
+    global _tag_ids_key, _tag_ids_built_at
+    key = (id(db.engine), tables_version(('tags',)))
+    ttl = current_app.config.get('MENU_CACHE_TTL_SECONDS', 30)
+    with _tag_ids_lock:
+        if _tag_ids_key != key or time.monotonic() - _tag_ids_built_at >= ttl:
+            _tag_ids.clear()
+            _tag_ids_key = key
+            _tag_ids_built_at = time.monotonic()
+    return _tag_ids
+
+
+def _load_ids(names, cache, found):
+    rows = db.session.query(Tag.id, Tag.name).filter(Tag.name.in_(names)).all()
+    found.update((name, tag_id) for tag_id, name in rows)
+    # Поки поточна транзакція писала в tags, частина id може належати ще не закоміченим рядкам. Такі id не
+    # потрапляють у спільний кеш: інші потоки привʼязали б їх до своїх страв, а відкат (чи закриття сесії без
+    # rollback) не скинув би кеш. Після commit версія tags зміниться і кеш перечитає вже закомічені рядки
+    if 'tags' in db.session.info.get('touched_tables', ()):
+        return
+    with _tag_ids_lock:
+        for tag_id, name in rows:
+            cache[name] = tag_id
+
+
+def _insert_missing(names):
+    """INSERT ... ON CONFLICT DO NOTHING, щоб паралельне створення того ж тегу не падало на unique(name)."""
+    values = [{'name': name} for name in names]
+    dialect = db.session.get_bind().dialect.name
+    if dialect == 'postgresql':
+        db.session.execute(postgresql.insert(Tag).values(values).on_conflict_do_nothing(index_elements=['name']))
+    elif dialect == 'sqlite':
+        db.session.execute(sqlite.insert(Tag).values(values).on_conflict_do_nothing(index_elements=['name']))
+    else:
+        for value in values:
+            try:
+                with db.session.begin_nested():
+                    db.session.execute(Tag.__table__.insert().values(**value))
+            except IntegrityError:
+                pass
+
+
+def resolve_tag_ids(names):
+    """Повертає {назва: id} для всіх назв. Відомі теги беруться з кешу, решта - одним IN-запитом,
+    відсутні створюються пакетним upsert у поточній транзакції."""
+    unique_names = list(dict.fromkeys(names))
+    if not unique_names:
+        return {}
+
+    cache = _cache()
+    found = {name: cache[name] for name in unique_names if name in cache}
+    missing = [name for name in unique_names if name not in found]
+    if missing:
+        _load_ids(missing, cache, found)
+        missing = [name for name in missing if name not in found]
+        if missing:
+            _insert_missing(missing)
+            _load_ids(missing, cache, found)
+
+    return {name: found[name] for name in unique_names}
+
+
+def _attached_tag(tag_id, name):
+    tag = Tag(id=tag_id, name=name)
+    make_transient_to_detached(tag)
+    return db.session.merge(tag, load=False)
+
+
+def resolve_tags(names):
+    """Повертає {назва: Tag} без окремого запиту на кожен тег (об'єкти прив'язуються до сесії за id)."""
+    return {name: _attached_tag(tag_id, name) for name, tag_id in resolve_tag_ids(names).items()}
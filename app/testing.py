@@ -0,0 +1,38 @@
+from contextlib import contextmanager
+from sqlalchemy import event
+from app import db
+
+
+class QueryCounter:
+    def __init__(self):
+        self.statements = []
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+
+@contextmanager
+def count_queries(engine=None):
+    """Рахує SQL-запити всередині блоку: with count_queries() as counter: ...; counter.count"""
+    engine = engine or db.engine
+    counter = QueryCounter()
+    event.listen(engine, 'before_cursor_execute', counter._record)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, 'before_cursor_execute', counter._record)
+
+
+@contextmanager
+def assert_query_count(expected, engine=None, exact=False):
+    """Перевіряє, що блок виконав не більше (або рівно, якщо exact) expected запитів."""
+    with count_queries(engine) as counter:
+        yield counter
+    failed = counter.count != expected if exact else counter.count > expected
+    if failed:
+        statements = '\n'.join(f'  {index}. {statement}' for index, statement in enumerate(counter.statements, start=1))
+        raise AssertionError(f'Очікувалось {"рівно" if exact else "не більше"} {expected} SQL-запитів, виконано {counter.count}:\n{statements}')
@@ -0,0 +1,6 @@
+# asgi.py
+from app import create_app
+from app.async_api import create_asgi_app
+
+flask_app = create_app()
+app = create_asgi_app(flask_app)
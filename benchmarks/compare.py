@@ -0,0 +1,60 @@
+"""Порівняння двох запусків бенчмарку.
+
+    python -m benchmarks.compare benchmarks/results/baseline.json benchmarks/results/current.json --threshold 10
+
+Повертає код 1, якщо обрана метрика погіршилась більше ніж на --threshold відсотків хоча б для одного маршруту."""
+import argparse
+import json
+import sys
+
+# Для цих метрик більше значення - гірше, для throughput навпаки
+LOWER_IS_BETTER = {'mean_ms', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms', 'queries_per_request'}
+
+
+def load(path):
+    with open(path, encoding='utf-8') as report_file:
+        return json.load(report_file)
+
+
+def compare(baseline, current, metric, threshold):
+    rows, regressions = [], []
+    for route, current_result in current['results'].items():
+        baseline_result = baseline['results'].get(route)
+        if baseline_result is None or baseline_result.get(metric) in (None, 0) or current_result.get(metric) is None:
+            rows.append((route, None, current_result.get(metric), None))
+            continue
+        before, after = baseline_result[metric], current_result[metric]
+        change = (after - before) / before * 100
+        worse = change > threshold if metric in LOWER_IS_BETTER else -change > threshold
+        if worse:
+            regressions.append(route)
+        rows.append((route, before, after, change))
+    return rows, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Порівняння результатів бенчмарку')
+    parser.add_argument('baseline')
+    parser.add_argument('current')
+    parser.add_argument('--metric', default='p95_ms')
+    parser.add_argument('--threshold', type=float, default=10.0, help='Допустиме погіршення у відсотках')
+    args = parser.parse_args(argv)
+
+    baseline, current = load(args.baseline), load(args.current)
+    for label, report in (('baseline', baseline), ('current', current)):
+        meta = report['meta']
+        print(f"{label}: {meta.get('git_revision')} {meta.get('database')} scale={meta.get('scale')} "
+              f"requests={meta.get('requests')} concurrency={meta.get('concurrency')}")
+
+    rows, regressions = compare(baseline, current, args.metric, args.threshold)
+    print(f'\n{"Маршрут":28} {"було":>10} {"стало":>10} {"зміна":>9}  ({args.metric})')
+    for route, before, after, change in rows:
+        change_text = f'{change:+.1f}%' if change is not None else 'n/a'
+        marker = '  <-- регресія' if route in regressions else ''
+        print(f'{route:28} {before if before is not None else "-":>10} {after if after is not None else "-":>10} '
+              f'{change_text:>9}{marker}')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,143 @@
+"""Розмір відповіді та час кодування JSON проти MessagePack і CBOR (app/representations.py).
+
+    python -m benchmarks.payload_formats
+    python -m benchmarks.payload_formats --scale medium --repeat 50 --output benchmarks/results/payload_formats.json
+
+Корисні навантаження - ті самі змаршалені моделі, що віддає API: повне меню (dish_model), історія замовлень
+найактивнішого користувача (order_model_output) та бронювання за найзавантаженіший день (reservation_model).
+Кожен формат кодується функцією представлення з api.representations, тож у вимір входить і формування відповіді Flask.
+Окремо показано розмір після gzip (його зазвичай додає проксі) та час декодування на клієнті."""
+import argparse
+import gzip
+import json
+import os
+import platform
+import statistics
+import tempfile
+import time
+from datetime import datetime, timezone
+from flask_restx import marshal
+from sqlalchemy import func
+from app import db
+from app.api import api, dish_model, order_model_output, reservation_model
+from app.loading import dish_full_options, order_full_options, reservation_full_options
+from app.models import Dish, Order, Reservation
+from app.representations import BINARY_REPRESENTATIONS, CBOR_MEDIATYPE, MSGPACK_MEDIATYPE
+from app.seeding import PRESETS
+from benchmarks.run import git_revision, make_app, prepare_database
+
+FORMATS = ('application/json', MSGPACK_MEDIATYPE, CBOR_MEDIATYPE)
+
+
+def build_payloads():
+    dishes = Dish.query.options(*dish_full_options()).order_by(Dish.id).all()
+    top_user = db.session.query(Order.user_id).filter(Order.user_id.isnot(None)) \
+        .group_by(Order.user_id).order_by(func.count().desc()).limit(1).scalar()
+    orders = Order.query.options(*order_full_options()).filter_by(user_id=top_user).order_by(Order.id).all()
+    busiest_day = db.session.query(Reservation.reservation_date).group_by(Reservation.reservation_date) \
+        .order_by(func.count().desc()).limit(1).scalar()
+    reservations = Reservation.query.options(*reservation_full_options()) \
+        .filter(Reservation.reservation_date == busiest_day).order_by(Reservation.id).all()
+    return {
+        'menu': marshal(dishes, dish_model),
+        'order_history': marshal(orders, order_model_output),
+        'reservations_day': marshal(reservations, reservation_model),
+    }
+
+
+def decoder(mediatype):
+    if mediatype == MSGPACK_MEDIATYPE:
+        import msgpack
+        return lambda body: msgpack.unpackb(body, raw=False)
+    if mediatype == CBOR_MEDIATYPE:
+        import cbor2
+        return cbor2.loads
+    return json.loads
+
+
+def measure(app, data, mediatype, repeat):
+    representation = api.representations[mediatype]
+    decode = decoder(mediatype)
+    encode_times, decode_times = [], []
+    with app.test_request_context():
+        body = representation(data, 200).get_data()
+        for _ in range(repeat):
+            started = time.perf_counter()
+            body = representation(data, 200).get_data()
+            encode_times.append((time.perf_counter() - started) * 1000)
+    for _ in range(repeat):
+        started = time.perf_counter()
+        decode(body)
+        decode_times.append((time.perf_counter() - started) * 1000)
+    return {
+        'bytes': len(body),
+        'gzip_bytes': len(gzip.compress(body, compresslevel=6)),
+        'encode_ms': round(statistics.median(encode_times), 3),
+        'decode_ms': round(statistics.median(decode_times), 3),
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Розмір і час кодування відповідей у JSON, MessagePack та CBOR')
+    parser.add_argument('--database-url', default=os.environ.get('BENCH_DATABASE_URL'),
+                        help='БД для бенчмарку (за замовчуванням SQLite у тимчасовій директорії). Увага: --reset очищує її.')
+    parser.add_argument('--scale', choices=list(PRESETS), default='small')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--reset', action='store_true', help='Перестворити таблиці перед наповненням')
+    parser.add_argument('--repeat', type=int, default=30, help='Скільки разів кодувати кожне навантаження')
+    parser.add_argument('--output', help='Куди зберегти JSON з результатами')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    database_url = args.database_url
+    if not database_url:
+        database_url = 'sqlite:///' + os.path.join(tempfile.mkdtemp(prefix='restaurant-bench-'), 'bench.db')
+
+    app = make_app(database_url)
+    formats = [mediatype for mediatype in FORMATS if mediatype in api.representations]
+    missing = [mediatype for mediatype in FORMATS if mediatype not in formats]
+    if missing:
+        packages = sorted({BINARY_REPRESENTATIONS[mediatype][0] for mediatype in missing})
+        print(f"Не встановлено {', '.join(packages)} (requirements-binary.txt), формати {', '.join(missing)} пропущено.")
+
+    results = {}
+    with app.app_context():
+        counts = prepare_database(args.scale, args.seed, args.reset)
+        payloads = build_payloads()
+        for name, data in payloads.items():
+            results[name] = {'items': len(data)}
+            json_result = None
+            for mediatype in formats:
+                result = measure(app, data, mediatype, args.repeat)
+                if json_result is None:
+                    json_result = result
+                result['size_vs_json'] = round(result['bytes'] / json_result['bytes'], 3)
+                results[name][mediatype] = result
+                print(f"{name:17} {mediatype:20} {result['bytes']:>10} Б  gzip {result['gzip_bytes']:>9} Б  "
+                      f"({result['size_vs_json']:.2f} від JSON)  кодування {result['encode_ms']:>8} мс  "
+                      f"декодування {result['decode_ms']:>8} мс")
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'git_revision': git_revision(),
+            'python': platform.python_version(),
+            'scale': args.scale,
+            'seed': args.seed,
+            'repeat': args.repeat,
+            'seeded_rows': counts,
+        },
+        'results': results,
+    }
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as output_file:
+            json.dump(report, output_file, ensure_ascii=False, indent=2)
+        print(f'Результати збережено у {args.output}')
+    return report
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+"""Кількість SQL-запитів на маршрут: фіксує результат політик завантаження з app/loading.py.
+
+    python -m benchmarks.query_counts
+    python -m benchmarks.query_counts --routes OrderResource.get DishList.get
+
+Наповнює невелику базу тим самим генератором, що й `flask seed` (менше 500 рядків у кожному зв'язку, тож кожен
+selectinload - рівно один запит), і через app.testing.assert_query_count перевіряє, що маршрут виконує рівно
+стільки запитів, скільки зазначено в ROUTES. Лінивий підвантаж у циклі (N+1) змінить число, тому при зміні
+політик завантаження значення в ROUTES оновлюються разом із кодом. Маршрути для читання спершу викликаються
+один раз без підрахунку, щоб знімки в пам'яті (меню, ціни) вже були побудовані. Код виходу 1 при розбіжності."""
+import argparse
+import os
+import sys
+import tempfile
+from collections import namedtuple
+from app import db
+from app.models import Order
+from app.seeding import make_plan, seed
+from app.testing import assert_query_count
+from benchmarks.run import make_app
+from benchmarks.scenarios import DataContext
+
+# Досить рядків, щоб кожен зв'язок мав кілька записів, і замало, щоб selectinload ділив IN на пачки
+PLAN_OVERRIDES = {'dishes': 20, 'modifier_groups': 6, 'tables': 6, 'users': 5, 'guests': 10, 'orders': 120,
+                  'reservations': 60}
+
+# build(ids) -> (шлях, json). warmup=False - маршрут змінює дані, тому викликається лише раз
+QueryRoute = namedtuple('QueryRoute', 'name method build queries expected_status warmup')
+
+ROUTES = [
+    QueryRoute('DishList.get', 'GET', lambda ids: ('/api/dishes/', None), 5, 200, True),
+    QueryRoute('DishResource.get', 'GET', lambda ids: (f"/api/dishes/{ids['dish_id']}", None), 4, 200, True),
+    QueryRoute('ModifierGroupList.get', 'GET', lambda ids: ('/api/modifier-groups/', None), 2, 200, True),
+    QueryRoute('NewsList.get', 'GET', lambda ids: ('/api/news', None), 1, 200, True),
+    QueryRoute('OrderList.get', 'GET', lambda ids: ('/api/orders/', None), 3, 200, True),
+    QueryRoute('OrderResource.get', 'GET', lambda ids: (f"/api/orders/{ids['order_id']}", None), 3, 200, True),
+    QueryRoute('ReservationList.get', 'GET', lambda ids: ('/api/reservations/', None), 1, 200, True),
+    QueryRoute('UserOrders.get', 'GET', lambda ids: (f"/api/users/{ids['user_id']}/orders", None), 4, 200, True),
+    QueryRoute('UserOrderHistory.get', 'GET', lambda ids: (f"/api/users/{ids['user_id']}/history", None), 5, 200, True),
+    QueryRoute('UserReservations.get', 'GET', lambda ids: (f"/api/users/{ids['user_id']}/reservations", None), 2, 200, True),
+    QueryRoute('GuestOrders.get', 'GET', lambda ids: (f"/api/guests/{ids['guest_phone']}/orders", None), 4, 200, True),
+    QueryRoute('GuestReservations.get', 'GET', lambda ids: (f"/api/guests/{ids['guest_phone']}/reservations", None), 2, 200, True),
+    QueryRoute('OrderList.post', 'POST', lambda ids: ('/api/orders/', ids['order_payload']), 10, 201, True),
+    QueryRoute('OrderResource.delete', 'DELETE', lambda ids: (f"/api/orders/{ids['delete_order_id']}", None), 6, 204, False),
+]
+
+
+def sample_ids():
+    """Записи з наповненої бази, на яких перевіряються маршрути. Замовлення - з однією позицією й обов'язковими
+    модифікаторами, щоб кількість запитів не залежала від випадкового вибору."""
+    context = DataContext()
+    dish_id = context.dish_ids[0]
+    options = [group.options[0].id for group in context.groups_by_dish.get(dish_id, [])
+               if group.is_required and group.options]
+    user_order = Order.query.filter(Order.user_id.isnot(None)).order_by(Order.id).first()
+    guest_order = Order.query.filter(Order.guest_id.isnot(None)).order_by(Order.id).first()
+    return {
+        'dish_id': dish_id,
+        'order_id': user_order.id,
+        'user_id': user_order.user_id,
+        'guest_phone': guest_order.guest.phone_number,
+        'delete_order_id': db.session.execute(db.select(db.func.max(Order.id))).scalar(),
+        'order_payload': {'phone_number': guest_order.guest.phone_number,
+                          'items': [{'dish_id': dish_id, 'variant_id': context.variants_by_dish[dish_id][0],
+                                     'quantity': 1, 'modifier_option_ids': options}]},
+    }
+
+
+def check_route(app, route, ids):
+    """(кількість запитів, помилка або None)."""
+    path, payload = route.build(ids)
+    client = app.test_client()
+    if route.warmup:
+        client.open(path, method=route.method, json=payload)
+    try:
+        with assert_query_count(route.queries, exact=True) as counter:
+            response = client.open(path, method=route.method, json=payload)
+    except AssertionError as e:
+        return None, str(e)
+    if response.status_code != route.expected_status:
+        return counter.count, f'статус {response.status_code}, очікувався {route.expected_status}'
+    return counter.count, None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Перевірка кількості SQL-запитів на маршрут')
+    parser.add_argument('--routes', nargs='*', help='Лише ці маршрути (за замовчуванням усі)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--verbose', action='store_true', help='Показати всі запити при розбіжності')
+    args = parser.parse_args()
+
+    routes = [route for route in ROUTES if not args.routes or route.name in args.routes]
+    workdir = tempfile.mkdtemp(prefix='restaurant-query-counts-')
+    app = make_app('sqlite:///' + os.path.join(workdir, 'queries.db'))
+    failed = []
+    with app.app_context():
+        db.create_all()
+        seed(make_plan('small', args.seed, **PLAN_OVERRIDES))
+        ids = sample_ids()
+        db.session.remove()
+        for route in routes:
+            count, error = check_route(app, route, ids)
+            if error is None:
+                print(f'{route.name:<24} {count:>3} запитів')
+                continue
+            failed.append(route.name)
+            print(f'{route.name:<24} ПОМИЛКА: {error if args.verbose else error.splitlines()[0]}')
+
+    if failed:
+        print(f'Розбіжність у {len(failed)} маршрутах: {", ".join(failed)}')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""Сценарії навантаження на ключові маршрути. Кожен сценарій будує наступний HTTP-запит з контексту даних."""
+import random
+from collections import namedtuple
+from datetime import date, timedelta
+from app.models import Dish, DishVariant, Guest, ModifierGroup, User, dish_modifier_groups_table
+from app import db
+from app.seeding import SEED_PASSWORD
+
+Scenario = namedtuple('Scenario', 'name method build expected_status')
+BenchRequest = namedtuple('BenchRequest', 'path json')
+
+
+class DataContext:
+    """Що потрібно сценаріям з бази: страви з варіантами й правилами модифікаторів, телефони, діапазон дат."""
+
+    def __init__(self, seed=42):
+        self.rng = random.Random(seed)
+        variants = db.session.execute(db.select(DishVariant.id, DishVariant.dish_id)
+                                      .join(Dish, Dish.id == DishVariant.dish_id)
+                                      .where(Dish.is_available == True)).all()
+        self.variants_by_dish = {}
+        for variant_id, dish_id in variants:
+            self.variants_by_dish.setdefault(dish_id, []).append(variant_id)
+        self.dish_ids = sorted(self.variants_by_dish)
+        # Популярність страв нерівномірна, як і в згенерованих замовленнях
+        self.dish_weights = [1 / rank for rank in range(1, len(self.dish_ids) + 1)]
+
+        groups = {group.id: group for group in ModifierGroup.query.options(db.selectinload(ModifierGroup.options)).all()}
+        self.groups_by_dish = {}
+        for dish_id, group_id in db.session.execute(db.select(dish_modifier_groups_table.c.dish_id,
+                                                              dish_modifier_groups_table.c.modifier_group_id)).all():
+            self.groups_by_dish.setdefault(dish_id, []).append(groups[group_id])
+
+        self.guest_phones = [phone for (phone,) in db.session.execute(db.select(Guest.phone_number).limit(5000)).all()]
+        self.user_phones = [phone for (phone,) in db.session.execute(db.select(User.phone_number).limit(5000)).all()]
+        self.table_capacities = [2, 4, 6]
+        self.today = date.today()
+
+    def modifier_selection(self, dish_id):
+        selected = []
+        for group in self.groups_by_dish.get(dish_id, []):
+            option_ids = [option.id for option in group.options]
+            if not option_ids:
+                continue
+            if group.is_required or self.rng.random() < 0.3:
+                if group.selection_type == 'multiple':
+                    selected.extend(self.rng.sample(option_ids, self.rng.randint(1, min(2, len(option_ids)))))
+                else:
+                    selected.append(self.rng.choice(option_ids))
+        return selected
+
+    def random_date(self):
+        return (self.today + timedelta(days=self.rng.randint(-30, 30))).isoformat()
+
+
+def build_dish_list(context):
+    return BenchRequest('/api/dishes/', None)
+
+
+def build_order(context):
+    items = []
+    for dish_id in context.rng.choices(context.dish_ids, weights=context.dish_weights, k=context.rng.randint(1, 4)):
+        items.append({'dish_id': dish_id, 'variant_id': context.rng.choice(context.variants_by_dish[dish_id]),
+                      'quantity': context.rng.randint(1, 3), 'modifier_option_ids': context.modifier_selection(dish_id)})
+    return BenchRequest('/api/orders/', {'phone_number': context.rng.choice(context.guest_phones), 'items': items})
+
+
+def build_available_slots(context):
+    return BenchRequest(f'/api/reservations/available-slots?date={context.random_date()}'
+                        f'&guest_count={context.rng.randint(1, 6)}', None)
+
+
+def build_available_tables(context):
+    hour = context.rng.choice([12, 13, 14, 18, 19, 20, 21])
+    return BenchRequest(f'/api/reservations/available-tables?date={context.random_date()}&slot_start={hour}:00'
+                        f'&guest_count={context.rng.choice(context.table_capacities)}', None)
+
+
+def build_login(context):
+    return BenchRequest('/api/users/login', {'phone_number': context.rng.choice(context.user_phones),
+                                             'password': SEED_PASSWORD})
+
+
+SCENARIOS = [
+    Scenario('DishList.get', 'GET', build_dish_list, 200),
+    Scenario('OrderList.post', 'POST', build_order, 201),
+    Scenario('AvailableSlots.get', 'GET', build_available_slots, 200),
+    Scenario('AvailableTablesForSlot.get', 'GET', build_available_tables, 200),
+    Scenario('UserLogin.post', 'POST', build_login, 200),
+]
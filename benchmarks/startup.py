@@ -0,0 +1,114 @@
+"""Час холодного старту застосунку (імпорт + create_app) з бюджетом.
+
+    python -m benchmarks.startup
+    python -m benchmarks.startup --config production --runs 10 --budget-ms 900 --top 25
+
+Кожен запуск - окремий процес `python -X importtime`, тож кеші імпорту не переносяться між вимірами.
+Виводить медіану часу старту, модулі з найбільшим власним часом імпорту та перевіряє, що важкі
+залежності, потрібні лише окремим ендпоінтам чи командам (twilio, marshmallow-sqlalchemy, alembic, Pillow), не
+завантажуються при старті. Код виходу 1, якщо медіана перевищує бюджет або такий модуль завантажено -
+скрипт можна запускати в CI."""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from benchmarks.run import git_revision
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BUDGET_MS = 1200
+# Модулі, які мають завантажуватись лише при першому використанні (див. app/sms.py, app/lazy.py, app/images.py, create_app)
+DEFERRED_MODULES = ('twilio', 'marshmallow_sqlalchemy', 'app.schemas', 'alembic', 'flask_migrate', 'PIL')
+
+CHILD_SCRIPT = """
+import time
+started = time.perf_counter()
+import json, sys
+from app import create_app
+create_app(sys.argv[1])
+elapsed = (time.perf_counter() - started) * 1000
+print(json.dumps({'startup_ms': elapsed, 'loaded': [name for name in sys.argv[2:] if name in sys.modules]}))
+"""
+
+
+def parse_importtime(stderr):
+    """Рядки `import time: self | cumulative | module` -> {модуль: (self_us, cumulative_us)}."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def measure_once(config_name, env):
+    started = time.perf_counter()
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', CHILD_SCRIPT, config_name, *DEFERRED_MODULES],
+                               cwd=REPO_ROOT, env=env, capture_output=True, text=True)
+    wall_ms = (time.perf_counter() - started) * 1000
+    if completed.returncode != 0:
+        raise RuntimeError(f'Процес старту завершився з кодом {completed.returncode}:\n{completed.stderr[-2000:]}')
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result['process_ms'] = wall_ms
+    result['modules'] = parse_importtime(completed.stderr)
+    return result
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Час холодного старту застосунку')
+    parser.add_argument('--config', default='production', help='Конфігурація для create_app')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--budget-ms', type=float, default=float(os.environ.get('STARTUP_BUDGET_MS', DEFAULT_BUDGET_MS)),
+                        help='Допустима медіана імпорту + create_app, мс')
+    parser.add_argument('--top', type=int, default=15, help='Скільки найповільніших модулів показати')
+    parser.add_argument('--output', help='Куди зберегти JSON з результатами')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    # create_app не підключається до БД, тож без DATABASE_URL вистачає SQLite в памʼяті
+    env = {**os.environ, 'DATABASE_URL': os.environ.get('DATABASE_URL', 'sqlite://')}
+    measure_once(args.config, env) # Прогрів: компіляція .pyc та файловий кеш ОС
+    runs = [measure_once(args.config, env) for _ in range(args.runs)]
+
+    startup_ms = statistics.median(run['startup_ms'] for run in runs)
+    process_ms = statistics.median(run['process_ms'] for run in runs)
+    self_times = {}
+    for run in runs:
+        for name, (self_us, _) in run['modules'].items():
+            self_times.setdefault(name, []).append(self_us)
+    slowest = sorted(((statistics.median(values) / 1000, name) for name, values in self_times.items()), reverse=True)[:args.top]
+    loaded = sorted({name for run in runs for name in run['loaded']})
+
+    print(f'Імпорт + create_app: медіана {startup_ms:.1f} мс (бюджет {args.budget_ms:.0f} мс), '
+          f'процес повністю: {process_ms:.1f} мс, запусків: {args.runs}')
+    print('Найдовший власний час імпорту:')
+    for milliseconds, name in slowest:
+        print(f'  {milliseconds:8.1f} мс  {name}')
+
+    failures = []
+    if startup_ms > args.budget_ms:
+        failures.append(f'старт {startup_ms:.1f} мс перевищує бюджет {args.budget_ms:.0f} мс')
+    if loaded:
+        failures.append(f'при старті завантажено відкладені модулі: {", ".join(loaded)}')
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as output_file:
+            json.dump({'meta': {'git_revision': git_revision(), 'python': sys.version.split()[0], 'config': args.config,
+                                'runs': args.runs, 'budget_ms': args.budget_ms},
+                       'startup_ms': round(startup_ms, 3), 'process_ms': round(process_ms, 3),
+                       'slowest_modules': [{'module': name, 'self_ms': round(ms, 3)} for ms, name in slowest],
+                       'deferred_modules_loaded': loaded}, output_file, ensure_ascii=False, indent=2)
+
+    for failure in failures:
+        print(f'ПОМИЛКА: {failure}')
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
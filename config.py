@@ -7,12 +7,56 @@ load_dotenv()
 class Config:
     TWILIO_ACCOUNT_SID = os.environ.get('TWILIO_ACCOUNT_SID')
     TWILIO_AUTH_TOKEN = os.environ.get('TWILIO_AUTH_TOKEN')
+    TWILIO_FROM_NUMBER = os.environ.get('TWILIO_FROM_NUMBER', '+16183238656')
     OTP_EXPIRATION_SECONDS = 1800 # Час життя OTP у секундах. Для тестів використаємо 30 хвилин. 
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') 
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Пул зʼєднань (для Postgres). Neon закриває простої, тому pre_ping і recycle коротший за його таймаут
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 5))
+    DB_POOL_MAX_OVERFLOW = int(os.environ.get('DB_POOL_MAX_OVERFLOW', 10))
+    DB_POOL_TIMEOUT_SECONDS = int(os.environ.get('DB_POOL_TIMEOUT_SECONDS', 30))
+    DB_POOL_RECYCLE_SECONDS = int(os.environ.get('DB_POOL_RECYCLE_SECONDS', 240))
+    DB_POOL_PRE_PING = os.environ.get('DB_POOL_PRE_PING', '1') == '1'
+    DB_POOL_WARMUP = int(os.environ.get('DB_POOL_WARMUP', 2)) # Скільки зʼєднань відкрити при старті воркера (gunicorn.conf.py)
+    DB_STATEMENT_TIMEOUT_MS = int(os.environ.get('DB_STATEMENT_TIMEOUT_MS', 15000)) # 0 - без обмеження
+    DB_READ_RETRIES = 1 # Повтори GET-запитів після обриву зʼєднання
+    # Репліки для читань (через кому). GET-запити читають з них, записи та read-your-writes - з основної бази
+    DATABASE_REPLICA_URLS = [url.strip() for url in os.environ.get('DATABASE_REPLICA_URLS', '').split(',') if url.strip()]
+    DB_READ_YOUR_WRITES_SECONDS = 5 # Скільки після запису клієнт читає з основної бази (cookie read_primary)
+    DB_REPLICA_MAX_LAG_SECONDS = int(os.environ.get('DB_REPLICA_MAX_LAG_SECONDS', 10)) # Репліка з більшим відставанням не використовується
+    DB_REPLICA_HEALTH_INTERVAL_SECONDS = 10
+    DB_REPLICA_RETRY_SECONDS = 30 # Через скільки знову пробувати виключену репліку
+    # Які простори імен API реєструє процес (через кому, напр. dishes,modifier-groups,search). Порожньо - всі
+    API_NAMESPACES = [name.strip() for name in os.environ.get('API_NAMESPACES', '').split(',') if name.strip()]
     RESTAURANT_OPENING_HOUR = 10
     RESTAURANT_CLOSING_HOUR = 23 # Час роботи ресторана (Взагалі я його взяв з початку та закінчення слотів на бронювання, але він ні для чого іншого й непотрібен)
     RESERVATION_SLOT_DURATION_HOURS = 1 # Час бронювання одного слота (столика)
+    MENU_CACHE_TTL_SECONDS = 30 # Скільки живе кеш меню/цін у процесі, поки його не скине зміна в цьому ж процесі
+    OCCUPANCY_MAX_RANGE_DAYS = 366 # Максимальний діапазон дат для аналітики завантаженості
+    OCCUPANCY_CACHE_TTL_SECONDS = 300 # Скільки живе в процесі кеш минулого дня (правки з інших воркерів - не пізніше)
+    OCCUPANCY_CACHE_MAX_DAYS = 2000 # Максимум днів у кеші аналітики на процес
+    INSTRUMENTATION_ENABLED = os.environ.get('INSTRUMENTATION_ENABLED', '1') == '1' # Server-Timing та метрики /api/_metrics
+    SLOW_QUERY_LOG_ENABLED = os.environ.get('SLOW_QUERY_LOG_ENABLED', '1') == '1' # Статистика SQL-запитів для `flask slow-queries`
+    SLOW_QUERY_THRESHOLD_MS = int(os.environ.get('SLOW_QUERY_THRESHOLD_MS', 200)) # Запити, довші за поріг, логуються разом з EXPLAIN
+    SLOW_QUERY_WINDOW = 1000 # Скільки останніх вимірів зберігати на відбиток для p50/p95/p99
+    # Значення параметрів у лог повільних запитів (лише для відладки: там паролі-хеші, OTP-коди, телефони)
+    SLOW_QUERY_LOG_PARAMETERS = os.environ.get('SLOW_QUERY_LOG_PARAMETERS', '0') == '1'
+    SLOW_QUERY_STATS_DIR = os.environ.get('SLOW_QUERY_STATS_DIR') # За замовчуванням instance/slow_queries
+    SLOW_QUERY_STATS_MAX_AGE_SECONDS = 3600 # Файли статистики зупинених воркерів, старші за це, видаляються
+    ADMIN_API_TOKEN = os.environ.get('ADMIN_API_TOKEN') # Токен для службових ендпоінтів (заголовок X-Admin-Token)
+    PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED', '0') == '1' # Профілювання запиту за заголовком X-Profile або ?_profile=
+    PROFILE_DIR = os.environ.get('PROFILE_DIR') # За замовчуванням instance/profiles
+    PROFILE_MAX_FILES = 50 # Скільки останніх профілів зберігати
+    PROFILE_SAMPLING_INTERVAL_MS = 1 # Інтервал семплювання для режиму sampling
+    IMAGE_STORAGE_BACKEND = os.environ.get('IMAGE_STORAGE_BACKEND', 'local') # 'local' або 'package.module:ClassName' (див. app/image_storage.py)
+    IMAGE_STORAGE_DIR = os.environ.get('IMAGE_STORAGE_DIR') # За замовчуванням instance/images
+    IMAGE_BASE_URL = os.environ.get('IMAGE_BASE_URL', '/api/images/files') # Звідки клієнт бере файли без CDN
+    IMAGE_CDN_BASE_URL = os.environ.get('IMAGE_CDN_BASE_URL') # Напр. https://cdn.example.com/menu, замінює IMAGE_BASE_URL у маніфестах
+    IMAGE_VARIANT_WIDTHS = (160, 320, 640, 1280) # Ширини зменшених копій, px
+    IMAGE_WORKERS = int(os.environ.get('IMAGE_WORKERS', 2)) # Потоки фонової обробки зображень, 0 - обробка прямо в запиті
+    IMAGE_MAX_UPLOAD_BYTES = 10 * 1024 * 1024
+    IMAGE_FILE_MAX_AGE_SECONDS = 365 * 24 * 3600 # Cache-Control для файлів зображень (ключі незмінні)
+    BINARY_RESPONSES_ENABLED = os.environ.get('BINARY_RESPONSES_ENABLED', '1') == '1' # Accept: application/msgpack або application/cbor
     RESTFUL_JSON = {'ensure_ascii': False,  'separators': (', ', ': '), 'indent': 2, 'sort_keys':True,
                     'default': lambda o: float(o) if isinstance(o, decimal.Decimal) else o
                     }
@@ -22,7 +66,12 @@ class DevelopmentConfig(Config):
 
 class TestingConfig(Config):
     TESTING = True
+    SQLALCHEMY_RAISELOAD = True # Незаплановане ліниве завантаження звʼязку в тестах кидає помилку (див. app/loading.py)
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    SLOW_QUERY_LOG_ENABLED = False
+    DATABASE_REPLICA_URLS = []
+    API_NAMESPACES = []
+    IMAGE_WORKERS = 0
 
 class ProductionConfig(Config):
     DEBUG = False
@@ -0,0 +1,14 @@
+# Конфігурація gunicorn: gunicorn run:app (файл підхоплюється автоматично з поточної директорії)
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('GUNICORN_WORKERS', 2))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+
+
+def post_worker_init(worker):
+    # Кожен воркер має власний пул, тому прогріваємо його вже після форку
+    from app.db_pool import warm_up_pool
+    opened = warm_up_pool(worker.wsgi)
+    worker.log.info(f"Пул зʼєднань прогріто: {opened} зʼєднань")
@@ -0,0 +1,72 @@
+"""Added full text search for dishes and news
+
+Revision ID: 541d02b5df70
+Revises: a79de42b6890
+Create Date: 2026-10-19 12:10:41.518305
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '541d02b5df70'
+down_revision = 'a79de42b6890'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    is_postgres = op.get_bind().dialect.name == 'postgresql'
+    vector_type = postgresql.TSVECTOR() if is_postgres else sa.Text()
+
+    with op.batch_alter_table('dishes', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('search_vector', vector_type, nullable=True))
+
+    with op.batch_alter_table('news', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('search_vector', vector_type, nullable=True))
+
+    if not is_postgres:
+        return
+
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    # Заповнюємо вектори для вже існуючих записів (так само, як це робить app/search.py при збереженні)
+    op.execute("""
+        UPDATE dishes SET search_vector =
+            setweight(to_tsvector('simple', coalesce(dishes.name, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce((
+                SELECT string_agg(tags.name, ' ')
+                FROM dish_tags JOIN tags ON tags.id = dish_tags.tag_id
+                WHERE dish_tags.dish_id = dishes.id
+            ), '')), 'B') ||
+            setweight(to_tsvector('simple', concat_ws(' ', dishes.description, dishes.detailed_description)), 'C')
+    """)
+    op.execute("""
+        UPDATE news SET search_vector =
+            setweight(to_tsvector('simple', coalesce(name, '')), 'A') ||
+            setweight(to_tsvector('simple', ''), 'B') ||
+            setweight(to_tsvector('simple', coalesce(description, '')), 'C')
+    """)
+
+    op.create_index('ix_dishes_search_vector', 'dishes', ['search_vector'], unique=False, postgresql_using='gin')
+    op.create_index('ix_news_search_vector', 'news', ['search_vector'], unique=False, postgresql_using='gin')
+    op.create_index('ix_dishes_name_trgm', 'dishes', ['name'], unique=False, postgresql_using='gin',
+                    postgresql_ops={'name': 'gin_trgm_ops'})
+    op.create_index('ix_news_name_trgm', 'news', ['name'], unique=False, postgresql_using='gin',
+                    postgresql_ops={'name': 'gin_trgm_ops'})
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_index('ix_news_name_trgm', table_name='news')
+        op.drop_index('ix_dishes_name_trgm', table_name='dishes')
+        op.drop_index('ix_news_search_vector', table_name='news')
+        op.drop_index('ix_dishes_search_vector', table_name='dishes')
+
+    with op.batch_alter_table('news', schema=None) as batch_op:
+        batch_op.drop_column('search_vector')
+
+    with op.batch_alter_table('dishes', schema=None) as batch_op:
+        batch_op.drop_column('search_vector')
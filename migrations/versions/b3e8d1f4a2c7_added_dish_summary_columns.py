@@ -0,0 +1,45 @@
+"""Added dish summary columns (min/max price, variant count, required modifiers)
+
+Revision ID: b3e8d1f4a2c7
+Revises: 541d02b5df70
+Create Date: 2026-10-19 15:02:17.204511
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3e8d1f4a2c7'
+down_revision = '541d02b5df70'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('dishes', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('min_price', sa.Numeric(precision=10, scale=2), nullable=True))
+        batch_op.add_column(sa.Column('max_price', sa.Numeric(precision=10, scale=2), nullable=True))
+        batch_op.add_column(sa.Column('variant_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('has_required_modifiers', sa.Boolean(), server_default=sa.false(), nullable=False))
+
+    # Заповнюємо підсумки для вже існуючих страв (так само, як це робить app/dish_summary.py)
+    op.execute("""
+        UPDATE dishes SET
+            min_price = (SELECT min(price) FROM dish_variants WHERE dish_variants.dish_id = dishes.id),
+            max_price = (SELECT max(price) FROM dish_variants WHERE dish_variants.dish_id = dishes.id),
+            variant_count = (SELECT count(*) FROM dish_variants WHERE dish_variants.dish_id = dishes.id),
+            has_required_modifiers = EXISTS (
+                SELECT 1 FROM dish_modifier_groups
+                JOIN modifier_groups ON modifier_groups.id = dish_modifier_groups.modifier_group_id
+                WHERE dish_modifier_groups.dish_id = dishes.id AND modifier_groups.is_required
+            )
+    """)
+
+
+def downgrade():
+    with op.batch_alter_table('dishes', schema=None) as batch_op:
+        batch_op.drop_column('has_required_modifiers')
+        batch_op.drop_column('variant_count')
+        batch_op.drop_column('max_price')
+        batch_op.drop_column('min_price')
@@ -0,0 +1,51 @@
+"""Added images with resized variants for dishes and news
+
+Revision ID: c7a2e9d35b10
+Revises: b3e8d1f4a2c7
+Create Date: 2026-10-19 17:41:05.913374
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7a2e9d35b10'
+down_revision = 'b3e8d1f4a2c7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('images',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('storage_key', sa.String(length=255), nullable=False),
+    sa.Column('content_type', sa.String(length=50), nullable=False),
+    sa.Column('width', sa.Integer(), nullable=False),
+    sa.Column('height', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('variants', sa.JSON(), nullable=False),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+    with op.batch_alter_table('dishes', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('image_id', sa.Integer(), nullable=True))
+        batch_op.create_foreign_key('fk_dishes_image_id_images', 'images', ['image_id'], ['id'])
+
+    with op.batch_alter_table('news', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('image_id', sa.Integer(), nullable=True))
+        batch_op.create_foreign_key('fk_news_image_id_images', 'images', ['image_id'], ['id'])
+
+
+def downgrade():
+    with op.batch_alter_table('news', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_news_image_id_images', type_='foreignkey')
+        batch_op.drop_column('image_id')
+
+    with op.batch_alter_table('dishes', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_dishes_image_id_images', type_='foreignkey')
+        batch_op.drop_column('image_id')
+
+    op.drop_table('images')
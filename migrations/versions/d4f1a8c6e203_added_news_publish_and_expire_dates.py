@@ -0,0 +1,32 @@
+"""Added news publish and expire dates
+
+Revision ID: d4f1a8c6e203
+Revises: c7a2e9d35b10
+Create Date: 2026-10-19 18:52:17.204611
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4f1a8c6e203'
+down_revision = 'c7a2e9d35b10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('news', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('publish_at', sa.DateTime(timezone=True), nullable=True))
+        batch_op.add_column(sa.Column('expire_at', sa.DateTime(timezone=True), nullable=True))
+        batch_op.create_index(batch_op.f('ix_news_publish_at'), ['publish_at'], unique=False)
+        batch_op.create_index(batch_op.f('ix_news_expire_at'), ['expire_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('news', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_news_expire_at'))
+        batch_op.drop_index(batch_op.f('ix_news_publish_at'))
+        batch_op.drop_column('expire_at')
+        batch_op.drop_column('publish_at')
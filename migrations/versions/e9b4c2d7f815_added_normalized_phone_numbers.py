@@ -0,0 +1,96 @@
+"""Added normalized phone numbers for users and guests
+
+Revision ID: e9b4c2d7f815
+Revises: d4f1a8c6e203
+Create Date: 2026-10-19 19:36:48.117902
+
+"""
+import re
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e9b4c2d7f815'
+down_revision = 'd4f1a8c6e203'
+branch_labels = None
+depends_on = None
+
+# Те саме правило, що й app/phones.py normalize_phone (знімок на момент міграції)
+NORMALIZED_PHONE_SQL = """
+    CASE
+        WHEN regexp_replace(phone_number, '[^0-9+]', '', 'g') ~ '^0[0-9]{9}$'
+            THEN '+380' || substr(regexp_replace(phone_number, '[^0-9+]', '', 'g'), 2)
+        WHEN regexp_replace(phone_number, '[^0-9+]', '', 'g') ~ '^380[0-9]{9}$'
+            THEN '+' || regexp_replace(phone_number, '[^0-9+]', '', 'g')
+        ELSE nullif(regexp_replace(phone_number, '[^0-9+]', '', 'g'), '')
+    END
+"""
+BACKFILL_CHUNK_SIZE = 1000
+
+
+def normalize_phone(number):
+    if not number:
+        return None
+    cleaned = re.sub(r"[^\d+]", "", number)
+    if re.fullmatch(r"0\d{9}", cleaned):
+        cleaned = "+380" + cleaned[1:]
+    elif re.fullmatch(r"380\d{9}", cleaned):
+        cleaned = "+" + cleaned
+    return cleaned or None
+
+
+def backfill_phone_normalized(table_name):
+    """Для БД без regexp_replace (SQLite, MySQL): пачками по id, нормалізація в Python."""
+    bind = op.get_bind()
+    table = sa.table(table_name, sa.column('id'), sa.column('phone_number'), sa.column('phone_normalized'))
+    update = (table.update().where(table.c.id == sa.bindparam('row_id'))
+              .values(phone_normalized=sa.bindparam('normalized')))
+    last_id = 0
+    while True:
+        rows = bind.execute(sa.select(table.c.id, table.c.phone_number).where(table.c.id > last_id)
+                            .order_by(table.c.id).limit(BACKFILL_CHUNK_SIZE)).all()
+        if not rows:
+            return
+        bind.execute(update, [{'row_id': row.id, 'normalized': normalize_phone(row.phone_number)} for row in rows])
+        last_id = rows[-1].id
+
+
+def upgrade():
+    is_postgres = op.get_bind().dialect.name == 'postgresql'
+
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('phone_normalized', sa.String(length=20), nullable=True))
+        batch_op.create_index(batch_op.f('ix_users_phone_normalized'), ['phone_normalized'], unique=False)
+
+    with op.batch_alter_table('guests', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('phone_normalized', sa.String(length=20), nullable=True))
+        batch_op.create_index(batch_op.f('ix_guests_phone_normalized'), ['phone_normalized'], unique=False)
+
+    if is_postgres:
+        # users і guests невеликі, тому заповнюємо одразу. Рядки, записані в обхід ORM пізніше, - flask merge-guests
+        op.execute(f'UPDATE users SET phone_normalized = {NORMALIZED_PHONE_SQL}')
+        op.execute(f'UPDATE guests SET phone_normalized = {NORMALIZED_PHONE_SQL}')
+        # orders і reservations великі: індекс будується без блокування запису
+        with op.get_context().autocommit_block():
+            op.create_index('ix_orders_guest_id', 'orders', ['guest_id'], unique=False, postgresql_concurrently=True)
+            op.create_index('ix_reservations_guest_id', 'reservations', ['guest_id'], unique=False,
+                            postgresql_concurrently=True)
+    else:
+        backfill_phone_normalized('users')
+        backfill_phone_normalized('guests')
+        op.create_index('ix_orders_guest_id', 'orders', ['guest_id'], unique=False)
+        op.create_index('ix_reservations_guest_id', 'reservations', ['guest_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_reservations_guest_id', table_name='reservations')
+    op.drop_index('ix_orders_guest_id', table_name='orders')
+
+    with op.batch_alter_table('guests', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_guests_phone_normalized'))
+        batch_op.drop_column('phone_normalized')
+
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_users_phone_normalized'))
+        batch_op.drop_column('phone_normalized')
@@ -0,0 +1,39 @@
+"""Added guest to user link and orders user_id index
+
+Revision ID: f3a6d9b1c428
+Revises: e9b4c2d7f815
+Create Date: 2026-10-19 20:24:13.640385
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3a6d9b1c428'
+down_revision = 'e9b4c2d7f815'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('guests', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('user_id', sa.Integer(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_guests_user_id'), ['user_id'], unique=False)
+        batch_op.create_foreign_key('fk_guests_user_id_users', 'users', ['user_id'], ['id'])
+
+    # Привʼязка існуючих гостей робиться окремо, пачками: flask link-guests
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.create_index('ix_orders_user_id', 'orders', ['user_id'], unique=False, postgresql_concurrently=True)
+    else:
+        op.create_index('ix_orders_user_id', 'orders', ['user_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_orders_user_id', table_name='orders')
+
+    with op.batch_alter_table('guests', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_guests_user_id_users', type_='foreignkey')
+        batch_op.drop_index(batch_op.f('ix_guests_user_id'))
+        batch_op.drop_column('user_id')